@@ -0,0 +1,75 @@
+"""Assignment workflow indexes
+
+Revision ID: a1c4e9f2b7d3
+Revises: d3719b88b30c
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e9f2b7d3'
+down_revision: Union[str, None] = 'd3719b88b30c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name, columns, partial predicate
+INDEXES = [
+    # Dashboard GROUP BY status for one period (index-only scan)
+    ('ix_assignments_period_status', ['period_id', 'status'], None),
+    # Staff task list, optionally filtered by status
+    ('ix_assignments_staff_period_status', ['staff_user_id', 'period_id', 'status'], None),
+    # Supervisor review queue, ordered by the pagination sort keys
+    ('ix_assignments_supervisor_status', ['supervisor_user_id', 'status', 'created_at', 'id'], None),
+    # Open work per staff member (pending or sent back)
+    ('ix_assignments_staff_open', ['staff_user_id', 'period_id'], "status IN ('PENDING', 'REJECTED')"),
+    # Unfiltered admin grid in keyset mode
+    ('ix_assignments_created_at_id', ['created_at', 'id'], None),
+]
+
+
+def upgrade() -> None:
+    duplicate = None
+    if not op.get_context().as_sql:
+        duplicate = op.get_bind().execute(sa.text(
+            "SELECT location_id, period_id FROM assignments "
+            "GROUP BY location_id, period_id HAVING count(*) > 1 LIMIT 1"
+        )).first()
+    if duplicate is not None:
+        raise RuntimeError(
+            "Duplicate assignments exist for location/period "
+            f"({duplicate.location_id}, {duplicate.period_id}); "
+            "remove them before adding uq_assignments_location_period"
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_assignments_location_period', 'assignments', ['location_id', 'period_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True
+        )
+        for name, columns, where in INDEXES:
+            op.create_index(
+                name, 'assignments', columns,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True
+            )
+
+    # Promote the unique index to a constraint without another table scan
+    op.execute(
+        "ALTER TABLE assignments ADD CONSTRAINT uq_assignments_location_period "
+        "UNIQUE USING INDEX uq_assignments_location_period"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_assignments_location_period', 'assignments', type_='unique')
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='assignments', postgresql_concurrently=True, if_exists=True)
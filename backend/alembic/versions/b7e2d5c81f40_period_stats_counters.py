@@ -0,0 +1,102 @@
+"""Per-period assignment status counters
+
+Revision ID: b7e2d5c81f40
+Revises: a1c4e9f2b7d3
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d5c81f40'
+down_revision: Union[str, None] = 'a1c4e9f2b7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Enum labels as stored by the Assignment.status column
+STATUSES = ('PENDING', 'CLEANED', 'APPROVED', 'REJECTED')
+
+# Applies signed per-row deltas (period_id, status, delta) to the counters.
+# Rows are folded per period first, so a statement touching thousands of
+# assignments costs one counter update per period. Periods whose counts
+# net out to zero (e.g. an UPDATE that only touched notes) are skipped so
+# they do not lock the counter row, and ORDER BY keeps lock order stable
+# between concurrent statements.
+APPLY_DELTAS_SQL = """
+    INSERT INTO period_stats AS ps (period_id, {columns}, updated_at)
+    SELECT period_id, {sums}, now()
+    FROM ({deltas}) AS delta
+    GROUP BY period_id
+    HAVING {nonzero}
+    ORDER BY period_id
+    ON CONFLICT (period_id) DO UPDATE SET {increments}, updated_at = now()
+"""
+
+DELTAS = {
+    'INSERT': "SELECT period_id, status, 1 AS delta FROM new_rows",
+    'DELETE': "SELECT period_id, status, -1 AS delta FROM old_rows",
+    'UPDATE': (
+        "SELECT period_id, status, 1 AS delta FROM new_rows "
+        "UNION ALL SELECT period_id, status, -1 AS delta FROM old_rows"
+    ),
+}
+
+
+def apply_deltas_sql(deltas: str) -> str:
+    return APPLY_DELTAS_SQL.format(
+        columns=", ".join(s.lower() for s in STATUSES),
+        sums=", ".join(
+            f"coalesce(sum(delta) FILTER (WHERE status = '{s}'), 0)" for s in STATUSES
+        ),
+        deltas=deltas,
+        nonzero=" OR ".join(f"coalesce(sum(delta) FILTER (WHERE status = '{s}'), 0) <> 0" for s in STATUSES),
+        increments=", ".join(f"{s.lower()} = ps.{s.lower()} + EXCLUDED.{s.lower()}" for s in STATUSES),
+    )
+
+
+def upgrade() -> None:
+    op.create_table('period_stats',
+        sa.Column('period_id', postgresql.UUID(as_uuid=True), nullable=False),
+        *[sa.Column(s.lower(), sa.Integer(), nullable=False, server_default='0') for s in STATUSES],
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['period_id'], ['periods.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('period_id')
+    )
+
+    for operation, deltas in DELTAS.items():
+        name = f"period_stats_on_{operation.lower()}"
+        referencing = {
+            'INSERT': "NEW TABLE AS new_rows",
+            'DELETE': "OLD TABLE AS old_rows",
+            'UPDATE': "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        }[operation]
+        op.execute(f"""
+            CREATE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                {apply_deltas_sql(deltas)};
+                RETURN NULL;
+            END
+            $$
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {name} AFTER {operation} ON assignments
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION {name}()
+        """)
+
+    # Backfill from existing assignments
+    op.execute(apply_deltas_sql("SELECT period_id, status, 1 AS delta FROM assignments"))
+
+
+def downgrade() -> None:
+    for operation in reversed(list(DELTAS)):
+        name = f"period_stats_on_{operation.lower()}"
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON assignments")
+        op.execute(f"DROP FUNCTION IF EXISTS {name}()")
+    op.drop_table('period_stats')
@@ -0,0 +1,41 @@
+"""Single active period
+
+Revision ID: b8f4e2a7d1c6
+Revises: a6e3d1f8c2b9
+Create Date: 2026-10-18 18:00:00.000000
+
+Earlier versions let several periods be active at once. Before the unique
+index is created, every active period except the one that started last is
+marked completed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f4e2a7d1c6'
+down_revision: Union[str, None] = 'a6e3d1f8c2b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE periods SET status = 'COMPLETED', updated_at = now()
+        WHERE status = 'ACTIVE'
+          AND id <> (
+              SELECT id FROM periods WHERE status = 'ACTIVE'
+              ORDER BY start_date DESC, created_at DESC, id
+              LIMIT 1
+          )
+    """)
+    op.create_index(
+        'uq_periods_single_active', 'periods', ['status'],
+        unique=True, postgresql_where=sa.text("status = 'ACTIVE'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_periods_single_active', table_name='periods')
@@ -0,0 +1,64 @@
+"""Location closure table
+
+Revision ID: d9b3e7a2c5f1
+Revises: c4a8f1e06d92
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b3e7a2c5f1'
+down_revision: Union[str, None] = 'c4a8f1e06d92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Deeper than any real building; stops the backfill if parent links loop
+MAX_DEPTH = 100
+
+
+def upgrade() -> None:
+    op.create_table('location_closure',
+        sa.Column('ancestor_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('descendant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['ancestor_id'], ['locations.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['descendant_id'], ['locations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+
+    # Backfill from parent_location_id
+    op.execute(f"""
+        INSERT INTO location_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree AS (
+            SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM locations
+            UNION ALL
+            SELECT tree.ancestor_id, locations.id, tree.depth + 1
+            FROM tree JOIN locations ON locations.parent_location_id = tree.descendant_id
+            WHERE tree.depth < {MAX_DEPTH}
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree
+    """)
+    if not op.get_context().as_sql:
+        too_deep = op.get_bind().execute(sa.text(
+            f"SELECT descendant_id FROM location_closure WHERE depth >= {MAX_DEPTH} LIMIT 1"
+        )).first()
+        if too_deep is not None:
+            raise RuntimeError(
+                f"Location {too_deep.descendant_id} is {MAX_DEPTH}+ levels deep; "
+                "check parent_location_id for cycles"
+            )
+
+    # Built after the backfill so the rows are indexed in one pass
+    op.create_index('ix_location_closure_descendant', 'location_closure', ['descendant_id', 'ancestor_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_location_closure_descendant', table_name='location_closure')
+    op.drop_table('location_closure')
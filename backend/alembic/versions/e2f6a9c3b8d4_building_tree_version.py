@@ -0,0 +1,65 @@
+"""Building tree version for location tree ETags
+
+Revision ID: e2f6a9c3b8d4
+Revises: d9b3e7a2c5f1
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2f6a9c3b8d4'
+down_revision: Union[str, None] = 'd9b3e7a2c5f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# operation -> transition tables it exposes
+TRIGGERS = {
+    'INSERT': "NEW TABLE AS new_rows",
+    'UPDATE': "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    'DELETE': "OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    op.add_column('buildings', sa.Column('tree_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_locations_building_id'), 'locations', ['building_id'], unique=False)
+
+    # One bump per affected building per statement; a location moved
+    # between buildings bumps both
+    op.execute("""
+        CREATE FUNCTION buildings_bump_tree_version() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE buildings SET tree_version = tree_version + 1
+                WHERE id IN (SELECT building_id FROM new_rows);
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE buildings SET tree_version = tree_version + 1
+                WHERE id IN (SELECT building_id FROM old_rows);
+            ELSE
+                UPDATE buildings SET tree_version = tree_version + 1
+                WHERE id IN (SELECT building_id FROM new_rows UNION SELECT building_id FROM old_rows);
+            END IF;
+            RETURN NULL;
+        END
+        $$
+    """)
+    for operation, referencing in TRIGGERS.items():
+        op.execute(f"""
+            CREATE TRIGGER locations_tree_version_on_{operation.lower()} AFTER {operation} ON locations
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION buildings_bump_tree_version()
+        """)
+
+
+def downgrade() -> None:
+    for operation in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS locations_tree_version_on_{operation.lower()} ON locations")
+    op.execute("DROP FUNCTION IF EXISTS buildings_bump_tree_version()")
+    op.drop_index(op.f('ix_locations_building_id'), table_name='locations')
+    op.drop_column('buildings', 'tree_version')
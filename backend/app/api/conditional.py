@@ -0,0 +1,73 @@
+"""Conditional request helpers (ETag / If-None-Match / If-Match)"""
+
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+
+# Clients may reuse a stored copy but must revalidate it every time
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag from version components"""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def resource_etag(row) -> str:
+    """
+    Strong ETag of a single row from its id and updated_at
+
+    Every write goes through the ORM or a Core update(), both of which set
+    updated_at, so the pair changes whenever the row does.
+    """
+    stamp = row.updated_at or row.created_at
+    return make_etag(row.id, int(stamp.timestamp() * 1_000_000) if stamp else 0)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches etag
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    W/ prefix added by a proxy does not defeat the match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE}
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
+
+
+def require_if_match(if_match: Optional[str], etag: str) -> None:
+    """
+    Enforce an If-Match precondition against the current etag
+
+    Uses the strong comparison RFC 9110 prescribes for If-Match, so weak
+    validators never match. Without the header there is no precondition.
+
+    Raises:
+        HTTPException: 412 when the resource has changed since it was read
+    """
+    if if_match is None or if_match.strip() == "*":
+        return
+    if not any(candidate.strip() == etag for candidate in if_match.split(",")):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resource has been modified; reload it and retry",
+            headers={"ETag": etag}
+        )
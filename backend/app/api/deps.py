@@ -1,37 +1,120 @@
-from fastapi import Depends, HTTPException, status
+from typing import AsyncIterator, Optional
+from uuid import UUID
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.exceptions import InactiveUserError
+from app.core.logging import get_logger
+from app.db import replicas
 from app.db.base import get_db
 from app.db.models.user import User, UserRole
 from app.security.auth import verify_token
+from app.security.token_versions import token_versions
+from app.security.user_cache import user_cache
+
+logger = get_logger(__name__)
 
 security = HTTPBearer()
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    payload = verify_token(token)
-    user_id = payload.get("sub")
-    if user_id is None:
+def _token_user_id(payload: dict) -> UUID:
+    try:
+        return UUID(payload.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = db.query(User).filter(User.id == user_id).first()
+
+async def _load_active_user(db: AsyncSession, user_id: UUID) -> User:
+    # Cache hits cost no query (see app/security/user_cache.py)
+    user = await user_cache.load(db, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if not user.is_active:
+        raise InactiveUserError()
+    replicas.bind_session_user(db, user.id)
     return user
 
+def _principal_from_claims(user_id: UUID, payload: dict) -> Optional[User]:
+    """Transient User from a token the version map vouches for, else None"""
+    verdict = token_versions.check(user_id, payload.get("ver"))
+    if verdict is False:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if verdict is None:
+        return None
+    try:
+        role = UserRole(payload.get("role"))
+    except ValueError:
+        return None
+    return User(id=user_id, role=role, is_active=True, token_version=payload["ver"])
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """The authenticated user's row (cached); for routes that need profile fields"""
+    payload = verify_token(credentials.credentials)
+    return await _load_active_user(db, _token_user_id(payload))
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    The authenticated user for authorization checks
+
+    With AUTH_STATELESS on and a token the version map vouches for, this is
+    a transient User with only id, role and is_active set, built from the
+    token claims without touching the users table. Otherwise it is the same
+    as get_current_user.
+    """
+    payload = verify_token(credentials.credentials)
+    user_id = _token_user_id(payload)
+    if settings.AUTH_STATELESS:
+        principal = _principal_from_claims(user_id, payload)
+        if principal is not None:
+            replicas.bind_session_user(db, user_id)
+            return principal
+    return await _load_active_user(db, user_id)
+
+async def get_read_db(
+    response: Response,
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+) -> AsyncIterator[AsyncSession]:
+    """
+    Session for read-only routes: a caught-up replica when one is available
+
+    Falls back to the request's primary session when no replica is usable
+    or the user wrote within READ_YOUR_WRITES_SECONDS.
+    """
+    replica = None if replicas.wrote_recently(current_user.id) else replicas.pick_replica()
+    if settings.DEBUG:
+        response.headers["X-DB-Route"] = replica.name if replica else "primary"
+    if replica is None:
+        yield db
+        return
+
+    async with replica.sessionmaker() as read_db:
+        try:
+            yield read_db
+        except Exception as e:
+            logger.error(f"Replica session error: {e}", exc_info=True)
+            await read_db.rollback()
+            raise
+
 def require_role(*roles: UserRole):
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: User = Depends(get_current_principal)) -> User:
         if current_user.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -40,7 +123,7 @@ def require_role(*roles: UserRole):
         return current_user
     return role_checker
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+async def require_admin(current_user: User = Depends(get_current_principal)) -> User:
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -48,7 +131,7 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
         )
     return current_user
 
-def require_staff(current_user: User = Depends(get_current_user)) -> User:
+async def require_staff(current_user: User = Depends(get_current_principal)) -> User:
     if current_user.role != UserRole.STAFF:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -56,7 +139,7 @@ def require_staff(current_user: User = Depends(get_current_user)) -> User:
         )
     return current_user
 
-def require_supervisor(current_user: User = Depends(get_current_user)) -> User:
+async def require_supervisor(current_user: User = Depends(get_current_principal)) -> User:
     if current_user.role != UserRole.SUPERVISOR:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
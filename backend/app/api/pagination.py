@@ -0,0 +1,236 @@
+"""Offset and keyset pagination helpers for list endpoints"""
+
+import base64
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, FrozenSet, List, Optional, Set, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.util import find_tables
+
+from app.core.config import settings
+from app.db import replicas
+from app.db.events import on_tables_committed
+from app.schemas.common import Page, PaginationParams
+
+
+class CountCache:
+    """
+    Short-TTL LRU cache of exact list totals
+
+    Keys are the compiled count query plus its parameters, so each filter
+    combination is cached separately, and the source that answered: a
+    replica's count, possibly behind, is never served to a primary read.
+    Entries are dropped as soon as a transaction that wrote one of their
+    tables commits in this process; the TTL bounds staleness from writes
+    made by other workers, and replica entries live at most
+    REPLICA_MAX_LAG_SECONDS.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, FrozenSet[str], int]]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[int]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, total = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return total
+
+    def set(self, key: Tuple, tables: FrozenSet[str], total: int, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl is None else min(ttl, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, tables, total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_tables(self, tables: Set[str]) -> None:
+        stale = [key for key, (_, entry_tables, _) in self._entries.items() if entry_tables & tables]
+        for key in stale:
+            del self._entries[key]
+
+
+count_cache = CountCache(settings.COUNT_CACHE_TTL_SECONDS, settings.COUNT_CACHE_MAX_ENTRIES)
+on_tables_committed(count_cache.invalidate_tables)
+
+
+def sort_columns(model) -> tuple:
+    """
+    Stable sort keys shared by both pagination modes
+
+    (created_at, id) is unique per row, so keyset pages never skip or
+    repeat rows even when many rows share a timestamp.
+    """
+    return (model.created_at, model.id)
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode sort key values of the last row into an opaque cursor"""
+    raw = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else str(value)
+        for value in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: tuple) -> List[Any]:
+    """
+    Decode an opaque cursor back into typed sort key values
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError("cursor arity mismatch")
+
+        values = []
+        for column, value in zip(columns, raw):
+            python_type = column.type.python_type
+            if issubclass(python_type, datetime):
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(python_type(value))
+        return values
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def estimate_count(db: AsyncSession, table_name: str) -> Optional[int]:
+    """
+    Read the planner's row estimate for a table
+
+    Returns None when the table has never been analyzed.
+    """
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+        {"table_name": table_name}
+    )
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
+
+
+async def count_total(
+    db: AsyncSession,
+    query: Select,
+    total_mode: str
+) -> Tuple[int, bool]:
+    """
+    Count rows matched by a list query
+
+    Unfiltered single-table lists may use the planner estimate; everything
+    else gets an exact count served from the count cache when possible.
+
+    Returns:
+        Tuple of (total, is_estimate)
+    """
+    query = query.order_by(None)
+    tables = frozenset(table.name for table in find_tables(query, include_joins=True))
+
+    if total_mode == "estimate" and query.whereclause is None and len(tables) == 1:
+        estimate = await estimate_count(db, next(iter(tables)))
+        if estimate is not None:
+            return estimate, True
+
+    count_query = select(func.count()).select_from(query.subquery())
+    compiled = count_query.compile(dialect=db.bind.dialect)
+    from_replica = replicas.is_replica_session(db)
+    key = (
+        "replica" if from_replica else "primary",
+        str(compiled),
+        tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+    )
+
+    total = count_cache.get(key)
+    if total is None:
+        total = await db.scalar(count_query)
+        count_cache.set(key, tables, total, ttl=settings.REPLICA_MAX_LAG_SECONDS if from_replica else None)
+    return total, False
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    pagination: PaginationParams,
+    schema: Type[BaseModel],
+    model
+) -> Page:
+    """
+    Execute a list query in offset or keyset mode
+
+    Offset mode keeps the historical page/total behaviour. Keyset mode
+    seeks past the cursor with a row comparison on the sort keys and
+    fetches one extra row to detect the next page. The total is only
+    computed when requested (see PaginationParams.wants_total).
+
+    Args:
+        db: Async database session
+        query: Filtered select() over model
+        pagination: Pagination parameters from the request
+        schema: Response schema for each row (built with a single
+            model_validate pass)
+        model: Mapped class the query selects from
+
+    Returns:
+        Page[schema]; wrap it in ORJSONResponse (or hand it to cached_list)
+        so it is not validated again on the way out
+    """
+    total = None
+    total_is_estimate = False
+    if pagination.wants_total:
+        total, total_is_estimate = await count_total(db, query, pagination.total_mode)
+
+    columns = sort_columns(model)
+    query = query.order_by(*columns)
+
+    if not pagination.is_cursor_mode:
+        result = await db.execute(
+            query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size)
+        )
+        rows = result.scalars().all()
+        return Page[schema](
+            items=[schema.model_validate(row) for row in rows],
+            page=pagination.page,
+            page_size=pagination.page_size,
+            total=total,
+            total_is_estimate=total_is_estimate
+        )
+
+    if pagination.cursor:
+        query = query.filter(tuple_(*columns) > tuple(decode_cursor(pagination.cursor, columns)))
+
+    result = await db.execute(query.limit(pagination.page_size + 1))
+    rows = result.scalars().all()
+
+    next_cursor = None
+    if len(rows) > pagination.page_size:
+        rows = rows[:pagination.page_size]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in columns])
+
+    return Page[schema](
+        items=[schema.model_validate(row) for row in rows],
+        page=pagination.page,
+        page_size=pagination.page_size,
+        total=total,
+        total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor
+    )
@@ -0,0 +1,233 @@
+"""
+Response cache for reference data lists
+
+Buildings, departments, periods and locations change a few times per term
+but are listed on every admin page load. Their list endpoints cache the
+serialized JSON body keyed by route, query string, role, read source and
+the current version of every table the response depends on. Write
+handlers bump the table version after commit, so an entry built before a
+write can never be looked up again; old entries just age out.
+
+Entries live in the "response" namespace of app.core.cache: in process
+and, with REDIS_ENABLED, in Redis, where table versions are kept too so a
+write in one worker is seen by all. Without Redis, versions live in a
+shared-memory table that every worker on the host reads, so a write in
+one worker invalidates the others' entries just the same; only separate
+hosts need Redis for that. Concurrent misses on one key build the body
+once.
+
+A response read from a replica is keyed apart from primary reads and kept
+for at most REPLICA_MAX_LAG_SECONDS, so a user pinned to the primary after
+a write never sees a replica's older copy.
+
+Responses carry an ETag hashed from the body rather than taken from the
+table versions, which are per process without Redis; a client whose copy
+is current gets a 304. Entries keep their ETag, so a hit hashes nothing.
+"""
+
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import REVALIDATE, etag_matches, make_etag, not_modified
+from app.api.responses import dumps_json
+from app.core.cache import Cache, Serializer
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.rate_limit_storage import SharedMemoryStorage, shared_memory_path
+from app.core.redis import get_redis
+from app.db import replicas
+from app.db.events import on_tables_committed
+from app.db.models.user import User
+
+logger = get_logger(__name__)
+
+_VERSION_PREFIX = "cache:version:"
+
+# A host-wide version must never expire back to 0 while entries keyed by
+# its older values are alive
+_VERSION_LIFETIME_SECONDS = 10 * 365 * 24 * 3600
+
+CACHE_HEADER = "X-Cache"
+
+
+class _EntrySerializer(Serializer):
+    """(body, etag) as the ETag line followed by the body"""
+
+    def dumps(self, value: Tuple[str, str]) -> str:
+        body, etag = value
+        return f"{etag}\n{body}"
+
+    def loads(self, raw: str) -> Tuple[str, str]:
+        etag, body = raw.split("\n", 1)
+        return body, etag
+
+
+class ResponseCache:
+    """Versioned cache of JSON response bodies"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int, versions: SharedMemoryStorage, namespace: str = "response"):
+        """
+        Args:
+            ttl_seconds: Lifetime of an entry; 0 disables the cache
+            max_entries: Bound of the in-process copies
+            versions: Host-wide table versions, used without Redis
+            namespace: Cache namespace of the entries
+        """
+        self.ttl_seconds = ttl_seconds
+        # Keys embed the table versions, so L1 copies need no shorter life
+        self.entries = Cache(
+            namespace, ttl_seconds, max_entries,
+            serializer=_EntrySerializer(), local_ttl_seconds=ttl_seconds
+        )
+        self.versions = versions
+        # route -> Counter of hits, misses
+        self._stats: Dict[str, Counter] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    async def _table_versions(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        redis = get_redis()
+        if redis is not None:
+            values = await redis.mget([f"{_VERSION_PREFIX}{table}" for table in tables])
+            return tuple(int(value or 0) for value in values)
+        return tuple(self.versions.get(f"{_VERSION_PREFIX}{table}") for table in tables)
+
+    async def key(self, route: str, tables: Tuple[str, ...], request: Request, user: User, db: AsyncSession) -> str:
+        """
+        Cache key for a request, including the current table versions
+
+        Must be computed before the response is built, so a write that
+        commits meanwhile invalidates what is about to be stored.
+        """
+        versions = await self._table_versions(tables)
+        source = "replica" if replicas.is_replica_session(db) else "primary"
+        raw = json.dumps([
+            route,
+            sorted(request.query_params.multi_items()),
+            user.role.value,
+            source,
+            versions,
+        ])
+        return f"{route}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    def entry_ttl(self, db: AsyncSession) -> float:
+        """Lifetime of an entry built from db"""
+        if replicas.is_replica_session(db):
+            return min(self.ttl_seconds, settings.REPLICA_MAX_LAG_SECONDS)
+        return self.ttl_seconds
+
+    def record(self, route: str, hit: bool) -> None:
+        self._stats.setdefault(route, Counter())["hits" if hit else "misses"] += 1
+
+    def bump_host(self, tables) -> None:
+        """Bump the versions shared by the workers on this host"""
+        try:
+            for table in tables:
+                self.versions.incr(f"{_VERSION_PREFIX}{table}", _VERSION_LIFETIME_SECONDS)
+        except OSError as e:
+            # Entries built from these tables live out their TTL
+            logger.error(f"Response cache invalidation failed for {tables}: {e}")
+
+    async def bump(self, *tables: str) -> None:
+        """Invalidate every cached response built from tables (call after commit)"""
+        self.bump_host(tables)
+
+        redis = get_redis()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for table in tables:
+                        pipe.incr(f"{_VERSION_PREFIX}{table}")
+                    await pipe.execute()
+            except Exception as e:
+                # Other workers serve the old entries until they expire
+                logger.error(f"Response cache invalidation failed for {tables}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        routes = {}
+        for route, counts in sorted(self._stats.items()):
+            lookups = counts["hits"] + counts["misses"]
+            routes[route] = {**counts, "hit_ratio": round(counts["hits"] / lookups, 3) if lookups else None}
+        return {"enabled": self.enabled, "routes": routes}
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+    SharedMemoryStorage(f"shm://{shared_memory_path('temizlik-response-versions')}?slots=1024")
+)
+# Backstop for writes outside the routers; bump() still needed for Redis
+on_tables_committed(response_cache.bump_host)
+
+
+async def cached_list(
+    route: str,
+    tables: Tuple[str, ...],
+    request: Request,
+    user: User,
+    db: AsyncSession,
+    build
+) -> Response:
+    """
+    Serve a list response from the cache, or build and cache it
+
+    Args:
+        route: Stable name of the endpoint
+        tables: Tables the response is derived from
+        request: Incoming request (its query string is part of the key)
+        user: Caller (their role is part of the key)
+        db: Session the response would be read from
+        build: Coroutine function producing the response model on a miss
+
+    Returns:
+        JSON response with an ETag and an X-Cache header of HIT or MISS,
+        or 304 when If-None-Match names the current ETag
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not response_cache.enabled:
+        return _respond(_dumps(await build()), None, if_none_match)
+
+    try:
+        key = await response_cache.key(route, tables, request, user, db)
+    except Exception as e:
+        # No trustworthy version: skip the cache rather than risk staleness
+        logger.warning(f"Response cache version read failed: {e}")
+        return _respond(_dumps(await build()), None, if_none_match)
+
+    built = False
+
+    async def build_entry() -> Tuple[str, str]:
+        nonlocal built
+        built = True
+        body = _dumps(await build())
+        return body, _body_etag(body)
+
+    body, etag = await response_cache.entries.get_or_load(key, build_entry, ttl=response_cache.entry_ttl(db))
+    response_cache.record(route, hit=not built)
+    return _respond(body, etag, if_none_match, "MISS" if built else "HIT")
+
+
+def _body_etag(body: str) -> str:
+    return make_etag(hashlib.sha1(body.encode("utf-8")).hexdigest()[:24])
+
+
+def _respond(body: str, etag: Optional[str], if_none_match: Optional[str], cache: Optional[str] = None) -> Response:
+    etag = etag or _body_etag(body)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if cache:
+        headers[CACHE_HEADER] = cache
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _dumps(model) -> str:
+    return dumps_json(model).decode("utf-8")
@@ -0,0 +1,43 @@
+"""JSON responses rendered with orjson"""
+
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Same output as pydantic's JSON mode, which FastAPI uses otherwise: UTC as Z
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # orjson only writes uuid.UUID itself natively; asyncpg returns a subclass
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Serialize content to JSON with orjson
+
+    A model is dumped once in python mode; orjson then writes its UUID,
+    datetime and enum values natively.
+    """
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered by dumps_json
+
+    Returned from a route it also bypasses FastAPI's response_model
+    validation and encoding, so a page of models is serialized exactly
+    once; the response_model still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -1,19 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import asyncio
+import csv
+import json
+import uuid
+from collections import deque
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import SmallInteger, Text, cast, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Set, Tuple
 from uuid import UUID
-from datetime import datetime
-from app.db.base import get_db
+from app.core.config import settings
+from app.db import replicas
+from app.db.base import AsyncSessionLocal, get_db
 from app.db.models.user import User, UserRole
 from app.db.models.assignment import Assignment, AssignmentStatus
+from app.db.models.building import Building
 from app.db.models.location import Location
+from app.db.models.location_closure import LocationClosure
+from app.db.active_period import get_active_period_id
 from app.db.models.period import Period, PeriodStatus
 from app.schemas.assignment import (
     AssignmentCreate, AssignmentUpdate, AssignmentResponse,
-    AssignmentCleanRequest, AssignmentApproveRequest, AssignmentRejectRequest
+    AssignmentCleanRequest, AssignmentApproveRequest, AssignmentRejectRequest,
+    AssignmentBulkResult, AssignmentBulkResponse,
+    AssignmentReviewBatchRequest, AssignmentReviewBatchResult, AssignmentReviewBatchResponse
 )
-from app.schemas.common import PaginationParams, PaginatedResponse
-from app.api.deps import get_current_user, require_admin, require_staff, require_supervisor
+from app.schemas.common import Page, PaginationParams
+from app.api.pagination import paginate
+from app.api.responses import ORJSONResponse
+from app.api import exports
+from app.api.conditional import etag_matches, not_modified, require_if_match, resource_etag, set_etag
+from app.db.transitions import (
+    TransitionFailure, classify_transition_failures, transition_assignment, transition_guard
+)
+from app.api.deps import get_current_principal, get_read_db, require_admin, require_staff, require_supervisor
+from app.core.limiter import limit_group
 
 router = APIRouter()
 
@@ -21,11 +46,11 @@ router = APIRouter()
 @router.post("/", response_model=AssignmentResponse)
 async def create_assignment(
     assignment_data: AssignmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     # Validate location is leaf
-    location = db.query(Location).filter(Location.id == assignment_data.location_id).first()
+    location = await db.get(Location, assignment_data.location_id)
     if not location:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -38,7 +63,7 @@ async def create_assignment(
         )
     
     # Validate period is active
-    period = db.query(Period).filter(Period.id == assignment_data.period_id).first()
+    period = await db.get(Period, assignment_data.period_id)
     if not period:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,10 +76,10 @@ async def create_assignment(
         )
     
     # Check for existing assignment
-    existing = db.query(Assignment).filter(
+    existing = await db.scalar(select(Assignment).filter(
         Assignment.location_id == assignment_data.location_id,
         Assignment.period_id == assignment_data.period_id
-    ).first()
+    ).limit(1))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -63,12 +88,272 @@ async def create_assignment(
     
     db_assignment = Assignment(**assignment_data.dict())
     db.add(db_assignment)
-    db.commit()
-    db.refresh(db_assignment)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Lost a race against a concurrent insert (uq_assignments_location_period)
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Assignment already exists for this location and period"
+        )
+    await db.refresh(db_assignment)
     
     return AssignmentResponse.from_orm(db_assignment)
 
-@router.get("/", response_model=PaginatedResponse)
+BULK_CONTENT_TYPES = ("application/json", "text/csv", "application/x-ndjson")
+
+def _decode_line(line: bytes) -> str:
+    try:
+        return line.decode("utf-8-sig").rstrip("\r")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be UTF-8")
+
+async def _iter_body_lines(request: Request) -> AsyncIterator[str]:
+    """Decode a streamed UTF-8 request body line by line"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield _decode_line(line)
+    if buffer:
+        yield _decode_line(buffer)
+
+_CSV_LINE_BATCH = 256
+
+class _BodyLines:
+    """
+    Blocking line iterator over a streamed body, for a csv.reader run in a worker thread
+
+    Lines are fetched from the event loop in batches, so one thread hop
+    covers many lines.
+    """
+
+    def __init__(self, request: Request, loop: asyncio.AbstractEventLoop):
+        self._lines = _iter_body_lines(request)
+        self._loop = loop
+        self._batch: Deque[str] = deque()
+        self._done = False
+
+    async def _fill(self) -> None:
+        for _ in range(_CSV_LINE_BATCH):
+            try:
+                self._batch.append(await self._lines.__anext__() + "\n")
+            except StopAsyncIteration:
+                self._done = True
+                return
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self._batch and not self._done:
+            asyncio.run_coroutine_threadsafe(self._fill(), self._loop).result()
+        if not self._batch:
+            raise StopIteration
+        return self._batch.popleft()
+
+def _read_csv_records(reader: Iterator[List[str]], limit: int) -> List[Optional[List[str]]]:
+    """Up to limit records, skipping blank lines; a malformed record becomes None"""
+    records: List[Optional[List[str]]] = []
+    while len(records) < limit:
+        try:
+            record = next(reader)
+        except StopIteration:
+            break
+        except csv.Error:
+            records.append(None)
+            continue
+        if len(record) <= 1 and not "".join(record).strip():
+            continue
+        records.append(record)
+    return records
+
+async def _iter_csv_records(request: Request) -> AsyncIterator[Optional[List[str]]]:
+    """
+    Parse a streamed CSV body with one csv.reader, so quoted fields may span lines
+
+    The reader runs in a worker thread and pulls body lines as it needs
+    them. Malformed records, such as an unterminated quoted field at the
+    end, yield None.
+    """
+    loop = asyncio.get_running_loop()
+    reader = csv.reader(_BodyLines(request, loop), strict=True)
+    while True:
+        records = await loop.run_in_executor(None, _read_csv_records, reader, settings.BULK_CHUNK_SIZE)
+        if not records:
+            return
+        for record in records:
+            yield record
+
+async def _iter_bulk_rows(request: Request) -> AsyncIterator[Any]:
+    """Yield raw assignment rows from a JSON array, CSV or NDJSON body"""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in BULK_CONTENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Supported content types: {', '.join(BULK_CONTENT_TYPES)}"
+        )
+
+    if content_type == "application/json":
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body")
+        items = body.get("items") if isinstance(body, dict) else body
+        if not isinstance(items, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a JSON array of assignments"
+            )
+        for item in items:
+            yield item
+        return
+
+    if content_type == "text/csv":
+        header = None
+        async for record in _iter_csv_records(request):
+            if record is None:
+                yield None  # Reported as an invalid row
+                continue
+            values = [value.strip() for value in record]
+            if header is None:
+                header = values
+                continue
+            yield dict(zip(header, values))
+        return
+
+    async for line in _iter_body_lines(request):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None  # Reported as an invalid row
+
+async def _insert_assignment_chunk(
+    db: AsyncSession,
+    chunk: List[Tuple[int, Any]],
+    seen: Set[Tuple[UUID, UUID]]
+) -> List[AssignmentBulkResult]:
+    """Validate a chunk with set-based lookups and insert it in one statement"""
+    results: List[AssignmentBulkResult] = []
+    candidates: List[Tuple[int, AssignmentCreate]] = []
+    for index, raw in chunk:
+        try:
+            candidates.append((index, AssignmentCreate.model_validate(raw)))
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            results.append(AssignmentBulkResult(
+                index=index, status="invalid", detail=f"{field}: {error['msg']}" if field else error["msg"]
+            ))
+
+    location_ids = {item.location_id for _, item in candidates}
+    period_ids = {item.period_id for _, item in candidates}
+    user_ids = {item.staff_user_id for _, item in candidates} | {item.supervisor_user_id for _, item in candidates}
+
+    locations = dict((await db.execute(
+        select(Location.id, Location.is_leaf).filter(Location.id.in_(location_ids))
+    )).all()) if location_ids else {}
+    periods = dict((await db.execute(
+        select(Period.id, Period.status).filter(Period.id.in_(period_ids))
+    )).all()) if period_ids else {}
+    users = set((await db.scalars(
+        select(User.id).filter(User.id.in_(user_ids))
+    )).all()) if user_ids else set()
+
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    for index, item in candidates:
+        detail = None
+        if item.location_id not in locations:
+            detail = "Location not found"
+        elif not locations[item.location_id]:
+            detail = "Assignment can only be made to leaf locations"
+        elif item.period_id not in periods:
+            detail = "Period not found"
+        elif periods[item.period_id] != PeriodStatus.ACTIVE:
+            detail = "Assignment can only be made to active periods"
+        elif item.staff_user_id not in users or item.supervisor_user_id not in users:
+            detail = "User not found"
+        if detail:
+            results.append(AssignmentBulkResult(index=index, status="invalid", detail=detail))
+            continue
+
+        key = (item.location_id, item.period_id)
+        if key in seen:
+            results.append(AssignmentBulkResult(
+                index=index, status="duplicate", detail="Duplicate location and period in request"
+            ))
+            continue
+        seen.add(key)
+        rows.append((index, {"id": uuid.uuid4(), "status": AssignmentStatus.PENDING, **item.dict()}))
+
+    if rows:
+        inserted = set((await db.scalars(
+            pg_insert(Assignment)
+            .values([row for _, row in rows])
+            .on_conflict_do_nothing(index_elements=["location_id", "period_id"])
+            .returning(Assignment.id)
+        )).all())
+        for index, row in rows:
+            if row["id"] in inserted:
+                results.append(AssignmentBulkResult(index=index, status="created", id=row["id"]))
+            else:
+                results.append(AssignmentBulkResult(
+                    index=index, status="duplicate",
+                    detail="Assignment already exists for this location and period"
+                ))
+
+    return results
+
+@router.post("/bulk", response_model=AssignmentBulkResponse)
+async def create_assignments_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Create many assignments in one request
+
+    Accepts a JSON array (or {"items": [...]}), a CSV file with a header row
+    or NDJSON, each row carrying location_id, period_id, staff_user_id and
+    supervisor_user_id. Rows are validated and inserted in chunks with
+    set-based lookups and INSERT ... ON CONFLICT DO NOTHING; existing
+    location/period pairs are reported as duplicates, not errors. All
+    created rows commit together.
+    """
+    results: List[AssignmentBulkResult] = []
+    seen: Set[Tuple[UUID, UUID]] = set()
+    chunk: List[Tuple[int, Any]] = []
+    index = 0
+
+    async for raw in _iter_bulk_rows(request):
+        if index >= settings.BULK_MAX_ROWS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {settings.BULK_MAX_ROWS} rows per request"
+            )
+        chunk.append((index, raw))
+        index += 1
+        if len(chunk) >= settings.BULK_CHUNK_SIZE:
+            results.extend(await _insert_assignment_chunk(db, chunk, seen))
+            chunk = []
+    if chunk:
+        results.extend(await _insert_assignment_chunk(db, chunk, seen))
+
+    await db.commit()
+
+    results.sort(key=lambda result: result.index)
+    return AssignmentBulkResponse(
+        created=sum(result.status == "created" for result in results),
+        duplicates=sum(result.status == "duplicate" for result in results),
+        invalid=sum(result.status == "invalid" for result in results),
+        results=results
+    )
+
+@router.get("/", response_model=Page[AssignmentResponse], dependencies=[Depends(limit_group("admin_grids"))])
 async def get_assignments(
     pagination: PaginationParams = Depends(),
     period_id: Optional[str] = None,
@@ -78,11 +363,17 @@ async def get_assignments(
     staff_user_id: Optional[str] = None,
     supervisor_user_id: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    ancestor_location_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    query = db.query(Assignment)
+    query = select(Assignment)
     
+    if ancestor_location_id:
+        # Assignments anywhere under the location (or on it)
+        query = query.join(LocationClosure, LocationClosure.descendant_id == Assignment.location_id).filter(
+            LocationClosure.ancestor_id == ancestor_location_id
+        )
     if period_id:
         query = query.filter(Assignment.period_id == period_id)
     if status:
@@ -92,23 +383,81 @@ async def get_assignments(
     if supervisor_user_id:
         query = query.filter(Assignment.supervisor_user_id == supervisor_user_id)
     
-    total = query.count()
-    assignments = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
-    
-    return PaginatedResponse(
-        items=[AssignmentResponse.from_orm(assignment) for assignment in assignments],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
+    return ORJSONResponse(await paginate(db, query, pagination, AssignmentResponse, Assignment))
+
+EXPORT_COLUMNS = (
+    "id", "status", "building", "floor", "location", "staff", "supervisor", "rating",
+    "staff_completed_at", "supervisor_reviewed_at", "staff_notes", "supervisor_notes", "rejection_reason",
+)
+
+def _export_query(period_id: UUID):
+    staff = aliased(User)
+    supervisor = aliased(User)
+    return (
+        select(
+            Assignment.id, Assignment.status, Building.name, Location.floor_label, Location.name,
+            staff.full_name, supervisor.full_name, Assignment.rating,
+            Assignment.staff_completed_at, Assignment.supervisor_reviewed_at,
+            Assignment.staff_notes, Assignment.supervisor_notes, Assignment.rejection_reason,
+        )
+        .join(Location, Location.id == Assignment.location_id)
+        .join(Building, Building.id == Location.building_id)
+        .join(staff, staff.id == Assignment.staff_user_id)
+        .join(supervisor, supervisor.id == Assignment.supervisor_user_id)
+        .filter(Assignment.period_id == period_id)
+        .order_by(Building.name, Location.floor_label, Location.name, Assignment.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+
+async def _iter_export_rows(period_id: UUID, user_id: UUID) -> AsyncIterator[Any]:
+    # Own session: the stream outlives the request's dependencies
+    replica = None if replicas.wrote_recently(user_id) else replicas.pick_replica()
+    sessionmaker = replica.sessionmaker if replica else AsyncSessionLocal
+    async with sessionmaker() as db:
+        result = await db.stream(_export_query(period_id))
+        async for row in result:
+            yield row
+
+@router.get("/export", dependencies=[Depends(limit_group("exports"))])
+async def export_assignments(
+    period_id: UUID,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|xlsx)$"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Stream a period's assignments as CSV, NDJSON or XLSX
+
+    Rows come from a server-side cursor EXPORT_BATCH_SIZE at a time and are
+    encoded as they arrive, so memory stays flat whatever the period's size
+    and the header is sent before the query has finished. Names of the
+    location, building, staff and supervisor are joined in.
+    """
+    period = await db.get(Period, period_id)
+    if not period:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Period not found"
+        )
+
+    chunks = exports.encode(
+        export_format, EXPORT_COLUMNS, _iter_export_rows(period_id, current_user.id), title="Assignments"
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=exports.MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="assignments-{period_id}.{export_format}"'}
     )
 
 @router.get("/{assignment_id}", response_model=AssignmentResponse)
 async def get_assignment(
     assignment_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_principal)
 ):
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    assignment = await db.get(Assignment, assignment_id)
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -129,59 +478,69 @@ async def get_assignment(
             detail="Not enough permissions"
         )
     
+    # Answered after the RBAC checks so a 304 never confirms someone else's task
+    etag = resource_etag(assignment)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return AssignmentResponse.from_orm(assignment)
 
 @router.put("/{assignment_id}", response_model=AssignmentResponse)
 async def update_assignment(
     assignment_id: UUID,
     assignment_data: AssignmentUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    # Locked so the If-Match check and the write see the same row
+    assignment = await db.get(Assignment, assignment_id, with_for_update=if_match is not None)
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found"
         )
+    require_if_match(if_match, resource_etag(assignment))
     
     update_data = assignment_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(assignment, field, value)
     
-    db.commit()
-    db.refresh(assignment)
+    await db.commit()
+    await db.refresh(assignment)
     
+    set_etag(response, resource_etag(assignment))
     return AssignmentResponse.from_orm(assignment)
 
 @router.delete("/{assignment_id}")
 async def delete_assignment(
     assignment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    assignment = await db.get(Assignment, assignment_id)
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found"
         )
     
-    db.delete(assignment)
-    db.commit()
+    await db.delete(assignment)
+    await db.commit()
     
     return {"message": "Assignment deleted successfully"}
 
 # Staff endpoints
-@router.get("/my/assignments", response_model=PaginatedResponse)
+@router.get("/my/assignments", response_model=Page[AssignmentResponse])
 async def get_my_assignments(
     pagination: PaginationParams = Depends(),
     status: Optional[str] = None,
     period_id: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_staff)
 ):
-    query = db.query(Assignment).filter(Assignment.staff_user_id == current_user.id)
+    query = select(Assignment).filter(Assignment.staff_user_id == current_user.id)
     
     if status:
         query = query.filter(Assignment.status == status)
@@ -189,145 +548,166 @@ async def get_my_assignments(
         query = query.filter(Assignment.period_id == period_id)
     else:
         # Default to active period
-        active_period = db.query(Period).filter(Period.status == PeriodStatus.ACTIVE).first()
-        if active_period:
-            query = query.filter(Assignment.period_id == active_period.id)
-    
-    total = query.count()
-    assignments = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
+        active_period_id = await get_active_period_id(db)
+        if active_period_id:
+            query = query.filter(Assignment.period_id == active_period_id)
     
-    return PaginatedResponse(
-        items=[AssignmentResponse.from_orm(assignment) for assignment in assignments],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
-    )
+    return ORJSONResponse(await paginate(db, query, pagination, AssignmentResponse, Assignment))
 
-@router.post("/my/assignments/{assignment_id}/clean")
+@router.post("/my/assignments/{assignment_id}/clean", dependencies=[Depends(limit_group("transitions"))])
 async def clean_assignment(
     assignment_id: UUID,
     request: AssignmentCleanRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_staff)
 ):
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
-    if not assignment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assignment not found"
-        )
-    
-    if assignment.staff_user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    if assignment.status not in [AssignmentStatus.PENDING, AssignmentStatus.REJECTED]:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Assignment status is not suitable for cleaning"
-        )
-    
-    assignment.status = AssignmentStatus.CLEANED
-    assignment.staff_completed_at = datetime.utcnow()
+    values = {"staff_completed_at": func.now()}
     if request.staff_notes:
-        assignment.staff_notes = request.staff_notes
-    
-    db.commit()
+        values["staff_notes"] = request.staff_notes
+
+    await transition_assignment(db, assignment_id, AssignmentStatus.CLEANED, current_user.id, **values)
+    await db.commit()
     
     return {"message": "Assignment marked as cleaned successfully"}
 
 # Supervisor endpoints
-@router.get("/my/reviews", response_model=PaginatedResponse)
+@router.get("/my/reviews", response_model=Page[AssignmentResponse])
 async def get_my_reviews(
     pagination: PaginationParams = Depends(),
     status: str = AssignmentStatus.CLEANED,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_supervisor)
 ):
-    query = db.query(Assignment).filter(
+    query = select(Assignment).filter(
         Assignment.supervisor_user_id == current_user.id,
         Assignment.status == status
     )
     
-    total = query.count()
-    assignments = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
-    
-    return PaginatedResponse(
-        items=[AssignmentResponse.from_orm(assignment) for assignment in assignments],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
-    )
+    return ORJSONResponse(await paginate(db, query, pagination, AssignmentResponse, Assignment))
 
-@router.post("/my/reviews/{assignment_id}/approve")
-async def approve_assignment(
-    assignment_id: UUID,
-    request: AssignmentApproveRequest,
-    db: Session = Depends(get_db),
+@router.post(
+    "/my/reviews/batch",
+    response_model=AssignmentReviewBatchResponse,
+    dependencies=[Depends(limit_group("transitions"))]
+)
+async def review_assignments_batch(
+    request: AssignmentReviewBatchRequest,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_supervisor)
 ):
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
-    if not assignment:
+    """
+    Approve or reject many cleaned assignments in one transaction
+
+    All items are applied with a single guarded UPDATE ... FROM (VALUES ...)
+    that only touches the caller's assignments in cleaned status. Items the
+    UPDATE skipped are classified with one follow-up query.
+    """
+    if len(request.items) > settings.REVIEW_BATCH_MAX_ITEMS:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assignment not found"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.REVIEW_BATCH_MAX_ITEMS} items per batch"
         )
-    
-    if assignment.supervisor_user_id != current_user.id:
+    ids = [item.id for item in request.items]
+    if len(set(ids)) != len(ids):
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate assignment id in batch"
         )
-    
-    if assignment.status != AssignmentStatus.CLEANED:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Assignment must be in cleaned status to approve"
+    if not ids:
+        return AssignmentReviewBatchResponse(succeeded=0, failed=0, results=[])
+
+    reviews = values(
+        column("id", Assignment.id.type),
+        column("status", Assignment.status.type),
+        column("rating", SmallInteger),
+        column("supervisor_notes", Text),
+        column("rejection_reason", Text),
+        name="reviews"
+    ).data([
+        (
+            item.id,
+            AssignmentStatus.APPROVED if item.action == "approve" else AssignmentStatus.REJECTED,
+            item.rating if item.action == "approve" else None,
+            item.notes if item.action == "approve" else None,
+            item.notes if item.action == "reject" else None
         )
-    
-    assignment.status = AssignmentStatus.APPROVED
-    assignment.supervisor_reviewed_at = datetime.utcnow()
+        for item in request.items
+    ])
+
+    result = await db.execute(
+        update(Assignment)
+        .where(Assignment.id == reviews.c.id, *transition_guard(AssignmentStatus.APPROVED, current_user.id))
+        .values(
+            status=reviews.c.status,
+            supervisor_reviewed_at=func.now(),
+            rating=func.coalesce(cast(reviews.c.rating, SmallInteger), Assignment.rating),
+            supervisor_notes=func.coalesce(cast(reviews.c.supervisor_notes, Text), Assignment.supervisor_notes),
+            rejection_reason=func.coalesce(cast(reviews.c.rejection_reason, Text), Assignment.rejection_reason)
+        )
+        .returning(Assignment.id, Assignment.status)
+        .execution_options(synchronize_session=False)
+    )
+    updated = dict(result.all())
+
+    failed_ids = [assignment_id for assignment_id in ids if assignment_id not in updated]
+    failures = {}
+    if failed_ids:
+        # Approve and reject share actor and source rules
+        failures = await classify_transition_failures(db, failed_ids, AssignmentStatus.APPROVED, current_user.id)
+
+    await db.commit()
+
+    failure_details = {
+        TransitionFailure.NOT_FOUND: "Assignment not found",
+        TransitionFailure.FORBIDDEN: "Not enough permissions",
+        TransitionFailure.WRONG_STATE: "Assignment must be in cleaned status to review",
+    }
+    results = []
+    for assignment_id in ids:
+        if assignment_id in updated:
+            results.append(AssignmentReviewBatchResult(id=assignment_id, status=updated[assignment_id].value))
+        else:
+            failure = failures[assignment_id]
+            results.append(AssignmentReviewBatchResult(
+                id=assignment_id, status=failure.value, detail=failure_details[failure]
+            ))
+
+    return AssignmentReviewBatchResponse(
+        succeeded=len(updated),
+        failed=len(ids) - len(updated),
+        results=results
+    )
+
+@router.post("/my/reviews/{assignment_id}/approve", dependencies=[Depends(limit_group("transitions"))])
+async def approve_assignment(
+    assignment_id: UUID,
+    request: AssignmentApproveRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_supervisor)
+):
+    values = {"supervisor_reviewed_at": func.now()}
     if request.rating:
-        assignment.rating = request.rating
+        values["rating"] = request.rating
     if request.supervisor_notes:
-        assignment.supervisor_notes = request.supervisor_notes
-    
-    db.commit()
+        values["supervisor_notes"] = request.supervisor_notes
+
+    await transition_assignment(db, assignment_id, AssignmentStatus.APPROVED, current_user.id, **values)
+    await db.commit()
     
     return {"message": "Assignment approved successfully"}
 
-@router.post("/my/reviews/{assignment_id}/reject")
+@router.post("/my/reviews/{assignment_id}/reject", dependencies=[Depends(limit_group("transitions"))])
 async def reject_assignment(
     assignment_id: UUID,
     request: AssignmentRejectRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_supervisor)
 ):
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
-    if not assignment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assignment not found"
-        )
-    
-    if assignment.supervisor_user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    if assignment.status != AssignmentStatus.CLEANED:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Assignment must be in cleaned status to reject"
-        )
-    
-    assignment.status = AssignmentStatus.REJECTED
-    assignment.supervisor_reviewed_at = datetime.utcnow()
-    assignment.rejection_reason = request.rejection_reason
-    
-    db.commit()
+    await transition_assignment(
+        db, assignment_id, AssignmentStatus.REJECTED, current_user.id,
+        supervisor_reviewed_at=func.now(),
+        rejection_reason=request.rejection_reason
+    )
+    await db.commit()
     
     return {"message": "Assignment rejected successfully"}
@@ -3,18 +3,28 @@
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.config import settings
-from app.core.exceptions import InactiveUserError, InvalidCredentialsError
-from app.core.limiter import limiter
+from app.core.exceptions import InactiveUserError, InvalidCredentialsError, InvalidRefreshTokenError
+from app.core.limiter import hit_group_limit, limiter
 from app.core.logging import get_logger
 from app.db.base import get_db
 from app.db.models.user import User
-from app.schemas.common import LoginRequest, LoginResponse, MessageResponse, PasswordChangeRequest
+from app.schemas.common import (
+    LoginRequest, LoginResponse, MessageResponse, PasswordChangeRequest,
+    TokenRefreshRequest, TokenRefreshResponse
+)
 from app.schemas.user import UserResponse
-from app.security.auth import authenticate_user, create_access_token, get_password_hash, verify_password
+from app.security.auth import (
+    access_token_claims, authenticate_user, create_access_token, get_password_hash_async, verify_password_async
+)
+from app.security.refresh_tokens import (
+    hash_refresh_token, issue_refresh_token, prune_expired_refresh_tokens, revoke_user_refresh_tokens,
+    rotate_refresh_token
+)
+from app.security.user_cache import user_cache
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -25,7 +35,7 @@ logger = get_logger(__name__)
 async def login(
     request: Request,
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Login endpoint with rate limiting
@@ -33,7 +43,7 @@ async def login(
     Rate limit: 5 requests per minute per IP
     """
     # Authenticate user
-    user = authenticate_user(db, login_data.email, login_data.password)
+    user = await authenticate_user(db, login_data.email, login_data.password)
 
     if not user:
         logger.warning(
@@ -52,10 +62,15 @@ async def login(
     # Create access token
     access_token_expires = timedelta(minutes=settings.JWT_EXPIRES_MIN)
     access_token = create_access_token(
-        data={"sub": str(user.id), "role": user.role.value},
+        data=access_token_claims(user),
         expires_delta=access_token_expires
     )
 
+    # Start a new refresh token family for this login
+    await prune_expired_refresh_tokens(db, user.id)
+    refresh_token = issue_refresh_token(db, user.id)
+    await db.commit()
+
     logger.info(
         f"Successful login for user: {user.email}",
         extra={"user_id": str(user.id), "role": user.role.value}
@@ -63,6 +78,7 @@ async def login(
 
     return LoginResponse(
         access_token=access_token,
+        refresh_token=refresh_token,
         token_type="bearer",
         user={
             "id": str(user.id),
@@ -74,6 +90,44 @@ async def login(
     )
 
 
+@router.post("/refresh", response_model=TokenRefreshResponse)
+async def refresh_access_token(
+    request: Request,
+    refresh_data: TokenRefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access token
+
+    The refresh token is single use: the response carries its replacement.
+    Presenting an already-used token revokes every token from that login.
+    No password hashing is involved.
+
+    Rate limit: the "refresh" group, per refresh token rather than per IP,
+    so clients sharing a NAT do not exhaust each other's budget.
+    """
+    hit_group_limit(request, "refresh", f"refresh:{hash_refresh_token(refresh_data.refresh_token)}")
+    user_id, refresh_token = await rotate_refresh_token(db, refresh_data.refresh_token)
+
+    user = await user_cache.load(db, user_id)
+    if user is None:
+        raise InvalidRefreshTokenError()
+    if not user.is_active:
+        raise InactiveUserError()
+    await db.commit()
+
+    access_token = create_access_token(
+        data=access_token_claims(user),
+        expires_delta=timedelta(minutes=settings.JWT_EXPIRES_MIN)
+    )
+
+    return TokenRefreshResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer"
+    )
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current user information"""
@@ -86,15 +140,18 @@ async def change_password(
     request: Request,
     password_data: PasswordChangeRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Change password for current user
 
     Rate limit: 10 requests per hour per user
     """
+    # current_user may be a cached snapshot without the password hash
+    user = await db.get(User, current_user.id)
+
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, user.hashed_password):
         logger.warning(
             f"Failed password change attempt - wrong current password",
             extra={"user_id": str(current_user.id)}
@@ -102,8 +159,11 @@ async def change_password(
         raise InvalidCredentialsError()
 
     # Hash and update new password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
-    db.commit()
+    user.hashed_password = await get_password_hash_async(password_data.new_password)
+    # Sessions started with the old password must log in again
+    await revoke_user_refresh_tokens(db, user.id)
+    await db.commit()
+    await user_cache.invalidate(user.id)
 
     logger.info(
         f"Password changed successfully",
@@ -1,46 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 from app.db.base import get_db
 from app.db.models.user import User
 from app.db.models.building import Building
-from app.schemas.building import BuildingCreate, BuildingUpdate, BuildingResponse
-from app.schemas.common import PaginationParams, PaginatedResponse
-from app.api.deps import require_admin
+from app.db.models.location import Location
+from app.schemas.building import BuildingCreate, BuildingUpdate, BuildingResponse, BuildingTree
+from app.schemas.common import Page, PaginationParams
+from app.api.pagination import paginate
+from app.api.response_cache import cached_list, response_cache
+from app.api.conditional import (
+    REVALIDATE, etag_matches, make_etag, not_modified, require_if_match, resource_etag, set_etag
+)
+from app.api.deps import get_current_principal, get_read_db, require_admin
+from app.core.limiter import limit_group
 
 router = APIRouter()
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=Page[BuildingResponse], dependencies=[Depends(limit_group("admin_grids"))])
 async def get_buildings(
+    request: Request,
     pagination: PaginationParams = Depends(),
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    query = db.query(Building)
+    query = select(Building)
     
     if search:
         query = query.filter(Building.name.ilike(f"%{search}%"))
     
-    total = query.count()
-    buildings = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
-    
-    return PaginatedResponse(
-        items=[BuildingResponse.from_orm(building) for building in buildings],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
+    return await cached_list(
+        "buildings", ("buildings",), request, current_user, db,
+        lambda: paginate(db, query, pagination, BuildingResponse, Building)
     )
 
 @router.post("/", response_model=BuildingResponse)
 async def create_building(
     building_data: BuildingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     # Check if name already exists
-    existing_building = db.query(Building).filter(Building.name == building_data.name).first()
+    existing_building = await db.scalar(select(Building).filter(Building.name == building_data.name).limit(1))
     if existing_building:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -49,62 +54,145 @@ async def create_building(
     
     db_building = Building(**building_data.dict())
     db.add(db_building)
-    db.commit()
-    db.refresh(db_building)
+    await db.commit()
+    await response_cache.bump("buildings")
+    await db.refresh(db_building)
     
     return BuildingResponse.from_orm(db_building)
 
 @router.get("/{building_id}", response_model=BuildingResponse)
 async def get_building(
     building_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    building = db.query(Building).filter(Building.id == building_id).first()
+    building = await db.get(Building, building_id)
     if not building:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Building not found"
         )
+    etag = resource_etag(building)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return BuildingResponse.from_orm(building)
 
+@router.get("/{building_id}/tree", response_model=BuildingTree)
+async def get_building_tree(
+    building_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    The building's whole location hierarchy, nested
+
+    The ETag is derived from tree_version (bumped by a trigger on any
+    location write in the building) and the building's updated_at, so a
+    revalidation costs one primary-key lookup.
+    """
+    building = await db.get(Building, building_id)
+    if not building:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Building not found"
+        )
+
+    etag = make_etag("tree", building.tree_version, int(building.updated_at.timestamp() * 1_000_000))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    result = await db.execute(
+        select(
+            Location.id, Location.parent_location_id, Location.name, Location.location_type,
+            Location.location_subtype, Location.department_id, Location.is_leaf,
+            Location.floor_label, Location.area_sqm, Location.is_active
+        )
+        .filter(Location.building_id == building_id)
+        .order_by(Location.name, Location.id)
+    )
+    rows = result.all()
+
+    # Built as plain JSON types and serialized once, bypassing response_model
+    nodes = {
+        row.id: {
+            "id": str(row.id),
+            "name": row.name,
+            "location_type": row.location_type.value,
+            "location_subtype": row.location_subtype,
+            "department_id": str(row.department_id) if row.department_id else None,
+            "is_leaf": row.is_leaf,
+            "floor_label": row.floor_label,
+            "area_sqm": row.area_sqm,
+            "is_active": row.is_active,
+            "children": [],
+        }
+        for row in rows
+    }
+    roots = []
+    for row in rows:
+        # Parents outside the building are treated as missing
+        parent = nodes.get(row.parent_location_id)
+        (parent["children"] if parent else roots).append(nodes[row.id])
+
+    return JSONResponse(
+        content={
+            "id": str(building.id),
+            "name": building.name,
+            "code": building.code,
+            "is_active": building.is_active,
+            "locations": roots,
+        },
+        headers={"ETag": etag, "Cache-Control": REVALIDATE}
+    )
+
 @router.put("/{building_id}", response_model=BuildingResponse)
 async def update_building(
     building_id: UUID,
     building_data: BuildingUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    building = db.query(Building).filter(Building.id == building_id).first()
+    # Locked so the If-Match check and the write see the same row
+    building = await db.get(Building, building_id, with_for_update=if_match is not None)
     if not building:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Building not found"
         )
+    require_if_match(if_match, resource_etag(building))
     
     update_data = building_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(building, field, value)
     
-    db.commit()
-    db.refresh(building)
+    await db.commit()
+    await response_cache.bump("buildings")
+    await db.refresh(building)
     
+    set_etag(response, resource_etag(building))
     return BuildingResponse.from_orm(building)
 
 @router.delete("/{building_id}")
 async def delete_building(
     building_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    building = db.query(Building).filter(Building.id == building_id).first()
+    building = await db.get(Building, building_id)
     if not building:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Building not found"
         )
     
-    db.delete(building)
-    db.commit()
+    await db.delete(building)
+    await db.commit()
+    await response_cache.bump("buildings")
     
     return {"message": "Building deleted successfully"}
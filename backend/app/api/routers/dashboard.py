@@ -1,52 +1,186 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+from app.core.config import settings
 from app.db.base import get_db
 from app.db.models.user import User
-from app.db.models.assignment import Assignment, AssignmentStatus
-from app.db.models.period import Period, PeriodStatus
-from app.schemas.common import DashboardStats
-from app.api.deps import require_admin
+from app.db.models.assignment import AssignmentStatus
+from app.db.models.building import Building
+from app.db.models.department import Department
+from app.db.active_period import get_active_period_id
+from app.db.models.period import Period
+from app.db.models.period_stats import PeriodStats
+from app.db.models.rollup_refresh import RollupRefresh
+from app.db.rollup import ROLLUP_NAME, assignment_rollup, refresh_rollup
+from app.schemas.common import DashboardBreakdown, DashboardBreakdownRow, DashboardStats
+from app.api.deps import get_read_db, require_admin
+from app.core.limiter import limit_group
 
 router = APIRouter()
 
+BREAKDOWN_DIMENSIONS = ("building", "department", "floor", "staff", "supervisor", "status")
+
+
+async def _get_active_period_id(db: AsyncSession) -> UUID:
+    active_period_id = await get_active_period_id(db)
+    if active_period_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No active period found"
+        )
+    return active_period_id
+
+
+def _parse_group_by(value: str) -> List[str]:
+    group_by = list(dict.fromkeys(part.strip() for part in value.split(",") if part.strip()))
+    unknown = [dim for dim in group_by if dim not in BREAKDOWN_DIMENSIONS]
+    if not group_by or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"group_by must be a comma-separated list of: {', '.join(BREAKDOWN_DIMENSIONS)}"
+        )
+    return group_by
+
+
 @router.get("/active-period-stats", response_model=DashboardStats)
 async def get_active_period_stats(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_admin)
+):
+    active_period_id = await _get_active_period_id(db)
+
+    # Counters are kept current by triggers on assignments
+    stats = await db.get(PeriodStats, active_period_id)
+    if stats is None:
+        # No assignment has ever been written for this period
+        stats = PeriodStats(period_id=active_period_id, pending=0, cleaned=0, rejected=0, approved=0)
+
+    return DashboardStats(
+        period_id=str(active_period_id),
+        pending=stats.pending,
+        cleaned=stats.cleaned,
+        rejected=stats.rejected,
+        approved=stats.approved
+    )
+
+
+@router.get(
+    "/breakdown",
+    response_model=DashboardBreakdown,
+    response_model_exclude_unset=True,
+    dependencies=[Depends(limit_group("admin_grids"))]
+)
+async def get_breakdown(
+    group_by: str = Query(..., max_length=100, description="e.g. building,status"),
+    period_id: Optional[UUID] = Query(None, description="Defaults to the active period"),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    # Get active period
-    active_period = db.query(Period).filter(Period.status == PeriodStatus.ACTIVE).first()
-    if not active_period:
+    """
+    Completion and rejection counts grouped by any mix of dimensions
+
+    Served from the assignment_rollup materialized view, which is rebuilt
+    every DASHBOARD_ROLLUP_REFRESH_SECONDS; the freshness fields say how
+    old the numbers are and whether status counts have moved since.
+    """
+    dimensions = _parse_group_by(group_by)
+
+    if period_id is None:
+        period_id = await _get_active_period_id(db)
+    elif await db.get(Period, period_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="No active period found"
+            detail="Period not found"
         )
-    
-    # Get assignment counts for active period
-    stats = db.query(
-        Assignment.status,
-        func.count(Assignment.id).label('count')
-    ).filter(
-        Assignment.period_id == active_period.id
-    ).group_by(Assignment.status).all()
-    
-    # Initialize counts
-    counts = {
-        AssignmentStatus.PENDING: 0,
-        AssignmentStatus.CLEANED: 0,
-        AssignmentStatus.REJECTED: 0,
-        AssignmentStatus.APPROVED: 0
-    }
-    
-    # Update counts from query results
-    for status, count in stats:
-        counts[status] = count
-    
-    return DashboardStats(
-        period_id=active_period.id,
-        pending=counts[AssignmentStatus.PENDING],
-        cleaned=counts[AssignmentStatus.CLEANED],
-        rejected=counts[AssignmentStatus.REJECTED],
-        approved=counts[AssignmentStatus.APPROVED]
+
+    rollup = assignment_rollup.c
+    source = assignment_rollup
+    keys = []  # (response field, expression), display names first for ordering
+    for dim in dimensions:
+        if dim == "building":
+            source = source.outerjoin(Building, Building.id == rollup.building_id)
+            keys += [("building_name", Building.name), ("building_id", rollup.building_id)]
+        elif dim == "department":
+            source = source.outerjoin(Department, Department.id == rollup.department_id)
+            keys += [("department_name", Department.name), ("department_id", rollup.department_id)]
+        elif dim == "floor":
+            keys += [("floor_label", rollup.floor_label)]
+        elif dim in ("staff", "supervisor"):
+            user = aliased(User)
+            id_column = rollup.staff_user_id if dim == "staff" else rollup.supervisor_user_id
+            source = source.outerjoin(user, user.id == id_column)
+            keys += [(f"{dim}_name", user.full_name), (f"{dim}_user_id", id_column)]
+        else:
+            keys += [("status", rollup.status)]
+
+    expressions = [expression for _, expression in keys]
+    result = await db.execute(
+        select(
+            *[expression.label(name) for name, expression in keys],
+            func.sum(rollup.assignments).label("total"),
+            *[
+                func.coalesce(func.sum(rollup.assignments).filter(rollup.status == s), 0).label(s.value)
+                for s in AssignmentStatus
+            ],
+            func.sum(rollup.rated).label("rated"),
+            func.sum(rollup.rating_sum).label("rating_sum"),
+        )
+        .select_from(source)
+        .filter(rollup.period_id == period_id)
+        .group_by(*expressions)
+        .order_by(*expressions)
     )
+
+    rows = []
+    for row in result:
+        values = row._mapping
+        total = values["total"]
+        group = {name: values[name] for name, _ in keys}
+        if "status" in group:
+            group["status"] = group["status"].value
+        rows.append(DashboardBreakdownRow(
+            **group,
+            total=total,
+            **{s.value: values[s.value] for s in AssignmentStatus},
+            completion_rate=(values["cleaned"] + values["approved"]) / total,
+            rejection_rate=values["rejected"] / total,
+            average_rating=values["rating_sum"] / values["rated"] if values["rated"] else None
+        ))
+
+    refresh = await db.get(RollupRefresh, ROLLUP_NAME)
+    stats = await db.get(PeriodStats, period_id)
+    refreshed_at = refresh.refreshed_at if refresh else None
+    source_updated_at = stats.updated_at if stats else None
+
+    return DashboardBreakdown(
+        period_id=period_id,
+        group_by=dimensions,
+        rows=rows,
+        refreshed_at=refreshed_at,
+        age_seconds=(datetime.now(timezone.utc) - refreshed_at).total_seconds() if refreshed_at else None,
+        source_updated_at=source_updated_at,
+        is_stale=refreshed_at is None or (
+            source_updated_at is not None and source_updated_at > refreshed_at
+        ),
+        refresh_interval_seconds=settings.DASHBOARD_ROLLUP_REFRESH_SECONDS
+    )
+
+
+@router.post("/breakdown/refresh")
+async def refresh_breakdown(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """Rebuild the breakdown rollup now instead of waiting for the schedule"""
+    duration_ms = await refresh_rollup(db)
+    if duration_ms is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A rollup refresh is already running"
+        )
+    return {"refreshed": True, "duration_ms": duration_ms}
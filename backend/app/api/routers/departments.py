@@ -1,45 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 from app.db.base import get_db
 from app.db.models.user import User
 from app.db.models.department import Department
 from app.schemas.department import DepartmentCreate, DepartmentUpdate, DepartmentResponse
-from app.schemas.common import PaginationParams, PaginatedResponse
-from app.api.deps import require_admin
+from app.schemas.common import Page, PaginationParams
+from app.api.pagination import paginate
+from app.api.response_cache import cached_list, response_cache
+from app.api.conditional import etag_matches, not_modified, require_if_match, resource_etag, set_etag
+from app.api.deps import get_read_db, require_admin
+from app.core.limiter import limit_group
 
 router = APIRouter()
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=Page[DepartmentResponse], dependencies=[Depends(limit_group("admin_grids"))])
 async def get_departments(
+    request: Request,
     pagination: PaginationParams = Depends(),
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    query = db.query(Department)
+    query = select(Department)
     
     if search:
         query = query.filter(Department.name.ilike(f"%{search}%"))
     
-    total = query.count()
-    departments = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
-    
-    return PaginatedResponse(
-        items=[DepartmentResponse.from_orm(department) for department in departments],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
+    return await cached_list(
+        "departments", ("departments",), request, current_user, db,
+        lambda: paginate(db, query, pagination, DepartmentResponse, Department)
     )
 
 @router.post("/", response_model=DepartmentResponse)
 async def create_department(
     department_data: DepartmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    existing_department = db.query(Department).filter(Department.name == department_data.name).first()
+    existing_department = await db.scalar(select(Department).filter(Department.name == department_data.name).limit(1))
     if existing_department:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -48,62 +49,76 @@ async def create_department(
     
     db_department = Department(**department_data.dict())
     db.add(db_department)
-    db.commit()
-    db.refresh(db_department)
+    await db.commit()
+    await response_cache.bump("departments")
+    await db.refresh(db_department)
     
     return DepartmentResponse.from_orm(db_department)
 
 @router.get("/{department_id}", response_model=DepartmentResponse)
 async def get_department(
     department_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    department = db.query(Department).filter(Department.id == department_id).first()
+    department = await db.get(Department, department_id)
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Department not found"
         )
+    etag = resource_etag(department)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return DepartmentResponse.from_orm(department)
 
 @router.put("/{department_id}", response_model=DepartmentResponse)
 async def update_department(
     department_id: UUID,
     department_data: DepartmentUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    department = db.query(Department).filter(Department.id == department_id).first()
+    # Locked so the If-Match check and the write see the same row
+    department = await db.get(Department, department_id, with_for_update=if_match is not None)
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Department not found"
         )
+    require_if_match(if_match, resource_etag(department))
     
     update_data = department_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(department, field, value)
     
-    db.commit()
-    db.refresh(department)
+    await db.commit()
+    await response_cache.bump("departments")
+    await db.refresh(department)
     
+    set_etag(response, resource_etag(department))
     return DepartmentResponse.from_orm(department)
 
 @router.delete("/{department_id}")
 async def delete_department(
     department_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    department = db.query(Department).filter(Department.id == department_id).first()
+    department = await db.get(Department, department_id)
     if not department:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Department not found"
         )
     
-    db.delete(department)
-    db.commit()
+    await db.delete(department)
+    await db.commit()
+    await response_cache.bump("departments")
     
     return {"message": "Department deleted successfully"}
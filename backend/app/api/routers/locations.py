@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 from app.db.base import get_db
 from app.db.models.user import User
 from app.db.models.location import Location
+from app.db.models.location_closure import LocationClosure
+from app.db import location_tree
 from app.schemas.location import LocationCreate, LocationUpdate, LocationResponse
-from app.schemas.common import PaginationParams, PaginatedResponse
-from app.api.deps import require_admin
+from app.schemas.common import Page, PaginationParams
+from app.api.pagination import paginate
+from app.api.response_cache import cached_list, response_cache
+from app.api.conditional import etag_matches, not_modified, require_if_match, resource_etag, set_etag
+from app.api.deps import get_read_db, require_admin
+from app.core.limiter import limit_group
 
 router = APIRouter()
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=Page[LocationResponse], dependencies=[Depends(limit_group("admin_grids"))])
 async def get_locations(
+    request: Request,
     pagination: PaginationParams = Depends(),
     building_id: Optional[str] = None,
     department_id: Optional[str] = None,
@@ -20,11 +28,17 @@ async def get_locations(
     location_type: Optional[str] = None,
     active: Optional[bool] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    ancestor_location_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    query = db.query(Location)
+    query = select(Location)
     
+    if ancestor_location_id:
+        # The location itself and everything under it
+        query = query.join(LocationClosure, LocationClosure.descendant_id == Location.id).filter(
+            LocationClosure.ancestor_id == ancestor_location_id
+        )
     if building_id:
         query = query.filter(Location.building_id == building_id)
     if department_id:
@@ -38,25 +52,20 @@ async def get_locations(
     if search:
         query = query.filter(Location.name.ilike(f"%{search}%"))
     
-    total = query.count()
-    locations = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
-    
-    return PaginatedResponse(
-        items=[LocationResponse.from_orm(location) for location in locations],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
+    return await cached_list(
+        "locations", ("locations", "location_closure"), request, current_user, db,
+        lambda: paginate(db, query, pagination, LocationResponse, Location)
     )
 
 @router.post("/", response_model=LocationResponse)
 async def create_location(
     location_data: LocationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     # Validate parent_location_id if provided
     if location_data.parent_location_id:
-        parent = db.query(Location).filter(Location.id == location_data.parent_location_id).first()
+        parent = await db.get(Location, location_data.parent_location_id)
         if not parent:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,62 +79,103 @@ async def create_location(
     
     db_location = Location(**location_data.dict())
     db.add(db_location)
-    db.commit()
-    db.refresh(db_location)
+    await db.flush()
+    await location_tree.add_location(db, db_location.id, db_location.parent_location_id)
+    await db.commit()
+    await response_cache.bump("locations", "location_closure")
+    await db.refresh(db_location)
     
     return LocationResponse.from_orm(db_location)
 
 @router.get("/{location_id}", response_model=LocationResponse)
 async def get_location(
     location_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    location = db.query(Location).filter(Location.id == location_id).first()
+    location = await db.get(Location, location_id)
     if not location:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Location not found"
         )
+    etag = resource_etag(location)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return LocationResponse.from_orm(location)
 
 @router.put("/{location_id}", response_model=LocationResponse)
 async def update_location(
     location_id: UUID,
     location_data: LocationUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    location = db.query(Location).filter(Location.id == location_id).first()
+    # Locked so the If-Match check and the write see the same row
+    location = await db.get(Location, location_id, with_for_update=if_match is not None)
     if not location:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Location not found"
         )
+    require_if_match(if_match, resource_etag(location))
     
     update_data = location_data.dict(exclude_unset=True)
+    new_parent_id = update_data.get("parent_location_id", location.parent_location_id)
+    moved = new_parent_id != location.parent_location_id
+    if moved and new_parent_id:
+        parent = await db.get(Location, new_parent_id)
+        if not parent:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parent location not found"
+            )
+        if parent.is_leaf:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Parent location must not be a leaf"
+            )
+        if await location_tree.is_in_subtree(db, new_parent_id, location_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Location cannot be moved under itself"
+            )
+    
     for field, value in update_data.items():
         setattr(location, field, value)
     
-    db.commit()
-    db.refresh(location)
+    if moved:
+        await location_tree.move_subtree(db, location_id, new_parent_id)
+    await db.commit()
+    await response_cache.bump("locations", "location_closure")
+    await db.refresh(location)
     
+    set_etag(response, resource_etag(location))
     return LocationResponse.from_orm(location)
 
 @router.delete("/{location_id}")
 async def delete_location(
     location_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    location = db.query(Location).filter(Location.id == location_id).first()
+    location = await db.get(Location, location_id)
     if not location:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Location not found"
         )
     
-    db.delete(location)
-    db.commit()
+    # Children are orphaned (parent set to NULL) by the ORM, so their
+    # subtrees become roots; the location's own rows cascade with it
+    await location_tree.detach_subtree(db, location_id)
+    await db.delete(location)
+    await db.commit()
+    await response_cache.bump("locations", "location_closure")
     
     return {"message": "Location deleted successfully"}
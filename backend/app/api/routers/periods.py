@@ -1,42 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy import case, cast, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 from app.db.base import get_db
+from app.db.events import mark_tables_written
 from app.db.models.user import User
 from app.db.models.period import Period, PeriodStatus
-from app.schemas.period import PeriodCreate, PeriodUpdate, PeriodResponse
-from app.schemas.common import PaginationParams, PaginatedResponse
-from app.api.deps import require_admin
+from app.db.models.assignment import Assignment, AssignmentStatus
+from app.db.models.location import Location
+from app.schemas.period import PeriodCreate, PeriodUpdate, PeriodResponse, PeriodCloneRequest, PeriodCloneResponse
+from app.schemas.common import Page, PaginationParams
+from app.api.pagination import paginate
+from app.api.response_cache import cached_list, response_cache
+from app.api.conditional import etag_matches, not_modified, require_if_match, resource_etag, set_etag
+from app.api.deps import get_read_db, require_admin
+from app.db.active_period import active_period_cache
+from app.core.limiter import limit_group
 
 router = APIRouter()
 
-@router.get("/", response_model=PaginatedResponse)
+ANOTHER_PERIOD_ACTIVE = "Another period is already active; complete it first"
+PERIOD_HAS_ASSIGNMENTS = "Period has assignments; delete them first"
+
+# Constraint a period write can lose a race on -> conflict it reports
+_CONFLICTS = {
+    "uq_periods_single_active": ANOTHER_PERIOD_ACTIVE,
+    "assignments_period_id_fkey": PERIOD_HAS_ASSIGNMENTS,
+}
+
+
+async def _ensure_no_other_active(db: AsyncSession, period_id: Optional[UUID] = None) -> None:
+    query = select(Period.id).filter(Period.status == PeriodStatus.ACTIVE)
+    if period_id is not None:
+        query = query.filter(Period.id != period_id)
+    if await db.scalar(query) is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=ANOTHER_PERIOD_ACTIVE)
+
+
+async def _commit_period_change(db: AsyncSession) -> None:
+    """Commit a period write and drop what was cached from the old state"""
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        # Lost a race against a concurrent activation or assignment insert
+        await db.rollback()
+        violated = str(e.orig)
+        for constraint, detail in _CONFLICTS.items():
+            if constraint in violated:
+                raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
+        raise
+    active_period_cache.invalidate()
+    await response_cache.bump("periods")
+
+@router.get("/", response_model=Page[PeriodResponse], dependencies=[Depends(limit_group("admin_grids"))])
 async def get_periods(
+    request: Request,
     pagination: PaginationParams = Depends(),
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    query = db.query(Period)
+    query = select(Period)
     
     if status:
         query = query.filter(Period.status == status)
     
-    total = query.count()
-    periods = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
-    
-    return PaginatedResponse(
-        items=[PeriodResponse.from_orm(period) for period in periods],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
+    return await cached_list(
+        "periods", ("periods",), request, current_user, db,
+        lambda: paginate(db, query, pagination, PeriodResponse, Period)
     )
 
 @router.post("/", response_model=PeriodResponse)
 async def create_period(
     period_data: PeriodCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     if period_data.start_date > period_data.end_date:
@@ -45,75 +85,185 @@ async def create_period(
             detail="Start date must be before end date"
         )
     
+    if period_data.status == PeriodStatus.ACTIVE:
+        await _ensure_no_other_active(db)
+    
     db_period = Period(**period_data.dict())
     db.add(db_period)
-    db.commit()
-    db.refresh(db_period)
+    await _commit_period_change(db)
+    await db.refresh(db_period)
     
     return PeriodResponse.from_orm(db_period)
 
 @router.get("/{period_id}", response_model=PeriodResponse)
 async def get_period(
     period_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    period = db.query(Period).filter(Period.id == period_id).first()
+    period = await db.get(Period, period_id)
     if not period:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Period not found"
         )
+    etag = resource_etag(period)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return PeriodResponse.from_orm(period)
 
 @router.put("/{period_id}", response_model=PeriodResponse)
 async def update_period(
     period_id: UUID,
     period_data: PeriodUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    period = db.query(Period).filter(Period.id == period_id).first()
+    # Locked so the If-Match check and the write see the same row
+    period = await db.get(Period, period_id, with_for_update=if_match is not None)
     if not period:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Period not found"
         )
+    require_if_match(if_match, resource_etag(period))
     
     update_data = period_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(period, field, value)
     
-    db.commit()
-    db.refresh(period)
+    await _commit_period_change(db)
+    await db.refresh(period)
     
+    set_etag(response, resource_etag(period))
     return PeriodResponse.from_orm(period)
 
 @router.put("/{period_id}/activate")
 async def activate_period(
     period_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    period = db.query(Period).filter(Period.id == period_id).first()
+    period = await db.get(Period, period_id)
     if not period:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Period not found"
         )
     
+    await _ensure_no_other_active(db, period.id)
     period.status = PeriodStatus.ACTIVE
-    db.commit()
+    await _commit_period_change(db)
     
     return {"message": "Period activated successfully"}
 
+@router.post("/{period_id}/clone-assignments", response_model=PeriodCloneResponse)
+async def clone_period_assignments(
+    period_id: UUID,
+    clone_data: PeriodCloneRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Copy assignments from a source period into this period
+
+    Runs a single INSERT ... SELECT, optionally restricted to a building or
+    department and with staff/supervisor substitutions applied on the way.
+    Locations already assigned in the target period are skipped. The same
+    statement counts the candidate rows and the inserted ones.
+    """
+    if clone_data.source_period_id == period_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source and target period must differ"
+        )
+
+    target = await db.get(Period, period_id)
+    if not target:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Period not found"
+        )
+    if target.status == PeriodStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot add assignments to a completed period"
+        )
+    if not await db.get(Period, clone_data.source_period_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Source period not found"
+        )
+
+    replacement_ids = set(clone_data.staff_substitutions.values()) | set(clone_data.supervisor_substitutions.values())
+    if replacement_ids:
+        found = set((await db.scalars(select(User.id).filter(User.id.in_(replacement_ids)))).all())
+        if found != replacement_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Substitution user not found"
+            )
+
+    staff_user_id = Assignment.staff_user_id
+    if clone_data.staff_substitutions:
+        staff_user_id = case(clone_data.staff_substitutions, value=Assignment.staff_user_id, else_=Assignment.staff_user_id)
+    supervisor_user_id = Assignment.supervisor_user_id
+    if clone_data.supervisor_substitutions:
+        supervisor_user_id = case(clone_data.supervisor_substitutions, value=Assignment.supervisor_user_id, else_=Assignment.supervisor_user_id)
+
+    source_filter = [Assignment.period_id == clone_data.source_period_id]
+    if clone_data.building_id:
+        source_filter.append(Location.building_id == clone_data.building_id)
+    if clone_data.department_id:
+        source_filter.append(Location.department_id == clone_data.department_id)
+    if clone_data.only_active_locations:
+        source_filter.append(Location.is_active.is_(True))
+
+    source = select(
+        func.gen_random_uuid().label("id"),
+        Assignment.location_id,
+        literal(period_id, Assignment.period_id.type).label("period_id"),
+        staff_user_id.label("staff_user_id"),
+        supervisor_user_id.label("supervisor_user_id"),
+        # A CTE column of unknown type resolves to text, not the enum
+        cast(literal(AssignmentStatus.PENDING, Assignment.status.type), Assignment.status.type).label("status")
+    ).join(Location, Location.id == Assignment.location_id).filter(*source_filter).cte("source")
+    inserted = (
+        pg_insert(Assignment)
+        .from_select(["id", "location_id", "period_id", "staff_user_id", "supervisor_user_id", "status"], select(source))
+        .on_conflict_do_nothing(index_elements=["location_id", "period_id"])
+        .returning(Assignment.id)
+        .cte("inserted")
+    )
+
+    candidates, created = (await db.execute(select(
+        select(func.count()).select_from(source).scalar_subquery(),
+        select(func.count()).select_from(inserted).scalar_subquery()
+    ))).one()
+    # The insert hides in a CTE, where the statement hook cannot see it
+    mark_tables_written(db.sync_session, "assignments")
+    await db.commit()
+
+    return PeriodCloneResponse(
+        source_period_id=clone_data.source_period_id,
+        target_period_id=period_id,
+        candidates=candidates,
+        created=created,
+        skipped=candidates - created
+    )
+
 @router.put("/{period_id}/complete")
 async def complete_period(
     period_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    period = db.query(Period).filter(Period.id == period_id).first()
+    period = await db.get(Period, period_id)
     if not period:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -121,24 +271,27 @@ async def complete_period(
         )
     
     period.status = PeriodStatus.COMPLETED
-    db.commit()
+    await _commit_period_change(db)
     
     return {"message": "Period completed successfully"}
 
 @router.delete("/{period_id}")
 async def delete_period(
     period_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    period = db.query(Period).filter(Period.id == period_id).first()
+    period = await db.get(Period, period_id)
     if not period:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Period not found"
         )
+
+    if await db.scalar(select(Assignment.id).filter(Assignment.period_id == period_id).limit(1)) is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=PERIOD_HAS_ASSIGNMENTS)
     
-    db.delete(period)
-    db.commit()
+    await db.delete(period)
+    await _commit_period_change(db)
     
     return {"message": "Period deleted successfully"}
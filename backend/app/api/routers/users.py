@@ -1,25 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 from app.db.base import get_db
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
-from app.schemas.common import PaginationParams, PaginatedResponse
-from app.security.auth import get_password_hash
-from app.api.deps import require_admin
+from app.schemas.common import Page, PaginationParams
+from app.security.auth import get_password_hash_async
+from app.security.token_versions import token_versions
+from app.security.user_cache import user_cache
+from app.api.pagination import paginate
+from app.api.responses import ORJSONResponse
+from app.api.conditional import etag_matches, not_modified, require_if_match, resource_etag, set_etag
+from app.api.deps import get_read_db, require_admin
+from app.core.limiter import limit_group
 
 router = APIRouter()
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=Page[UserResponse], dependencies=[Depends(limit_group("admin_grids"))])
 async def get_users(
     pagination: PaginationParams = Depends(),
     role: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    query = db.query(User)
+    query = select(User)
     
     if role:
         query = query.filter(User.role == role)
@@ -27,31 +34,23 @@ async def get_users(
     if search:
         query = query.filter(User.full_name.ilike(f"%{search}%"))
     
-    total = query.count()
-    users = query.offset((pagination.page - 1) * pagination.page_size).limit(pagination.page_size).all()
-    
-    return PaginatedResponse(
-        items=[UserResponse.from_orm(user) for user in users],
-        page=pagination.page,
-        page_size=pagination.page_size,
-        total=total
-    )
+    return ORJSONResponse(await paginate(db, query, pagination, UserResponse, User))
 
 @router.post("/", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).filter(User.email == user_data.email).limit(1))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered"
         )
     
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -61,62 +60,85 @@ async def create_user(
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return UserResponse.from_orm(db_user)
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    etag = resource_etag(user)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return UserResponse.from_orm(user)
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: UUID,
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    # Locked so the If-Match check and the write see the same row
+    user = await db.get(User, user_id, with_for_update=if_match is not None)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    require_if_match(if_match, resource_etag(user))
     
     update_data = user_data.dict(exclude_unset=True)
+    # Outstanding access tokens carry the old role; make them stale
+    revokes_tokens = any(
+        field in update_data and update_data[field] != getattr(user, field)
+        for field in ("role", "is_active")
+    )
     for field, value in update_data.items():
         setattr(user, field, value)
+    if revokes_tokens:
+        user.token_version += 1
     
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await user_cache.invalidate(user_id)
+    if revokes_tokens:
+        token_versions.forget(user_id)
+    await db.refresh(user)
     
+    set_etag(response, resource_etag(user))
     return UserResponse.from_orm(user)
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    await user_cache.invalidate(user_id)
+    token_versions.forget(user_id)
     
     return {"message": "User deleted successfully"}
@@ -0,0 +1,418 @@
+"""
+Two-level cache
+
+Each Cache is a namespace with a size-bounded TTL LRU in the worker (L1)
+and, with REDIS_ENABLED, a shared copy in Redis (L2) stored under
+``cache:{namespace}:{key}`` in the namespace's serialization. Without
+Redis it is L1 only and behaves the same otherwise.
+
+delete() publishes the keys on CACHE_INVALIDATION_CHANNEL, and every
+worker's run_cache_invalidation_listener drops them from its L1. Pub/sub
+delivery is at most once, so with Redis an L1 copy lives at most
+CACHE_L1_TTL_SECONDS; namespaces whose keys are versioned (and can never
+go stale) may opt out with local_ttl_seconds.
+
+get_or_load coalesces concurrent misses on a key: within a worker they
+share one load, and across workers the first to take a short Redis lock
+loads while the others wait for its result to land in L2.
+
+A load must not store what it read before a delete() made it stale. In
+the worker, a generation counter catches deletes that overlap the load.
+Across workers, delete() also bumps a per-key counter in Redis. The load
+reads that counter before calling its loader and stores to L2 only if
+it is unchanged, checked and written in one script.
+
+Values handed out from L1 are shared between requests and must not be
+mutated.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+
+logger = get_logger(__name__)
+
+_KEY_PREFIX = "cache:"
+_LOCK_PREFIX = "cache-lock:"
+_GENERATION_PREFIX = "cache-gen:"
+# Far longer than any load; a counter that expired mid-load only skips a store
+_GENERATION_TTL_MS = 3600 * 1000
+_LOCK_POLL_SECONDS = 0.025
+
+# Deletes the lock only if it is still ours
+_UNLOCK_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+# Stores a loaded value only if no delete() bumped the key's generation since the load began
+_STORE_SCRIPT = (
+    "if (redis.call('get', KEYS[2]) or '0') ~= ARGV[3] then return 0 end "
+    "redis.call('set', KEYS[1], ARGV[1], 'px', ARGV[2]) return 1"
+)
+
+# Result of a failed coalesced load: waiters load for themselves
+_RETRY = object()
+
+_caches: Dict[str, "Cache"] = {}
+
+
+class Serializer:
+    """How a namespace's values are stored in Redis; L1 keeps the objects"""
+
+    def dumps(self, value: Any) -> str:
+        raise NotImplementedError
+
+    def loads(self, raw: str) -> Any:
+        raise NotImplementedError
+
+
+class JsonSerializer(Serializer):
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    def loads(self, raw: str) -> Any:
+        return json.loads(raw)
+
+
+class RawSerializer(Serializer):
+    """Values that are strings already"""
+
+    def dumps(self, value: Any) -> str:
+        return value
+
+    def loads(self, raw: str) -> Any:
+        return raw
+
+
+class Cache:
+    """One namespace of the two-level cache"""
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: float,
+        max_entries: int,
+        serializer: Optional[Serializer] = None,
+        local_ttl_seconds: Optional[float] = None
+    ):
+        """
+        Args:
+            namespace: Unique name, part of every Redis key
+            ttl_seconds: Lifetime of an entry; 0 disables the namespace
+            max_entries: Bound of the L1
+            serializer: Redis representation of values (JSON by default)
+            local_ttl_seconds: L1 lifetime with Redis, instead of
+                CACHE_L1_TTL_SECONDS
+        """
+        if namespace in _caches:
+            raise ValueError(f"Cache namespace {namespace!r} already exists")
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.serializer = serializer or JsonSerializer()
+        self.local_ttl_seconds = local_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._loads: Dict[str, asyncio.Future] = {}
+        # Bumped by every invalidation; a load that overlapped one is not stored
+        self.generation = 0
+        self._metrics: Counter = Counter()
+        _caches[namespace] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{_KEY_PREFIX}{self.namespace}:{key}"
+
+    def _generation_key(self, key: str) -> str:
+        return f"{_GENERATION_PREFIX}{self.namespace}:{key}"
+
+    def _local_ttl(self, ttl: float, shared: bool) -> float:
+        if not shared:
+            return ttl
+        cap = settings.CACHE_L1_TTL_SECONDS if self.local_ttl_seconds is None else self.local_ttl_seconds
+        return min(ttl, cap)
+
+    # L1
+
+    def _get_local(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def drop_local(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Forget keys (or everything) in this worker only"""
+        self.generation += 1
+        if keys is None:
+            self._entries.clear()
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+
+    # Both levels
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Cached value of key, or None"""
+        if not self.enabled:
+            return None
+        value = self._get_local(key)
+        if value is not None:
+            self._metrics["l1_hits"] += 1
+            return value
+
+        redis = get_redis()
+        if redis is not None:
+            value = await self._get_shared(redis, key)
+            if value is not None:
+                self._metrics["l2_hits"] += 1
+                return value
+
+        self._metrics["misses"] += 1
+        return None
+
+    async def _get_shared(self, redis, key: str) -> Optional[Any]:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.get(self._redis_key(key))
+                pipe.pttl(self._redis_key(key))
+                raw, ttl_ms = await pipe.execute()
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Cache read failed in {self.namespace}: {e}")
+            return None
+        if raw is None:
+            return None
+        value = self.serializer.loads(raw)
+        # Never outlive the shared copy
+        remaining = ttl_ms / 1000 if ttl_ms > 0 else self.ttl_seconds
+        self._set_local(key, value, self._local_ttl(min(remaining, self.ttl_seconds), shared=True))
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key for ttl seconds (the namespace's TTL by default)"""
+        ttl = self.ttl_seconds if ttl is None else ttl
+        if not self.enabled or ttl <= 0:
+            return
+        redis = get_redis()
+        self._set_local(key, value, self._local_ttl(ttl, shared=redis is not None))
+        if redis is None:
+            return
+        try:
+            await redis.set(self._redis_key(key), self.serializer.dumps(value), px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Cache write failed in {self.namespace}: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        """Drop keys in every worker (call after the change they reflect has committed)"""
+        self.drop_local(keys)
+        redis = get_redis()
+        if redis is None or not keys:
+            return
+        message = json.dumps({"namespace": self.namespace, "keys": list(keys)})
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*(self._redis_key(key) for key in keys))
+                for key in keys:
+                    pipe.incr(self._generation_key(key))
+                    pipe.pexpire(self._generation_key(key), _GENERATION_TTL_MS)
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, message)
+                await pipe.execute()
+        except Exception as e:
+            # Other workers' L1 copies still expire after CACHE_L1_TTL_SECONDS
+            self._metrics["errors"] += 1
+            logger.error(f"Cache invalidation failed in {self.namespace} for {keys}: {e}")
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Cached value of key, or loader's result (then cached)
+
+        A None result is returned but not cached. Concurrent misses in this
+        worker share one call of loader; with Redis, a worker that finds
+        another holding the key's lock waits up to CACHE_LOCK_TIMEOUT_SECONDS
+        for that result before calling loader itself.
+        """
+        if not self.enabled:
+            return await loader()
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        pending = self._loads.get(key)
+        if pending is not None:
+            self._metrics["coalesced"] += 1
+            value = await asyncio.shield(pending)
+            return await loader() if value is _RETRY else value
+
+        future = asyncio.get_running_loop().create_future()
+        self._loads[key] = future
+        try:
+            value = await self._load(key, loader, ttl)
+        except BaseException:
+            future.set_result(_RETRY)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            del self._loads[key]
+        return value
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+        generation = self.generation
+        redis = get_redis()
+        shared_generation = await self._shared_generation(redis, key) if redis is not None else None
+        lock = token = None
+        if redis is not None and settings.CACHE_LOCK_TIMEOUT_SECONDS > 0:
+            lock = f"{_LOCK_PREFIX}{self.namespace}:{key}"
+            token = uuid.uuid4().hex
+            try:
+                acquired = await redis.set(
+                    lock, token, nx=True, px=int(settings.CACHE_LOCK_TIMEOUT_SECONDS * 1000)
+                )
+            except Exception as e:
+                self._metrics["errors"] += 1
+                logger.warning(f"Cache lock failed in {self.namespace}: {e}")
+                acquired = False
+                lock = None
+            if not acquired:
+                value = await self._wait_for_shared(redis, key) if lock else None
+                if value is not None:
+                    self._metrics["lock_waits"] += 1
+                    return value
+                lock = None
+
+        try:
+            value = await loader()
+            self._metrics["loads"] += 1
+            if value is not None and generation == self.generation:
+                await self._store_loaded(redis, key, value, ttl, shared_generation)
+            return value
+        finally:
+            if lock is not None:
+                try:
+                    await redis.eval(_UNLOCK_SCRIPT, 1, lock, token)
+                except Exception as e:
+                    # The lock expires on its own
+                    logger.warning(f"Cache unlock failed in {self.namespace}: {e}")
+
+    async def _shared_generation(self, redis, key: str) -> Optional[str]:
+        """The key's delete counter in Redis as a string, or None if unreadable"""
+        try:
+            return await redis.get(self._generation_key(key)) or "0"
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Cache read failed in {self.namespace}: {e}")
+            return None
+
+    async def _store_loaded(
+        self,
+        redis,
+        key: str,
+        value: Any,
+        ttl: Optional[float],
+        shared_generation: Optional[str]
+    ) -> None:
+        """Cache a loaded value unless another worker deleted the key meanwhile"""
+        if redis is None:
+            await self.set(key, value, ttl)
+            return
+        ttl = self.ttl_seconds if ttl is None else ttl
+        if ttl <= 0 or shared_generation is None:
+            # Without the counter a store could not be checked
+            return
+        try:
+            stored = await redis.eval(
+                _STORE_SCRIPT, 2, self._redis_key(key), self._generation_key(key),
+                self.serializer.dumps(value), max(1, int(ttl * 1000)), shared_generation
+            )
+        except Exception as e:
+            self._metrics["errors"] += 1
+            logger.warning(f"Cache write failed in {self.namespace}: {e}")
+            return
+        if stored:
+            self._set_local(key, value, self._local_ttl(ttl, shared=True))
+        else:
+            self._metrics["stale_loads"] += 1
+
+    async def _wait_for_shared(self, redis, key: str) -> Optional[Any]:
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_SECONDS)
+            value = await self._get_shared(redis, key)
+            if value is not None:
+                return value
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._metrics["l1_hits"] + self._metrics["l2_hits"]
+        lookups = hits + self._metrics["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            **self._metrics,
+            "hit_ratio": round(hits / lookups, 3) if lookups else None,
+        }
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics of every namespace in this worker"""
+    return {namespace: cache.stats() for namespace, cache in sorted(_caches.items())}
+
+
+def _apply_invalidation(raw: str) -> None:
+    try:
+        message = json.loads(raw)
+        cache = _caches.get(message["namespace"])
+        keys = message["keys"]
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring malformed cache invalidation {raw!r}: {e}")
+        return
+    if cache is not None:
+        cache.drop_local(keys)
+
+
+async def run_cache_invalidation_listener() -> None:
+    """Apply other workers' deletes to this worker's L1 (lifespan task, Redis only)"""
+    while True:
+        pubsub = get_redis().pubsub()
+        try:
+            await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            # Anything published while unsubscribed was missed
+            for cache in _caches.values():
+                cache.drop_local()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    _apply_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener failed, resubscribing: {e}")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
@@ -1,9 +1,10 @@
 """Application configuration with enhanced security"""
 
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
-from pydantic import field_validator, Field
+from limits import parse_many
+from pydantic import field_validator, Field, ValidationInfo
 from pydantic_settings import BaseSettings
 
 
@@ -24,26 +25,53 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: int = Field(default=3600, ge=300)  # 1 hour
     DB_ECHO: bool = False  # Only enable in development
 
+    # Database - read replicas (optional)
+    DATABASE_REPLICA_URLS: str = ""  # Comma-separated; empty sends all reads to the primary
+    REPLICA_MAX_LAG_SECONDS: float = Field(default=5.0, ge=0)
+    REPLICA_LAG_CHECK_SECONDS: float = Field(default=2.0, gt=0)
+    READ_YOUR_WRITES_SECONDS: int = Field(default=10, ge=0)  # Primary-only window after a user writes
+
     # Security - JWT
     JWT_SECRET: str = Field(..., min_length=32)  # Required, minimum 32 chars
     JWT_ALGO: str = "HS256"
     JWT_EXPIRES_MIN: int = Field(default=15, ge=5, le=1440)  # 15 minutes (short for security)
     JWT_REFRESH_EXPIRES_DAYS: int = Field(default=7, ge=1, le=30)
+    AUTH_STATELESS: bool = False  # Authorize from token claims instead of loading the user
+    TOKEN_VERSION_REFRESH_SECONDS: float = Field(default=5.0, gt=0)  # Revocation delay in stateless mode
 
     # Security - Password
     BCRYPT_ROUNDS: int = Field(default=12, ge=10, le=15)
     PASSWORD_MIN_LENGTH: int = Field(default=12, ge=8)
+    PASSWORD_HASH_WORKERS: int = Field(default=2, ge=1, le=32)  # bcrypt threads per process
+    PASSWORD_HASH_MAX_QUEUE: int = Field(default=64, ge=0)  # Waiting calls before 503
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = Field(default=5.0, gt=0)
 
     # CORS
     CORS_ORIGINS: str = "http://localhost:8080,http://localhost:5173"
     CORS_ALLOW_CREDENTIALS: bool = True
     CORS_ALLOW_METHODS: str = "GET,POST,PUT,DELETE,PATCH"
-    CORS_ALLOW_HEADERS: str = "Content-Type,Authorization"
+    CORS_ALLOW_HEADERS: str = "Content-Type,Authorization,If-None-Match,If-Match"
 
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = Field(default=60, ge=1, le=1000)
     RATE_LIMIT_LOGIN_PER_MINUTE: int = Field(default=5, ge=1, le=20)
+    RATE_LIMIT_STORAGE: str = Field(default="shared", pattern="^(memory|shared|redis)$")  # shared: all workers on the host
+    RATE_LIMIT_STRATEGY: str = Field(
+        default="sliding-window-counter", pattern="^(fixed-window|moving-window|sliding-window-counter)$"
+    )
+    RATE_LIMIT_SHARED_PATH: str = ""  # Counter file for the shared storage; empty picks /dev/shm or the temp dir
+    RATE_LIMIT_SHARED_SLOTS: int = Field(default=65536, ge=1024)  # Tracked keys; 32 bytes each
+    # Per route group, per role ("default" for other roles and anonymous clients);
+    # override with JSON (groups left out keep these). Authenticated clients are
+    # keyed by user, others by IP; refresh is keyed by the presented refresh token.
+    RATE_LIMIT_GROUPS: Dict[str, Dict[str, str]] = {
+        "transitions": {"staff": "60/minute", "supervisor": "120/minute", "default": "30/minute"},
+        "admin_grids": {"admin": "300/minute", "default": "60/minute"},
+        "exports": {"admin": "10/minute", "default": "2/minute"},
+        "refresh": {"default": "10/minute"},
+    }
+    TRUSTED_PROXIES: str = ""  # Comma-separated IPs/CIDRs whose X-Forwarded-For is believed
 
     # Logging
     LOG_LEVEL: str = Field(default="INFO", pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")
@@ -51,10 +79,38 @@ class Settings(BaseSettings):
     # Redis (optional)
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_ENABLED: bool = False
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = Field(default=0.5, gt=0)  # Cache calls fail fast to the database
+
+    # Two-level cache (app/core/cache.py)
+    CACHE_L1_TTL_SECONDS: float = Field(default=5.0, ge=0)  # In-process copy lifetime with Redis; bounds a lost invalidation
+    CACHE_LOCK_TIMEOUT_SECONDS: float = Field(default=2.0, ge=0)  # Cross-worker stampede lock; 0 disables
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+
+    # Authenticated user cache
+    USER_CACHE_TTL_SECONDS: int = Field(default=60, ge=0, le=3600)  # 0 disables
+    USER_CACHE_MAX_ENTRIES: int = Field(default=10000, ge=1)
 
     # Pagination
     DEFAULT_PAGE_SIZE: int = Field(default=20, ge=1, le=100)
     MAX_PAGE_SIZE: int = Field(default=100, ge=1, le=500)
+    COUNT_CACHE_TTL_SECONDS: int = Field(default=30, ge=0, le=3600)  # 0 disables
+    COUNT_CACHE_MAX_ENTRIES: int = Field(default=1024, ge=1)
+
+    # Reference list response cache (buildings, departments, periods, locations)
+    RESPONSE_CACHE_TTL_SECONDS: int = Field(default=300, ge=0, le=86400)  # 0 disables
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=512, ge=1)
+
+    # Active period
+    ACTIVE_PERIOD_CACHE_TTL_SECONDS: int = Field(default=30, ge=0, le=3600)  # 0 disables
+
+    # Bulk operations
+    BULK_MAX_ROWS: int = Field(default=20000, ge=1)
+    BULK_CHUNK_SIZE: int = Field(default=1000, ge=1, le=5000)  # Rows per INSERT statement
+    REVIEW_BATCH_MAX_ITEMS: int = Field(default=500, ge=1, le=5000)
+    EXPORT_BATCH_SIZE: int = Field(default=1000, ge=1, le=10000)  # Rows per server-side cursor fetch
+
+    # Dashboard
+    DASHBOARD_ROLLUP_REFRESH_SECONDS: int = Field(default=60, ge=0)  # 0 disables the in-process refresher
 
     # Timezone
     TZ: str = "UTC"
@@ -91,6 +147,48 @@ class Settings(BaseSettings):
             )
         return value
 
+    @field_validator("RATE_LIMIT_STRATEGY")
+    @classmethod
+    def validate_rate_limit_strategy(cls, value: str, info: ValidationInfo) -> str:
+        """Reject strategies the chosen storage cannot run"""
+        if value == "moving-window" and info.data.get("RATE_LIMIT_STORAGE") == "shared":
+            raise ValueError(
+                "RATE_LIMIT_STRATEGY=moving-window is not supported with RATE_LIMIT_STORAGE=shared; "
+                "use sliding-window-counter or fixed-window, or the memory or redis storage"
+            )
+        return value
+
+    @field_validator("RATE_LIMIT_GROUPS")
+    @classmethod
+    def validate_rate_limit_groups(cls, value: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+        """Require a default per group and valid limit strings"""
+        value = {**cls.model_fields["RATE_LIMIT_GROUPS"].default, **value}
+        for group, limits in value.items():
+            if "default" not in limits:
+                raise ValueError(f"RATE_LIMIT_GROUPS[{group!r}] needs a 'default' limit")
+            for limit in limits.values():
+                parse_many(limit)
+        return value
+
+    @staticmethod
+    def _asyncpg_url(url: str) -> str:
+        """Rewrite a postgres URL to use the asyncpg driver"""
+        scheme, _, rest = url.partition("://")
+        scheme = scheme.split('+')[0]
+        if scheme == "postgres":
+            scheme = "postgresql"
+        return f"{scheme}+asyncpg://{rest}"
+
+    @property
+    def async_database_url(self) -> str:
+        """Get DATABASE_URL with the asyncpg driver"""
+        return self._asyncpg_url(self.DATABASE_URL)
+
+    @property
+    def async_replica_urls(self) -> List[str]:
+        """Get DATABASE_REPLICA_URLS as asyncpg URLs"""
+        return [self._asyncpg_url(url.strip()) for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Get CORS origins as list"""
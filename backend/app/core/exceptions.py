@@ -40,6 +40,13 @@ class InactiveUserError(AuthenticationError):
         super().__init__("User account is inactive")
 
 
+class InvalidRefreshTokenError(AuthenticationError):
+    """Refresh token unknown, expired, revoked or already used"""
+
+    def __init__(self):
+        super().__init__("Invalid or expired refresh token")
+
+
 class AuthorizationError(AppException):
     """Not enough permissions"""
 
@@ -1,7 +1,101 @@
 """Rate limiting configuration"""
 
+import ipaddress
+from functools import lru_cache
+from typing import Callable, List, Tuple, Union
+
+from fastapi import Request
+from jose import JWTError, jwt
+from limits import RateLimitItem, parse
 from slowapi import Limiter
-from slowapi.util import get_remote_address
+from slowapi.errors import RateLimitExceeded
+from slowapi.wrappers import Limit
+
+from app.core import rate_limit_storage  # noqa: F401 - registers the shm:// storage
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ANONYMOUS = "anonymous"
+
+_trusted_proxies: List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]] = [
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in settings.TRUSTED_PROXIES.split(",") if proxy.strip()
+]
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_proxies)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address, read from X-Forwarded-For only behind a trusted proxy
+
+    The header is walked from the right, skipping our own proxies; the first
+    other hop is the client. Anything further left is client-supplied and
+    ignored, so a forged header cannot pick someone else's budget.
+    """
+    peer = request.client.host if request.client else "127.0.0.1"
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not _is_trusted_proxy(peer):
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted_proxy(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def rate_limit_identity(request: Request) -> Tuple[str, str]:
+    """
+    (limiter key, role) for a request
+
+    Requests with a valid access token are keyed by its signed subject and
+    role claims (decoded here, no database), so users behind one NAT get
+    separate budgets; everything else is keyed by client IP.
+    """
+    identity = getattr(request.state, "rate_limit_identity", None)
+    if identity is not None:
+        return identity
+
+    identity = (f"ip:{client_ip(request)}", ANONYMOUS)
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGO])
+        except JWTError:
+            payload = {}
+        if payload.get("type") == "access" and payload.get("sub"):
+            identity = (f"user:{payload['sub']}", str(payload.get("role") or ANONYMOUS))
+
+    request.state.rate_limit_identity = identity
+    return identity
+
+
+def rate_limit_key(request: Request) -> str:
+    return rate_limit_identity(request)[0]
+
+
+def get_storage_uri() -> str:
+    """
+    limits storage URI for RATE_LIMIT_STORAGE
+
+    memory keeps counters per worker process, so with N workers every
+    limit is effectively N times higher; shared and redis count across
+    workers (shared on one host, redis across hosts).
+    """
+    if settings.RATE_LIMIT_STORAGE == "redis":
+        return settings.REDIS_URL
+    if settings.RATE_LIMIT_STORAGE == "shared":
+        path = settings.RATE_LIMIT_SHARED_PATH or rate_limit_storage.shared_memory_path("temizlik-rate-limits")
+        return f"shm://{path}?slots={settings.RATE_LIMIT_SHARED_SLOTS}"
+    return "memory://"
 
 
 def get_limiter() -> Limiter:
@@ -11,11 +105,22 @@ def get_limiter() -> Limiter:
     Returns:
         Configured Limiter instance
     """
+    storage_options = {}
+    if settings.RATE_LIMIT_STORAGE == "redis":
+        # A slow Redis must not stall requests; slowapi falls back to memory
+        storage_options = {
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        }
+
     limiter = Limiter(
-        key_func=get_remote_address,
+        key_func=rate_limit_key,
         default_limits=["100/minute"],  # Default rate limit for all endpoints
-        storage_uri="memory://",  # Use in-memory storage (can be replaced with Redis)
-        strategy="fixed-window"
+        storage_uri=get_storage_uri(),
+        storage_options=storage_options,
+        strategy=settings.RATE_LIMIT_STRATEGY,
+        in_memory_fallback_enabled=settings.RATE_LIMIT_STORAGE == "redis",
+        enabled=settings.RATE_LIMIT_ENABLED
     )
 
     return limiter
@@ -23,3 +128,53 @@ def get_limiter() -> Limiter:
 
 # Global limiter instance
 limiter = get_limiter()
+
+
+@lru_cache(maxsize=None)
+def _group_item(group: str, role: str) -> RateLimitItem:
+    limits = settings.RATE_LIMIT_GROUPS[group]
+    return parse(limits.get(role, limits["default"]))
+
+
+def limit_group(group: str) -> Callable:
+    """
+    Dependency enforcing a route group's limit for the caller's role
+
+    All routes of a group draw from one budget per user (or IP), so a
+    client cannot multiply its allowance by spreading calls over them.
+    Use as ``dependencies=[Depends(limit_group("admin_grids"))]``.
+    """
+    if group not in settings.RATE_LIMIT_GROUPS:
+        raise ValueError(f"Unknown rate limit group: {group}")
+
+    async def check_group_limit(request: Request) -> None:
+        key, role = rate_limit_identity(request)
+        hit_group_limit(request, group, key, role)
+
+    return check_group_limit
+
+
+def hit_group_limit(request: Request, group: str, key: str, role: str = ANONYMOUS) -> None:
+    """
+    Count one request against a group's limit for key
+
+    For routes whose budget follows something other than the caller, e.g.
+    the refresh token in a request body.
+
+    Raises:
+        RateLimitExceeded: The budget is spent
+    """
+    if not limiter.enabled:
+        return
+    item = _group_item(group, role)
+    try:
+        allowed = limiter.limiter.hit(item, key, group)
+    except Exception as e:
+        # Fail open: the limiter must not take the API down with it
+        logger.error(f"Rate limit storage error: {e}")
+        return
+    if not allowed:
+        logger.warning(f"ratelimit {item} ({key}) exceeded for group {group}")
+        # Read by slowapi's 429 handler
+        request.state.view_rate_limit = (item, [key, group])
+        raise RateLimitExceeded(Limit(item, rate_limit_key, group, False, None, None, None, 1, False))
@@ -0,0 +1,232 @@
+"""
+Shared-memory rate limit storage
+
+A limits storage backend (scheme ``shm://``) that keeps counters in a
+memory-mapped file, so every uvicorn worker on a host enforces the same
+limit without Redis. Each key occupies one fixed-size slot in an open
+addressing table; a slot whose counters have expired is reused. Every
+operation takes the file lock once and does all of its reads and writes
+inside it, so a sliding-window check and its increment cost a single
+critical section of a few microseconds.
+
+    shm:///dev/shm/rate-limits?slots=65536
+
+When the table is full near a key, the slot expiring soonest is evicted,
+which can only make a limit more lenient, never wrongly block a client.
+
+The same storage holds other host-wide counters in files of their own
+(see shared_memory_path), such as the response cache's table versions.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from math import floor
+from typing import Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport
+
+# key hash, expires at, window start, current count, previous count
+_SLOT = struct.Struct("<QddII")
+_PROBES = 32
+
+
+def shared_memory_path(name: str) -> str:
+    """Path of a shared table file: in /dev/shm when the host has it, else the temp dir"""
+    return os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), name)
+
+
+def _key_hash(key: str) -> int:
+    # 0 marks a never-used slot
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") or 1
+
+
+class SharedMemoryStorage(Storage, SlidingWindowCounterSupport):
+    """Rate limit counters in a memory-mapped file shared by local processes"""
+
+    STORAGE_SCHEME = ["shm"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        parsed = urlparse(uri)
+        query = parse_qs(parsed.query)
+        self.path = parsed.path
+        self.slots = int(query.get("slots", ["65536"])[0])
+        self._thread_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._open()
+
+    def _open(self) -> None:
+        """Map the file; done again in forked children, which need their own lock descriptor"""
+        size = self.slots * _SLOT.size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size != size:
+                # New file or a different table size: start empty
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, size)
+        self._pid = os.getpid()
+
+    @property
+    def base_exceptions(self):
+        return OSError
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # flock does not exclude threads sharing the descriptor
+        with self._thread_lock:
+            if self._pid != os.getpid():
+                self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _read(self, index: int) -> Tuple[int, float, float, int, int]:
+        return _SLOT.unpack_from(self._map, index * _SLOT.size)
+
+    def _write(self, index: int, *slot) -> None:
+        _SLOT.pack_into(self._map, index * _SLOT.size, *slot)
+
+    def _find(self, key: str, now: float, create: bool) -> Optional[int]:
+        """
+        Slot index holding key (call with the lock held)
+
+        With create, a missing key takes the first free or expired slot in
+        its probe range, or else the one expiring soonest, reset to empty.
+        """
+        key_hash = _key_hash(key)
+        start = key_hash % self.slots
+        reusable = None
+        soonest = None
+        for probe in range(_PROBES):
+            index = (start + probe) % self.slots
+            slot_hash, expires_at = self._read(index)[:2]
+            if slot_hash == key_hash:
+                if expires_at <= now:
+                    self._write(index, key_hash, 0.0, 0.0, 0, 0)
+                return index
+            if slot_hash == 0:
+                # Keys are never stored past a never-used slot
+                if reusable is None:
+                    reusable = index
+                break
+            if reusable is None and expires_at <= now:
+                reusable = index
+            if soonest is None or expires_at < soonest[1]:
+                soonest = (index, expires_at)
+        if not create:
+            return None
+        index = reusable if reusable is not None else soonest[0]
+        self._write(index, key_hash, 0.0, 0.0, 0, 0)
+        return index
+
+    # Fixed window
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        with self._locked():
+            index = self._find(key, now, create=True)
+            slot_hash, expires_at, _, count, _ = self._read(index)
+            if expires_at <= now:
+                expires_at = now + expiry
+            count += amount
+            self._write(index, slot_hash, expires_at, 0.0, count, 0)
+            return count
+
+    def get(self, key: str) -> int:
+        now = time.time()
+        with self._locked():
+            index = self._find(key, now, create=False)
+            return 0 if index is None else self._read(index)[3]
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        with self._locked():
+            index = self._find(key, now, create=False)
+            if index is None:
+                return now
+            expires_at = self._read(index)[1]
+            return expires_at if expires_at > now else now
+
+    def hold(self, key: str, expiry: float) -> None:
+        """Keep key counted (at least 1) for expiry more seconds, never shortening its life"""
+        now = time.time()
+        with self._locked():
+            index = self._find(key, now, create=True)
+            slot_hash, expires_at, _, count, _ = self._read(index)
+            self._write(index, slot_hash, max(expires_at, now + expiry), 0.0, max(count, 1), 0)
+
+    # Sliding window counter
+
+    def _roll(self, index: int, expiry: int, now: float) -> Tuple[int, float, int, int]:
+        """Current window state of a slot as (hash, window start, current, previous)"""
+        slot_hash, _, window_start, current, previous = self._read(index)
+        start = floor(now / expiry) * expiry
+        if window_start != start:
+            previous = current if window_start == start - expiry else 0
+            current = 0
+        return slot_hash, start, current, previous
+
+    @staticmethod
+    def _weighted(previous: int, current: int, start: float, expiry: int, now: float) -> Tuple[float, float]:
+        """(weighted count, seconds the previous window still counts for)"""
+        previous_ttl = (start + expiry - now) if previous else 0.0
+        return previous * previous_ttl / expiry + current, previous_ttl
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        with self._locked():
+            index = self._find(key, now, create=True)
+            slot_hash, start, current, previous = self._roll(index, expiry, now)
+            weighted, _ = self._weighted(previous, current, start, expiry, now)
+            if floor(weighted) + amount > limit:
+                return False
+            self._write(index, slot_hash, start + 2 * expiry, start, current + amount, previous)
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        with self._locked():
+            index = self._find(key, now, create=False)
+            if index is None:
+                return 0, 0.0, 0, 0.0
+            _, start, current, previous = self._roll(index, expiry, now)
+        _, previous_ttl = self._weighted(previous, current, start, expiry, now)
+        return previous, previous_ttl, current, start + 2 * expiry - now
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
+
+    # Maintenance
+
+    def clear(self, key: str) -> None:
+        now = time.time()
+        with self._locked():
+            index = self._find(key, now, create=False)
+            if index is not None:
+                # Keep the hash so later keys in the probe range stay reachable
+                self._write(index, _key_hash(key), 0.0, 0.0, 0, 0)
+
+    def reset(self) -> Optional[int]:
+        with self._locked():
+            self._map[:] = bytes(len(self._map))
+        return None
+
+    def check(self) -> bool:
+        return not self._map.closed
@@ -0,0 +1,37 @@
+"""Shared Redis client, used only when REDIS_ENABLED is set"""
+
+from typing import Any, Optional
+
+from app.core.config import settings
+
+_client: Optional[Any] = None
+
+
+def get_redis() -> Optional[Any]:
+    """
+    Lazily created asyncio Redis client
+
+    Returns:
+        The client, or None when Redis is disabled
+    """
+    global _client
+    if not settings.REDIS_ENABLED:
+        return None
+    if _client is None:
+        # Imported here so the package stays optional when Redis is off
+        import redis.asyncio as redis
+
+        _client = redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,58 @@
+"""
+Active period resolution
+
+At most one period is active (enforced by uq_periods_single_active). Staff
+task lists and the dashboard resolve it on nearly every request, so its
+id is cached in process. The period handlers invalidate the cache after
+commit, and any committed write to periods does too. Writes made by other
+workers are picked up after ACTIVE_PERIOD_CACHE_TTL_SECONDS.
+"""
+
+import time
+from typing import Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.events import on_tables_committed
+from app.db.models.period import Period, PeriodStatus
+
+
+class ActivePeriodCache:
+    """Cached id of the active period (None when no period is active)"""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entry: Optional[Tuple[float, Optional[UUID]]] = None
+        # Bumped by every invalidation; a load that overlapped one is not stored
+        self.generation = 0
+
+    async def get_id(self, db: AsyncSession) -> Optional[UUID]:
+        if self._entry is not None and self._entry[0] >= time.monotonic():
+            return self._entry[1]
+
+        generation = self.generation
+        period_id = await db.scalar(select(Period.id).filter(Period.status == PeriodStatus.ACTIVE))
+        if self.ttl_seconds > 0 and generation == self.generation:
+            self._entry = (time.monotonic() + self.ttl_seconds, period_id)
+        return period_id
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._entry = None
+
+
+active_period_cache = ActivePeriodCache(settings.ACTIVE_PERIOD_CACHE_TTL_SECONDS)
+
+
+@on_tables_committed
+def _invalidate_on_period_write(tables: Set[str]) -> None:
+    if Period.__tablename__ in tables:
+        active_period_cache.invalidate()
+
+
+async def get_active_period_id(db: AsyncSession) -> Optional[UUID]:
+    """Id of the active period, or None"""
+    return await active_period_cache.get_id(db)
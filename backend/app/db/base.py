@@ -1,6 +1,7 @@
 """Database configuration with connection pooling"""
 
 from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
@@ -10,7 +11,7 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-# Create engine with connection pooling
+# Create engine with connection pooling (used by scripts and migrations)
 engine = create_engine(
     settings.DATABASE_URL,
     poolclass=QueuePool,
@@ -26,9 +27,25 @@ engine = create_engine(
     }
 )
 
+# Create async engine for request handlers (asyncpg driver)
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    echo=settings.DB_ECHO,
+    connect_args={
+        "server_settings": {"application_name": settings.APP_NAME},
+        "timeout": 10
+    }
+)
+
 
 # Event listener for connection checkout (logging)
 @event.listens_for(engine, "connect")
+@event.listens_for(async_engine.sync_engine, "connect")
 def receive_connect(dbapi_conn, connection_record):
     """Log database connections in debug mode"""
     if settings.DEBUG:
@@ -37,6 +54,7 @@ def receive_connect(dbapi_conn, connection_record):
 
 # Event listener for connection checkin
 @event.listens_for(engine, "checkin")
+@event.listens_for(async_engine.sync_engine, "checkin")
 def receive_checkin(dbapi_conn, connection_record):
     """Log connection return to pool in debug mode"""
     if settings.DEBUG:
@@ -50,28 +68,40 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async session factory
+# expire_on_commit=False keeps loaded attributes usable after commit without
+# an implicit (and in async mode, illegal) lazy refresh
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
+# Register session write-tracking listeners
+from app.db import events  # noqa: E402,F401
+
 
-def get_db():
+async def get_db():
     """
-    Database dependency for FastAPI
+    Async database dependency for FastAPI
 
     Yields:
-        Database session
+        Async database session
 
     Example:
         @app.get("/users")
-        def get_users(db: Session = Depends(get_db)):
-            return db.query(User).all()
+        async def get_users(db: AsyncSession = Depends(get_db)):
+            result = await db.execute(select(User))
+            return result.scalars().all()
     """
-    db = SessionLocal()
-    try:
-        yield db
-    except Exception as e:
-        logger.error(f"Database session error: {e}", exc_info=True)
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}", exc_info=True)
+            await db.rollback()
+            raise
@@ -0,0 +1,96 @@
+"""Track which tables a session writes and notify listeners on commit"""
+
+from typing import Callable, List, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_WRITTEN_TABLES_KEY = "written_tables"
+
+# Callbacks invoked with the set of table names written by a committed session
+_listeners: List[Callable[[Set[str]], None]] = []
+
+# Callbacks that also need the committed session (e.g. to read session.info)
+_session_listeners: List[Callable[[Session, Set[str]], None]] = []
+
+
+def on_tables_committed(callback: Callable[[Set[str]], None]) -> Callable[[Set[str]], None]:
+    """
+    Register a callback for committed table writes
+
+    Args:
+        callback: Called with the names of tables written in the transaction
+
+    Returns:
+        The callback (usable as a decorator)
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def on_session_committed(
+    callback: Callable[[Session, Set[str]], None]
+) -> Callable[[Session, Set[str]], None]:
+    """
+    Register a callback for committed writes that also receives the session
+
+    Args:
+        callback: Called with the (sync) session and the tables it wrote
+
+    Returns:
+        The callback (usable as a decorator)
+    """
+    _session_listeners.append(callback)
+    return callback
+
+
+def mark_tables_written(session: Session, *tables: str) -> None:
+    """Record table writes that bypass the ORM unit of work (raw SQL)"""
+    session.info.setdefault(_WRITTEN_TABLES_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session: Session, flush_context) -> None:
+    """Collect tables touched by ORM inserts, updates and deletes"""
+    written = session.info.setdefault(_WRITTEN_TABLES_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None:
+            written.add(table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state) -> None:
+    """Collect tables targeted by insert()/update()/delete() statements"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            mark_tables_written(orm_execute_state.session, table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed_tables(session: Session) -> None:
+    """Notify listeners once the transaction is durable"""
+    written = session.info.pop(_WRITTEN_TABLES_KEY, None)
+    if not written:
+        return
+    for callback in _listeners:
+        try:
+            callback(written)
+        except Exception as e:
+            logger.error(f"Table write listener failed: {e}", exc_info=True)
+    for session_callback in _session_listeners:
+        try:
+            session_callback(session, written)
+        except Exception as e:
+            logger.error(f"Session commit listener failed: {e}", exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session: Session) -> None:
+    """Forget writes that never became visible"""
+    session.info.pop(_WRITTEN_TABLES_KEY, None)
@@ -0,0 +1,76 @@
+"""Closure-table maintenance for the location hierarchy"""
+
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import delete, insert, literal, select, true
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.location_closure import LocationClosure
+
+# Rebuilds every closure row from parent_location_id (backfill and benchmarks)
+REBUILD_CLOSURE_SQL = """
+    INSERT INTO location_closure (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE tree AS (
+        SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM locations
+        UNION ALL
+        SELECT tree.ancestor_id, locations.id, tree.depth + 1
+        FROM tree JOIN locations ON locations.parent_location_id = tree.descendant_id
+    )
+    SELECT ancestor_id, descendant_id, depth FROM tree
+"""
+
+
+async def is_in_subtree(db: AsyncSession, location_id: UUID, ancestor_id: UUID) -> bool:
+    """Whether location_id is ancestor_id or one of its descendants"""
+    return await db.scalar(
+        select(LocationClosure.depth).filter(
+            LocationClosure.ancestor_id == ancestor_id,
+            LocationClosure.descendant_id == location_id
+        )
+    ) is not None
+
+
+async def add_location(db: AsyncSession, location_id: UUID, parent_id: Optional[UUID]) -> None:
+    """Insert closure rows for a new leaf: its parent's ancestors plus itself"""
+    node = literal(location_id, LocationClosure.descendant_id.type)
+    rows = select(node, node, literal(0))
+    if parent_id is not None:
+        rows = select(
+            LocationClosure.ancestor_id, node, LocationClosure.depth + 1
+        ).filter(LocationClosure.descendant_id == parent_id).union_all(rows)
+    await db.execute(insert(LocationClosure).from_select(
+        ["ancestor_id", "descendant_id", "depth"], rows
+    ))
+
+
+async def detach_subtree(db: AsyncSession, location_id: UUID) -> None:
+    """Drop the links between a subtree and everything above it"""
+    subtree = select(LocationClosure.descendant_id).filter(LocationClosure.ancestor_id == location_id)
+    await db.execute(
+        delete(LocationClosure)
+        .where(LocationClosure.descendant_id.in_(subtree), LocationClosure.ancestor_id.not_in(subtree))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def move_subtree(db: AsyncSession, location_id: UUID, new_parent_id: Optional[UUID]) -> None:
+    """
+    Re-parent a location and everything under it
+
+    The caller must reject moves under the location's own subtree
+    (see is_in_subtree); the closure would otherwise gain a cycle.
+    """
+    await detach_subtree(db, location_id)
+    if new_parent_id is None:
+        return
+
+    above = aliased(LocationClosure)
+    below = aliased(LocationClosure)
+    await db.execute(insert(LocationClosure).from_select(
+        ["ancestor_id", "descendant_id", "depth"],
+        select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+        .select_from(above).join(below, true())
+        .filter(above.descendant_id == new_parent_id, below.ancestor_id == location_id)
+    ))
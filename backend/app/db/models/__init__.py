@@ -5,3 +5,7 @@ from app.db.models.department import Department
 from app.db.models.location import Location
 from app.db.models.period import Period
 from app.db.models.assignment import Assignment
+from app.db.models.period_stats import PeriodStats
+from app.db.models.rollup_refresh import RollupRefresh
+from app.db.models.location_closure import LocationClosure
+from app.db.models.refresh_token import RefreshToken
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Text, Enum, SmallInteger
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Text, Enum, SmallInteger, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +14,17 @@ class AssignmentStatus(str, enum.Enum):
 
 class Assignment(Base):
     __tablename__ = "assignments"
+    __table_args__ = (
+        UniqueConstraint("location_id", "period_id", name="uq_assignments_location_period"),
+        Index("ix_assignments_period_status", "period_id", "status"),
+        Index("ix_assignments_staff_period_status", "staff_user_id", "period_id", "status"),
+        Index("ix_assignments_supervisor_status", "supervisor_user_id", "status", "created_at", "id"),
+        Index(
+            "ix_assignments_staff_open", "staff_user_id", "period_id",
+            postgresql_where=text("status IN ('PENDING', 'REJECTED')")
+        ),
+        Index("ix_assignments_created_at_id", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import BigInteger, Column, String, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,6 +12,8 @@ class Building(Base):
     name = Column(String, unique=True, nullable=False)
     code = Column(String, unique=True, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Bumped by a trigger on every write to this building's locations
+    tree_version = Column(BigInteger, nullable=False, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -20,7 +20,7 @@ class Location(Base):
     name = Column(String, nullable=False)
     location_type = Column(Enum(LocationType), nullable=False)
     location_subtype = Column(String, nullable=True)
-    building_id = Column(UUID(as_uuid=True), ForeignKey("buildings.id"), nullable=False)
+    building_id = Column(UUID(as_uuid=True), ForeignKey("buildings.id"), nullable=False, index=True)
     department_id = Column(UUID(as_uuid=True), ForeignKey("departments.id"), nullable=True)
     parent_location_id = Column(UUID(as_uuid=True), ForeignKey("locations.id"), nullable=True)
     is_leaf = Column(Boolean, default=True, nullable=False)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base
+
+class LocationClosure(Base):
+    """
+    Every (ancestor, descendant) pair of the location hierarchy
+
+    Each location is its own ancestor at depth 0, so "everything under X"
+    is WHERE ancestor_id = X and needs no recursion. Maintained by
+    app/db/location_tree.py.
+    """
+    __tablename__ = "location_closure"
+    __table_args__ = (
+        # Ancestor lookups and subtree detach
+        Index("ix_location_closure_descendant", "descendant_id", "ancestor_id"),
+    )
+
+    ancestor_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Date, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Date, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,3 +24,8 @@ class Period(Base):
 
     # Relationships
     assignments = relationship("Assignment", back_populates="period")
+
+    __table_args__ = (
+        # At most one active period
+        Index("uq_periods_single_active", "status", unique=True, postgresql_where=text("status = 'ACTIVE'")),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class PeriodStats(Base):
+    """
+    Assignment counts per status for one period
+
+    Maintained by statement-level triggers on assignments (see migration
+    b7e2d5c81f40), so every insert, delete and status change updates the
+    counters in the same transaction. Never written by the application;
+    reconcile_period_stats.py rebuilds it if it ever drifts.
+    """
+    __tablename__ = "period_stats"
+
+    period_id = Column(UUID(as_uuid=True), ForeignKey("periods.id", ondelete="CASCADE"), primary_key=True)
+    pending = Column(Integer, nullable=False, server_default="0")
+    cleaned = Column(Integer, nullable=False, server_default="0")
+    approved = Column(Integer, nullable=False, server_default="0")
+    rejected = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
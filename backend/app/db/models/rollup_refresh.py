@@ -0,0 +1,10 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from app.db.base import Base
+
+class RollupRefresh(Base):
+    """Last successful refresh of a materialized rollup (see app/db/rollup.py)"""
+    __tablename__ = "rollup_refreshes"
+
+    name = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+    duration_ms = Column(Integer, nullable=False)
@@ -0,0 +1,83 @@
+"""Materialized assignment rollup backing the dashboard breakdowns"""
+
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import Integer, column, func, select, table, text
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.base import AsyncSessionLocal
+from app.db.models.assignment import Assignment
+from app.db.models.rollup_refresh import RollupRefresh
+
+logger = get_logger(__name__)
+
+ROLLUP_NAME = "assignment_rollup"
+
+# Arbitrary key for pg_try_advisory_xact_lock so only one worker refreshes
+_REFRESH_LOCK_KEY = 0x726F6C6C
+
+# One row per period x building x department x floor x staff x supervisor x
+# status, created by migration c4a8f1e06d92. Not part of Base.metadata: it
+# is a materialized view, not a table.
+assignment_rollup = table(
+    ROLLUP_NAME,
+    column("period_id", UUID(as_uuid=True)),
+    column("building_id", UUID(as_uuid=True)),
+    column("department_id", UUID(as_uuid=True)),
+    column("floor_label"),
+    column("staff_user_id", UUID(as_uuid=True)),
+    column("supervisor_user_id", UUID(as_uuid=True)),
+    column("status", Assignment.status.type),
+    column("assignments", Integer),
+    column("rated", Integer),
+    column("rating_sum", Integer),
+)
+
+
+async def refresh_rollup(db: AsyncSession) -> Optional[int]:
+    """
+    Recompute the rollup and record when it happened
+
+    REFRESH ... CONCURRENTLY keeps the view readable while it runs. An
+    advisory lock makes concurrent callers (other workers) skip instead of
+    queueing up duplicate refreshes.
+
+    Returns:
+        Refresh duration in milliseconds, or None if another refresh was running
+    """
+    if not await db.scalar(select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_KEY))):
+        await db.rollback()
+        return None
+
+    started = time.monotonic()
+    await db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {ROLLUP_NAME}"))
+    duration_ms = int((time.monotonic() - started) * 1000)
+
+    # now() is the transaction start, i.e. no later than the refresh snapshot
+    stmt = pg_insert(RollupRefresh).values(name=ROLLUP_NAME, refreshed_at=func.now(), duration_ms=duration_ms)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[RollupRefresh.name],
+        set_={"refreshed_at": stmt.excluded.refreshed_at, "duration_ms": stmt.excluded.duration_ms}
+    ))
+    await db.commit()
+    return duration_ms
+
+
+async def run_rollup_refresher() -> None:
+    """Refresh the rollup every DASHBOARD_ROLLUP_REFRESH_SECONDS until cancelled"""
+    while True:
+        await asyncio.sleep(settings.DASHBOARD_ROLLUP_REFRESH_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                duration_ms = await refresh_rollup(db)
+            if duration_ms is not None:
+                logger.debug(f"Refreshed {ROLLUP_NAME} in {duration_ms} ms")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error refreshing {ROLLUP_NAME}: {e}", exc_info=True)
@@ -0,0 +1,120 @@
+"""Atomic status transitions for the assignment workflow"""
+
+import enum
+from typing import Any, Dict, Iterable
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import AssignmentNotFoundError, AuthorizationError, InvalidAssignmentStateError
+from app.db.models.assignment import Assignment, AssignmentStatus
+
+# Target status -> statuses it may be entered from
+ALLOWED_SOURCES = {
+    AssignmentStatus.CLEANED: (AssignmentStatus.PENDING, AssignmentStatus.REJECTED),
+    AssignmentStatus.APPROVED: (AssignmentStatus.CLEANED,),
+    AssignmentStatus.REJECTED: (AssignmentStatus.CLEANED,),
+}
+
+# Target status -> column holding the only user allowed to perform it
+ACTOR_COLUMNS = {
+    AssignmentStatus.CLEANED: Assignment.staff_user_id,
+    AssignmentStatus.APPROVED: Assignment.supervisor_user_id,
+    AssignmentStatus.REJECTED: Assignment.supervisor_user_id,
+}
+
+WRONG_STATE_MESSAGES = {
+    AssignmentStatus.CLEANED: "Assignment status is not suitable for cleaning",
+    AssignmentStatus.APPROVED: "Assignment must be in cleaned status to approve",
+    AssignmentStatus.REJECTED: "Assignment must be in cleaned status to reject",
+}
+
+
+class TransitionFailure(str, enum.Enum):
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+    WRONG_STATE = "conflict"
+
+
+def transition_guard(target: AssignmentStatus, actor_id: UUID) -> list:
+    """WHERE clauses that make an UPDATE a legal transition into target"""
+    return [
+        ACTOR_COLUMNS[target] == actor_id,
+        Assignment.status.in_(ALLOWED_SOURCES[target]),
+    ]
+
+
+async def classify_transition_failures(
+    db: AsyncSession,
+    assignment_ids: Iterable[UUID],
+    target: AssignmentStatus,
+    actor_id: UUID
+) -> Dict[UUID, TransitionFailure]:
+    """
+    Explain why guarded UPDATEs skipped these assignments
+
+    Only called after a failed transition, so the happy path never pays
+    for this query.
+    """
+    assignment_ids = list(assignment_ids)
+    rows = {
+        row.id: row for row in (await db.execute(
+            select(Assignment.id, ACTOR_COLUMNS[target].label("actor_id"), Assignment.status)
+            .filter(Assignment.id.in_(assignment_ids))
+        )).all()
+    }
+
+    failures = {}
+    for assignment_id in assignment_ids:
+        row = rows.get(assignment_id)
+        if row is None:
+            failures[assignment_id] = TransitionFailure.NOT_FOUND
+        elif row.actor_id != actor_id:
+            failures[assignment_id] = TransitionFailure.FORBIDDEN
+        else:
+            failures[assignment_id] = TransitionFailure.WRONG_STATE
+    return failures
+
+
+async def transition_assignment(
+    db: AsyncSession,
+    assignment_id: UUID,
+    target: AssignmentStatus,
+    actor_id: UUID,
+    **values: Any
+) -> None:
+    """
+    Move one assignment into target with a single conditional UPDATE
+
+    Ownership and the source status are checked in the WHERE clause, so
+    concurrent requests cannot both pass the check. The caller commits.
+
+    Args:
+        db: Async database session
+        assignment_id: Assignment to update
+        target: New status
+        actor_id: User performing the transition
+        **values: Extra columns to set alongside the status
+
+    Raises:
+        AssignmentNotFoundError: No such assignment
+        AuthorizationError: Actor is not the assigned staff/supervisor
+        InvalidAssignmentStateError: Current status does not allow target
+    """
+    result = await db.execute(
+        update(Assignment)
+        .where(Assignment.id == assignment_id, *transition_guard(target, actor_id))
+        .values(status=target, **values)
+        .returning(Assignment.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is not None:
+        return
+
+    failure = (await classify_transition_failures(db, [assignment_id], target, actor_id))[assignment_id]
+    if failure == TransitionFailure.NOT_FOUND:
+        raise AssignmentNotFoundError()
+    if failure == TransitionFailure.FORBIDDEN:
+        raise AuthorizationError()
+    raise InvalidAssignmentStateError(WRONG_STATE_MESSAGES[target])
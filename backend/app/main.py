@@ -1,5 +1,6 @@
 """Main application with enhanced security and monitoring"""
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
 
@@ -10,6 +11,7 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.api.response_cache import response_cache
 from app.api.routers import (
     assignments,
     auth,
@@ -20,10 +22,17 @@ from app.api.routers import (
     periods,
     users,
 )
+from app.core.cache import cache_stats as cache_namespace_stats, run_cache_invalidation_listener
 from app.core.config import settings
 from app.core.exceptions import AppException
 from app.core.limiter import limiter
 from app.core.logging import get_logger, setup_logging
+from app.core.redis import close_redis
+from app.db.base import async_engine
+from app.db.replicas import dispose_replicas, replicas, run_replica_lag_monitor
+from app.db.rollup import run_rollup_refresher
+from app.security.hashing import hashing_pool
+from app.security.token_versions import run_token_version_refresher
 
 # Setup logging
 setup_logging(settings.LOG_LEVEL)
@@ -41,9 +50,28 @@ async def lifespan(app: FastAPI):
             "version": app.version
         }
     )
+    background = []
+    if settings.DASHBOARD_ROLLUP_REFRESH_SECONDS:
+        background.append(asyncio.create_task(run_rollup_refresher()))
+    if replicas:
+        background.append(asyncio.create_task(run_replica_lag_monitor()))
+    if settings.AUTH_STATELESS:
+        background.append(asyncio.create_task(run_token_version_refresher()))
+    if settings.REDIS_ENABLED:
+        background.append(asyncio.create_task(run_cache_invalidation_listener()))
     yield
     # Shutdown
     logger.info("Application shutting down")
+    for task in background:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await async_engine.dispose()
+    await dispose_replicas()
+    await close_redis()
+    hashing_pool.shutdown()
 
 
 # Create FastAPI app
@@ -178,7 +206,7 @@ app.add_middleware(
     allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
     allow_methods=settings.cors_methods_list,
     allow_headers=settings.cors_headers_list,
-    expose_headers=["X-Process-Time"],
+    expose_headers=["X-Process-Time", "ETag", "X-DB-Route", "X-Cache"],
 )
 
 
@@ -199,20 +227,30 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/cache", tags=["Health"])
+async def cache_stats():
+    """Hit ratios of every cache namespace and of the cached list routes (this worker)"""
+    return {"namespaces": cache_namespace_stats(), "responses": response_cache.stats()}
+
+
 @app.get("/health/ready", tags=["Health"])
 async def readiness_check():
     """Deep health check - database connectivity"""
     from sqlalchemy import text
-    from app.db.base import SessionLocal
+    from app.db.base import AsyncSessionLocal
 
     try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
 
         return {
             "status": "ready",
             "database": "connected",
+            # Informational: reads fall back to the primary when none are usable
+            "replicas": {
+                replica.name: {"usable": replica.usable, "lag_seconds": replica.lag}
+                for replica in replicas
+            },
             "environment": settings.ENVIRONMENT
         }
     except Exception as e:
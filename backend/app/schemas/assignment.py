@@ -1,5 +1,5 @@
-from pydantic import BaseModel, validator
-from typing import Optional, List
+from pydantic import BaseModel, validator, model_validator
+from typing import Literal, Optional, List
 from datetime import datetime
 from uuid import UUID
 from app.db.models.assignment import AssignmentStatus
@@ -59,3 +59,46 @@ class AssignmentResponse(AssignmentBase):
     
     class Config:
         from_attributes = True
+
+class AssignmentBulkResult(BaseModel):
+    index: int
+    status: str  # created, duplicate or invalid
+    id: Optional[UUID] = None
+    detail: Optional[str] = None
+
+class AssignmentBulkResponse(BaseModel):
+    created: int
+    duplicates: int
+    invalid: int
+    results: List[AssignmentBulkResult]
+
+class AssignmentReviewBatchItem(BaseModel):
+    id: UUID
+    action: Literal["approve", "reject"]
+    rating: Optional[int] = None
+    notes: Optional[str] = None  # Supervisor notes on approve, rejection reason on reject
+
+    @validator('rating')
+    def validate_rating(cls, v):
+        if v is not None and (v < 1 or v > 5):
+            raise ValueError('Rating must be between 1 and 5')
+        return v
+
+    @model_validator(mode='after')
+    def validate_rejection_reason(self):
+        if self.action == "reject" and not self.notes:
+            raise ValueError('notes (rejection reason) is required to reject')
+        return self
+
+class AssignmentReviewBatchRequest(BaseModel):
+    items: List[AssignmentReviewBatchItem]
+
+class AssignmentReviewBatchResult(BaseModel):
+    id: UUID
+    status: str  # approved, rejected, not_found, forbidden or conflict
+    detail: Optional[str] = None
+
+class AssignmentReviewBatchResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[AssignmentReviewBatchResult]
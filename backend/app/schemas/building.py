@@ -2,6 +2,7 @@ from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
+from app.db.models.location import LocationType
 
 class BuildingBase(BaseModel):
     name: str
@@ -23,3 +24,19 @@ class BuildingResponse(BuildingBase):
     
     class Config:
         from_attributes = True
+
+class BuildingTreeNode(BaseModel):
+    id: UUID
+    name: str
+    location_type: LocationType
+    location_subtype: Optional[str] = None
+    department_id: Optional[UUID] = None
+    is_leaf: bool
+    floor_label: Optional[str] = None
+    area_sqm: Optional[int] = None
+    is_active: bool
+    children: List["BuildingTreeNode"] = []
+
+class BuildingTree(BuildingBase):
+    id: UUID
+    locations: List[BuildingTreeNode]
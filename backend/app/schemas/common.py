@@ -1,11 +1,15 @@
 """Common schemas with enhanced validation"""
 
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
 
 class LoginRequest(BaseModel):
     """Login request with email validation"""
@@ -18,10 +22,25 @@ class LoginResponse(BaseModel):
     """Login response"""
 
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
     user: Dict[str, Any]
 
 
+class TokenRefreshRequest(BaseModel):
+    """Refresh token exchange request"""
+
+    refresh_token: str = Field(..., min_length=1, max_length=256)
+
+
+class TokenRefreshResponse(BaseModel):
+    """New access token plus the refresh token that replaces the one sent"""
+
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
 class PaginationParams(BaseModel):
     """Pagination parameters with constraints"""
 
@@ -32,15 +51,48 @@ class PaginationParams(BaseModel):
         le=settings.MAX_PAGE_SIZE,
         description=f"Items per page (max {settings.MAX_PAGE_SIZE})"
     )
+    mode: str = Field(
+        default="offset",
+        pattern="^(offset|cursor)$",
+        description="Pagination mode: 'offset' (page numbers) or 'cursor' (keyset)"
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        max_length=512,
+        description="Opaque next_cursor from the previous page (implies cursor mode)"
+    )
+    include_total: Optional[bool] = Field(
+        default=None,
+        description="Compute total (default: true in offset mode, false in cursor mode)"
+    )
+    total_mode: str = Field(
+        default="exact",
+        pattern="^(exact|estimate)$",
+        description="'estimate' reads planner statistics for unfiltered lists"
+    )
+
+    @property
+    def is_cursor_mode(self) -> bool:
+        """Whether the request uses keyset pagination"""
+        return self.mode == "cursor" or self.cursor is not None
+
+    @property
+    def wants_total(self) -> bool:
+        """Whether the response should carry a total"""
+        if self.include_total is None:
+            return not self.is_cursor_mode
+        return self.include_total
 
 
-class PaginatedResponse(BaseModel):
-    """Paginated response"""
+class Page(BaseModel, Generic[T]):
+    """One page of a list endpoint, e.g. Page[AssignmentResponse]"""
 
-    items: List[Dict[str, Any]]
+    items: List[T]
     page: int = Field(..., ge=1)
     page_size: int = Field(..., ge=1)
-    total: int = Field(..., ge=0)
+    total: Optional[int] = Field(default=None, ge=0)  # Omitted unless requested
+    total_is_estimate: bool = False  # True when total comes from planner statistics
+    next_cursor: Optional[str] = None  # Set in cursor mode when more rows exist
 
 
 class DashboardStats(BaseModel):
@@ -53,6 +105,42 @@ class DashboardStats(BaseModel):
     approved: int = Field(..., ge=0)
 
 
+class DashboardBreakdownRow(BaseModel):
+    """One group of a dashboard breakdown; only the grouped dimensions are set"""
+
+    building_id: Optional[UUID] = None
+    building_name: Optional[str] = None
+    department_id: Optional[UUID] = None
+    department_name: Optional[str] = None
+    floor_label: Optional[str] = None
+    staff_user_id: Optional[UUID] = None
+    staff_name: Optional[str] = None
+    supervisor_user_id: Optional[UUID] = None
+    supervisor_name: Optional[str] = None
+    status: Optional[str] = None
+    total: int = Field(..., ge=0)
+    pending: int = Field(..., ge=0)
+    cleaned: int = Field(..., ge=0)
+    approved: int = Field(..., ge=0)
+    rejected: int = Field(..., ge=0)
+    completion_rate: float  # (cleaned + approved) / total
+    rejection_rate: float  # rejected / total
+    average_rating: Optional[float] = None
+
+
+class DashboardBreakdown(BaseModel):
+    """Dashboard breakdown with rollup freshness"""
+
+    period_id: UUID
+    group_by: List[str]
+    rows: List[DashboardBreakdownRow]
+    refreshed_at: Optional[datetime] = None  # When the rollup was last rebuilt
+    age_seconds: Optional[float] = None
+    source_updated_at: Optional[datetime] = None  # Last status count change in the period
+    is_stale: bool  # Status counts changed after the last refresh
+    refresh_interval_seconds: int
+
+
 class PasswordChangeRequest(BaseModel):
     """Password change request with strong validation"""
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime, date
 from uuid import UUID
 from app.db.models.period import PeriodStatus
@@ -25,3 +25,19 @@ class PeriodResponse(PeriodBase):
     
     class Config:
         from_attributes = True
+
+class PeriodCloneRequest(BaseModel):
+    source_period_id: UUID
+    building_id: Optional[UUID] = None
+    department_id: Optional[UUID] = None
+    only_active_locations: bool = True
+    # old user id -> replacement user id
+    staff_substitutions: Dict[UUID, UUID] = {}
+    supervisor_substitutions: Dict[UUID, UUID] = {}
+
+class PeriodCloneResponse(BaseModel):
+    source_period_id: UUID
+    target_period_id: UUID
+    candidates: int  # Source assignments matching the filters
+    created: int
+    skipped: int  # Location already assigned in the target period
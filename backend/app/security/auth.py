@@ -7,15 +7,18 @@ from typing import Optional
 import bcrypt
 from fastapi import HTTPException, status
 from jose import JWTError, jwt
+from sqlalchemy import select
 
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.db.models.user import User
+from app.security.hashing import hashing_pool
 
 logger = get_logger(__name__)
 
-# Dummy hash for timing attack prevention
-DUMMY_PASSWORD_HASH = "$2b$12$dummyhashtopreventtimingattacksthatareveryimportantforsecurity"
+# Dummy hash for timing attack prevention; must be a valid hash with the
+# configured cost, or checkpw fails instantly and leaks unknown emails
+_dummy_password_hash: Optional[str] = None
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -55,6 +58,28 @@ def get_password_hash(password: str) -> str:
     ).decode('utf-8')
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the hashing pool (raises 503 when saturated)"""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the hashing pool (raises 503 when saturated)"""
+    return await hashing_pool.run(get_password_hash, password)
+
+
+async def _get_dummy_password_hash() -> str:
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = await get_password_hash_async(secrets.token_urlsafe(16))
+    return _dummy_password_hash
+
+
+def access_token_claims(user: User) -> dict:
+    """Identity claims of an access token for user"""
+    return {"sub": str(user.id), "role": user.role.value, "ver": user.token_version or 0}
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
@@ -127,12 +152,12 @@ def verify_token(token: str) -> dict:
         )
 
 
-def authenticate_user(db, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db, email: str, password: str) -> Optional[User]:
     """
     Authenticate user with timing attack prevention
 
     Args:
-        db: Database session
+        db: Async database session
         email: User email
         password: Plain text password
 
@@ -143,14 +168,14 @@ def authenticate_user(db, email: str, password: str) -> Optional[User]:
         Uses constant-time comparison to prevent timing attacks
     """
     # Query user
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).filter(User.email == email).limit(1))
 
     # Always verify hash, even if user not found (prevent timing attack)
     if user:
-        password_correct = verify_password(password, user.hashed_password)
+        password_correct = await verify_password_async(password, user.hashed_password)
     else:
         # Dummy verification with same timing
-        verify_password(password, DUMMY_PASSWORD_HASH)
+        await verify_password_async(password, await _get_dummy_password_hash())
         password_correct = False
 
     # Use secrets.compare_digest for constant-time comparison
@@ -0,0 +1,76 @@
+"""Bounded worker pool for bcrypt so hashing never blocks the event loop"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """
+    Thread pool with admission control for password hashing
+
+    bcrypt releases the GIL, so a few threads give real parallelism while
+    the event loop keeps serving other requests. At most
+    workers + max_queue calls are admitted; past that, and for calls that
+    wait in the queue longer than queue_timeout, callers get a 503 at once
+    instead of piling up behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_queue: int, queue_timeout: float):
+        self.capacity = workers + max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0  # Running plus queued; only touched on the event loop
+        # Waiting for a slot happens here, on the event loop, where it can
+        # time out; the executor itself never has a backlog
+        self._slots = asyncio.Semaphore(workers)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run fn(*args) on the pool
+
+        Raises:
+            HTTPException: 503 when the pool is saturated
+        """
+        if self.in_flight >= self.capacity:
+            raise self._busy("queue full")
+
+        self.in_flight += 1
+        try:
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise self._busy("queue wait timed out")
+            try:
+                return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            finally:
+                self._slots.release()
+        finally:
+            self.in_flight -= 1
+
+    def _busy(self, reason: str) -> HTTPException:
+        logger.warning(f"Password hashing pool saturated ({reason}), in flight: {self.in_flight}")
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(
+    settings.PASSWORD_HASH_WORKERS,
+    settings.PASSWORD_HASH_MAX_QUEUE,
+    settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+)
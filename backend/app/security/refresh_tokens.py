@@ -0,0 +1,134 @@
+"""Rotating refresh tokens with reuse detection"""
+
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import InvalidRefreshTokenError
+from app.core.logging import get_logger
+from app.db.models.refresh_token import RefreshToken
+
+logger = get_logger(__name__)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    SHA-256 of a refresh token
+
+    Tokens are 256 random bits, so a fast hash is enough to make a leaked
+    table useless; no bcrypt is involved in refreshing.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(db: AsyncSession, user_id: UUID, family_id: Optional[UUID] = None) -> str:
+    """
+    Add a new refresh token to the session (the caller commits)
+
+    Args:
+        db: Async database session
+        user_id: Token owner
+        family_id: Family of the token being rotated; None starts a new one
+
+    Returns:
+        The plain token, to be sent to the client once
+    """
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user_id,
+        family_id=family_id or uuid.uuid4(),
+        token_hash=hash_refresh_token(token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.JWT_REFRESH_EXPIRES_DAYS)
+    ))
+    return token
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[UUID, str]:
+    """
+    Consume a refresh token and issue its successor (the caller commits)
+
+    Consuming is one conditional UPDATE on the unique token_hash index, so
+    two concurrent refreshes with the same token cannot both succeed.
+
+    Returns:
+        (user_id, new plain token)
+
+    Raises:
+        InvalidRefreshTokenError: Unknown, expired, revoked or reused token;
+            on reuse the whole family is revoked and committed first
+    """
+    token_hash = hash_refresh_token(token)
+    consumed = (await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now()
+        )
+        .values(used_at=func.now())
+        .returning(RefreshToken.user_id, RefreshToken.family_id)
+        .execution_options(synchronize_session=False)
+    )).first()
+
+    if consumed is None:
+        await _revoke_if_reused(db, token_hash)
+        raise InvalidRefreshTokenError()
+
+    return consumed.user_id, issue_refresh_token(db, consumed.user_id, consumed.family_id)
+
+
+async def _revoke_if_reused(db: AsyncSession, token_hash: str) -> None:
+    """
+    Revoke a token family when an already-rotated token comes back
+
+    A used token reappearing means two parties hold the family (e.g. a
+    stolen token); neither can be trusted, so the holder must log in again.
+    """
+    reused = (await db.execute(
+        select(RefreshToken.user_id, RefreshToken.family_id).filter(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.used_at.is_not(None),
+            RefreshToken.revoked_at.is_(None)
+        )
+    )).first()
+    if reused is None:
+        return
+
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == reused.family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    logger.warning(
+        "Refresh token reuse detected, token family revoked",
+        extra={"user_id": str(reused.user_id), "family_id": str(reused.family_id)}
+    )
+
+
+async def revoke_user_refresh_tokens(db: AsyncSession, user_id: UUID) -> None:
+    """Revoke every live refresh token of a user (the caller commits)"""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def prune_expired_refresh_tokens(db: AsyncSession, user_id: UUID) -> None:
+    """Delete a user's expired tokens (the caller commits)"""
+    await db.execute(
+        delete(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.expires_at <= func.now())
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,84 @@
+"""
+Token version map for stateless authorization
+
+With AUTH_STATELESS on, authorization trusts the signed "role" and "ver"
+claims of an access token instead of loading the user. To keep role changes
+and deactivations effective, every worker holds a map of active user id to
+users.token_version, reloaded every TOKEN_VERSION_REFRESH_SECONDS. A token
+whose version is behind the map is rejected; a user missing from the map
+(new, deactivated or deleted) or a map that has gone stale falls back to
+the database, so the map can only ever delay a revocation by one refresh.
+
+The map costs roughly 150 bytes per active user.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.base import AsyncSessionLocal
+from app.db.models.user import User
+
+logger = get_logger(__name__)
+
+
+class TokenVersions:
+    """Active user id -> current token version, as of the last reload"""
+
+    def __init__(self):
+        self._versions: Dict[UUID, int] = {}
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def fresh(self) -> bool:
+        return (
+            self.loaded_at is not None
+            and time.monotonic() - self.loaded_at <= 3 * settings.TOKEN_VERSION_REFRESH_SECONDS
+        )
+
+    def check(self, user_id: UUID, version: object) -> Optional[bool]:
+        """
+        Whether a token's version claim is current
+
+        Returns:
+            True if current, False if revoked, None if the map cannot tell
+            (no claim, unknown user, stale map) and the database must decide
+        """
+        if not isinstance(version, int) or not self.fresh:
+            return None
+        current = self._versions.get(user_id)
+        if current is None or version > current:
+            return None
+        return version == current
+
+    def forget(self, user_id: UUID) -> None:
+        """Send a user's tokens to the database until the next reload"""
+        self._versions.pop(user_id, None)
+
+    async def reload(self, db: AsyncSession) -> None:
+        rows = await db.execute(select(User.id, User.token_version).filter(User.is_active.is_(True)))
+        self._versions = {user_id: version for user_id, version in rows}
+        self.loaded_at = time.monotonic()
+
+
+token_versions = TokenVersions()
+
+
+async def run_token_version_refresher() -> None:
+    """Reload the token version map every TOKEN_VERSION_REFRESH_SECONDS until cancelled"""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await token_versions.reload(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Once the map goes stale every request falls back to the database
+            logger.error(f"Error reloading token versions: {e}", exc_info=True)
+        await asyncio.sleep(settings.TOKEN_VERSION_REFRESH_SECONDS)
@@ -0,0 +1,85 @@
+"""Cache of authenticated users for get_current_user"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import Cache, Serializer
+from app.core.config import settings
+from app.db.models.user import User, UserRole
+
+# Columns kept in the cache; the password hash never is
+CACHED_COLUMNS = ("id", "email", "full_name", "role", "is_active", "token_version", "created_at", "updated_at")
+
+
+def _snapshot(user: User) -> Dict[str, Any]:
+    return {column: getattr(user, column) for column in CACHED_COLUMNS}
+
+
+def _to_json(snapshot: Dict[str, Any]) -> str:
+    return json.dumps({
+        "id": str(snapshot["id"]),
+        "email": snapshot["email"],
+        "full_name": snapshot["full_name"],
+        "role": snapshot["role"].value,
+        "is_active": snapshot["is_active"],
+        "token_version": snapshot["token_version"],
+        "created_at": snapshot["created_at"].isoformat() if snapshot["created_at"] else None,
+        "updated_at": snapshot["updated_at"].isoformat() if snapshot["updated_at"] else None,
+    })
+
+
+def _from_json(raw: str) -> Dict[str, Any]:
+    data = json.loads(raw)
+    return {
+        **data,
+        "id": UUID(data["id"]),
+        "role": UserRole(data["role"]),
+        "created_at": datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+        "updated_at": datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+    }
+
+
+class _SnapshotSerializer(Serializer):
+    def dumps(self, value: Dict[str, Any]) -> str:
+        return _to_json(value)
+
+    def loads(self, raw: str) -> Dict[str, Any]:
+        return _from_json(raw)
+
+
+class UserCache:
+    """
+    Cache of user rows keyed by id, in the "user" namespace of app.core.cache
+
+    Hits return a fresh transient User built from the snapshot (no
+    hashed_password), so request handlers can never mutate a shared
+    object; handlers that need the password hash or want to write the row
+    must load it from the session.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self._cache = Cache("user", ttl_seconds, max_entries, serializer=_SnapshotSerializer())
+
+    async def get(self, user_id: UUID) -> Optional[User]:
+        snapshot = await self._cache.get(str(user_id))
+        return User(**snapshot) if snapshot else None
+
+    async def load(self, db: AsyncSession, user_id: UUID) -> Optional[User]:
+        """Cached user, or the row from db (then cached); None if missing"""
+        async def load_snapshot() -> Optional[Dict[str, Any]]:
+            user = await db.get(User, user_id)
+            return _snapshot(user) if user is not None else None
+
+        snapshot = await self._cache.get_or_load(str(user_id), load_snapshot)
+        return User(**snapshot) if snapshot else None
+
+    async def invalidate(self, user_id: UUID) -> None:
+        """Drop a user in every worker after a committed change to their row"""
+        await self._cache.delete(str(user_id))
+
+
+user_cache = UserCache(settings.USER_CACHE_TTL_SECONDS, settings.USER_CACHE_MAX_ENTRIES)
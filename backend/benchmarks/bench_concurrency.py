@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Concurrent load benchmark for the read-heavy API endpoints
+
+Fires a fixed number of concurrent clients at the assignment list and the
+dashboard stats endpoints for a fixed duration and reports throughput and
+latency percentiles. Run it once against a server started from the previous
+(synchronous session) revision and once against the current tree, with the
+same database and the same uvicorn worker count, to compare the two.
+
+Usage:
+    export BENCH_TOKEN="<admin access token>"
+    python benchmarks/bench_concurrency.py --base-url http://localhost:8000 \\
+        --concurrency 50 --duration 20
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from argparse import ArgumentParser
+from typing import Dict, List
+
+import httpx
+
+ENDPOINTS = {
+    "assignments": "/api/v1/assignments/?page=1&page_size=50",
+    "dashboard": "/api/v1/dashboard/active-period-stats",
+}
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    path: str,
+    deadline: float,
+    latencies: List[float],
+    errors: List[int]
+) -> None:
+    """Issue requests back to back until the deadline"""
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def run_endpoint(
+    base_url: str,
+    token: str,
+    path: str,
+    concurrency: int,
+    duration: float
+) -> Dict[str, float]:
+    """Run one endpoint under load and collect statistics"""
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers={"Authorization": f"Bearer {token}"},
+        limits=limits,
+        timeout=60
+    ) as client:
+        # Warm up connection pools on both sides
+        await asyncio.gather(*(client.get(path) for _ in range(concurrency)))
+
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            worker(client, path, deadline, latencies, errors)
+            for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "max_ms": latencies[-1] if latencies else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = ArgumentParser(description="Concurrent load benchmark")
+    parser.add_argument("--base-url", default=os.getenv("BENCH_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.getenv("BENCH_TOKEN"), help="Admin access token")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per endpoint")
+    parser.add_argument("--endpoint", choices=sorted(ENDPOINTS), action="append")
+    args = parser.parse_args()
+
+    if not args.token:
+        parser.error("Admin token required (--token or BENCH_TOKEN)")
+
+    print(f"{'endpoint':<12} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for name in args.endpoint or sorted(ENDPOINTS):
+        stats = await run_endpoint(
+            args.base_url, args.token, ENDPOINTS[name], args.concurrency, args.duration
+        )
+        print(
+            f"{name:<12} {stats['requests']:>9} {stats['errors']:>7} {stats['rps']:>9.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['max_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Subtree query benchmark: recursive adjacency walk vs. closure table
+
+Builds a synthetic building of floors x wings x rooms (about 50k locations
+by default) inside one transaction, fills its closure rows with the same
+recursive backfill the migration uses, then times "everything under X"
+both ways for a floor and a wing. The transaction is rolled back at the
+end, so the database is left as it was.
+
+Usage:
+    alembic upgrade head
+    python benchmarks/bench_location_tree.py --floors 10 --wings 50 --rooms 99
+"""
+
+import os
+import statistics
+import sys
+import time
+import uuid
+from argparse import ArgumentParser
+from typing import Callable, Dict, List
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text
+
+from app.db.base import engine
+from app.db.models.building import Building
+from app.db.models.location import Location, LocationType
+
+RECURSIVE_COUNT = text("""
+    WITH RECURSIVE subtree AS (
+        SELECT id FROM locations WHERE id = :root
+        UNION ALL
+        SELECT locations.id FROM locations JOIN subtree ON locations.parent_location_id = subtree.id
+    )
+    SELECT count(*) FROM subtree
+""")
+
+CLOSURE_COUNT = text("SELECT count(*) FROM location_closure WHERE ancestor_id = :root")
+
+# Same shape as the location list endpoint with ancestor_location_id
+RECURSIVE_PAGE = text("""
+    WITH RECURSIVE subtree AS (
+        SELECT id FROM locations WHERE id = :root
+        UNION ALL
+        SELECT locations.id FROM locations JOIN subtree ON locations.parent_location_id = subtree.id
+    )
+    SELECT locations.* FROM locations JOIN subtree ON subtree.id = locations.id
+    ORDER BY locations.created_at, locations.id LIMIT 50
+""")
+
+CLOSURE_PAGE = text("""
+    SELECT locations.* FROM locations
+    JOIN location_closure ON location_closure.descendant_id = locations.id
+    WHERE location_closure.ancestor_id = :root
+    ORDER BY locations.created_at, locations.id LIMIT 50
+""")
+
+# The migration's backfill, restricted to the synthetic building
+BACKFILL = text("""
+    INSERT INTO location_closure (ancestor_id, descendant_id, depth)
+    WITH RECURSIVE tree AS (
+        SELECT id AS ancestor_id, id AS descendant_id, 0 AS depth FROM locations WHERE building_id = :building
+        UNION ALL
+        SELECT tree.ancestor_id, locations.id, tree.depth + 1
+        FROM tree JOIN locations ON locations.parent_location_id = tree.descendant_id
+    )
+    SELECT ancestor_id, descendant_id, depth FROM tree
+""")
+
+
+def build_tree(conn, building_id: uuid.UUID, floors: int, wings: int, rooms: int) -> Dict[str, uuid.UUID]:
+    """Insert the synthetic hierarchy and return one floor and one wing id"""
+    rows: List[dict] = []
+
+    def add(name: str, parent, location_type: LocationType, is_leaf: bool, floor: int) -> uuid.UUID:
+        location_id = uuid.uuid4()
+        rows.append(dict(
+            id=location_id, name=name, location_type=location_type, building_id=building_id,
+            parent_location_id=parent, is_leaf=is_leaf, floor_label=str(floor), is_active=True
+        ))
+        return location_id
+
+    sample: Dict[str, uuid.UUID] = {}
+    for f in range(floors):
+        floor_id = add(f"Floor {f}", None, LocationType.KORIDOR, False, f)
+        sample.setdefault("floor", floor_id)
+        for w in range(wings):
+            wing_id = add(f"Wing {f}-{w}", floor_id, LocationType.KORIDOR, False, f)
+            sample.setdefault("wing", wing_id)
+            for r in range(rooms):
+                add(f"Room {f}-{w}-{r}", wing_id, LocationType.DERSLIK, True, f)
+
+    # Parents precede children in rows, so chunked inserts keep FKs valid
+    for start in range(0, len(rows), 5000):
+        conn.execute(insert(Location), rows[start:start + 5000])
+    sample["count"] = len(rows)
+    return sample
+
+
+def time_query(conn, query, root: uuid.UUID, iterations: int) -> Dict[str, float]:
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        conn.execute(query, {"root": root}).all()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+def timed(label: str, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    print(f"{label}: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark location subtree queries")
+    parser.add_argument("--floors", type=int, default=10)
+    parser.add_argument("--wings", type=int, default=50, help="Wings per floor")
+    parser.add_argument("--rooms", type=int, default=99, help="Rooms per wing")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            building_id = uuid.uuid4()
+            conn.execute(insert(Building).values(id=building_id, name=f"bench-{building_id}", is_active=True))
+
+            sample = {}
+            timed("insert locations", lambda: sample.update(
+                build_tree(conn, building_id, args.floors, args.wings, args.rooms)
+            ))
+            timed("closure backfill", lambda: conn.execute(BACKFILL, {"building": building_id}))
+            conn.execute(text("ANALYZE locations"))
+            conn.execute(text("ANALYZE location_closure"))
+            print(f"locations: {sample['count']}")
+
+            for root in ("floor", "wing"):
+                for label, query in (
+                    ("recursive count", RECURSIVE_COUNT),
+                    ("closure count", CLOSURE_COUNT),
+                    ("recursive page", RECURSIVE_PAGE),
+                    ("closure page", CLOSURE_PAGE),
+                ):
+                    result = time_query(conn, query, sample[root], args.iterations)
+                    print(f"{root:5} {label:16} p50={result['p50']:8.2f} ms  p95={result['p95']:8.2f} ms")
+        finally:
+            transaction.rollback()
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Login storm benchmark
+
+Fires a burst of concurrent logins (the shift-start pattern) and, at the
+same time, a steady trickle of cheap probe requests. Login latency shows
+how the hashing pool queues and sheds work; probe latency shows whether
+the event loop stays responsive while bcrypt runs. Before the hashing pool,
+probes stalled behind every login; now they should stay near their idle
+latency, with surplus logins answered 503 instead of queueing forever.
+
+The login rate limit is per client IP, so start the server with
+RATE_LIMIT_ENABLED=false for this run.
+
+Usage:
+    export BENCH_EMAIL="staff@example.com" BENCH_PASSWORD="..."
+    python benchmarks/bench_login_storm.py --base-url http://localhost:8000 \\
+        --logins 300 --concurrency 100
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from typing import Dict, List
+
+import httpx
+
+PROBE_PATH = "/health"
+
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+        "max_ms": latencies[-1],
+    }
+
+
+async def login_worker(
+    client: httpx.AsyncClient,
+    queue: "asyncio.Queue[int]",
+    credentials: Dict[str, str],
+    latencies: List[float],
+    statuses: Counter
+) -> None:
+    """Take login jobs off the queue until it is empty"""
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        response = await client.post("/api/v1/auth/login", json=credentials)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statuses[response.status_code] += 1
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, interval: float, latencies: List[float]) -> None:
+    """Hit a cheap endpoint at a fixed interval until stopped"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(PROBE_PATH)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def main() -> None:
+    parser = ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--base-url", default=os.getenv("BENCH_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--email", default=os.getenv("BENCH_EMAIL"))
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD"))
+    parser.add_argument("--logins", type=int, default=300, help="Total login attempts")
+    parser.add_argument("--concurrency", type=int, default=100, help="Logins in flight at once")
+    parser.add_argument("--probe-interval", type=float, default=0.05, help="Seconds between probes")
+    args = parser.parse_args()
+
+    if not args.email or not args.password:
+        parser.error("Credentials required (--email/--password or BENCH_EMAIL/BENCH_PASSWORD)")
+
+    credentials = {"email": args.email, "password": args.password}
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for attempt in range(args.logins):
+        queue.put_nowait(attempt)
+
+    login_latencies: List[float] = []
+    probe_latencies: List[float] = []
+    statuses: Counter = Counter()
+    limits = httpx.Limits(max_connections=args.concurrency + 1, max_keepalive_connections=args.concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        # Idle baseline for the probe
+        idle: List[float] = []
+        stop = asyncio.Event()
+        probing = asyncio.create_task(probe(client, stop, args.probe_interval, idle))
+        await asyncio.sleep(1)
+        stop.set()
+        await probing
+
+        stop = asyncio.Event()
+        probing = asyncio.create_task(probe(client, stop, args.probe_interval, probe_latencies))
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            login_worker(client, queue, credentials, login_latencies, statuses)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probing
+
+    print(f"logins: {args.logins} in {elapsed:.1f}s, statuses: {dict(sorted(statuses.items()))}")
+    print(f"{'series':<14} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for name, latencies in (("login", login_latencies), ("probe idle", idle), ("probe storm", probe_latencies)):
+        stats = summarize(latencies)
+        print(f"{name:<14} {len(latencies):>6} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['max_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Rate limiter overhead benchmark
+
+Times one limiter hit (what every rate-limited request pays) for each
+storage backend with the configured strategy, over a spread of client
+keys. Redis is included when REDIS_URL answers.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py --hits 20000 --keys 500
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from typing import List
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import STRATEGIES
+
+from app.core import rate_limit_storage  # noqa: F401 - registers shm://
+from app.core.config import settings
+
+
+def bench(uri: str, hits: int, keys: int) -> List[float]:
+    limiter = STRATEGIES[settings.RATE_LIMIT_STRATEGY](storage_from_string(uri))
+    item = parse(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+    latencies = []
+    for attempt in range(hits):
+        start = time.perf_counter()
+        limiter.hit(item, "bench", f"10.0.{attempt % keys // 256}.{attempt % 256}")
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return sorted(latencies)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Benchmark rate limiter storages")
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=500, help="Distinct client keys")
+    args = parser.parse_args()
+
+    uris = {
+        "memory": "memory://",
+        "shared": f"shm://{os.path.join(tempfile.gettempdir(), 'bench-rate-limits')}?slots=65536",
+        "redis": settings.REDIS_URL,
+    }
+    print(f"strategy: {settings.RATE_LIMIT_STRATEGY}")
+    print(f"{'storage':<8} {'p50 us':>8} {'p99 us':>8}")
+    for name, uri in uris.items():
+        try:
+            latencies = bench(uri, args.hits, args.keys)
+        except Exception as e:
+            print(f"{name:<8} skipped ({e.__class__.__name__})")
+            continue
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{name:<8} {statistics.median(latencies):>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+List response serialization benchmark
+
+Times turning one page of Assignment rows into a JSON body, per row:
+
+    before  from_orm().dict() per row into a Dict[str, Any] page model,
+            then FastAPI's response_model validation and jsonable_encoder
+            and the stdlib json encoder (what list endpoints used to do)
+    after   one model_validate per row into Page[AssignmentResponse],
+            rendered by ORJSONResponse
+
+Both paths must produce the same JSON. No database is needed: the rows
+are transient ORM objects.
+
+Usage:
+    python benchmarks/bench_serialization.py --sizes 100 500 --rounds 50
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+import warnings
+from argparse import ArgumentParser
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from app.api.responses import ORJSONResponse
+from app.db.models.assignment import Assignment, AssignmentStatus
+from app.schemas.assignment import AssignmentResponse
+from app.schemas.common import Page
+
+
+class LegacyPage(BaseModel):
+    """The untyped page model list endpoints used before Page[T]"""
+
+    items: List[Dict[str, Any]]
+    page: int
+    page_size: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+LEGACY_FIELD = create_response_field(name="response", type_=LegacyPage)
+
+# The legacy path is deprecated, which is the point
+warnings.filterwarnings("ignore", message="The `(from_orm|dict)` method is deprecated")
+
+
+def make_rows(count: int) -> List[Assignment]:
+    now = datetime.now(timezone.utc)
+    statuses = list(AssignmentStatus)
+    return [
+        Assignment(
+            id=uuid.uuid4(),
+            location_id=uuid.uuid4(),
+            period_id=uuid.uuid4(),
+            staff_user_id=uuid.uuid4(),
+            supervisor_user_id=uuid.uuid4(),
+            status=statuses[index % len(statuses)],
+            staff_notes="Cleaned, bins emptied" if index % 2 else None,
+            rating=index % 5 + 1 if index % 3 == 0 else None,
+            staff_completed_at=now - timedelta(minutes=index) if index % 2 else None,
+            created_at=now - timedelta(hours=index),
+            updated_at=now - timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+async def before(rows: List[Assignment]) -> bytes:
+    page = LegacyPage(
+        items=[AssignmentResponse.from_orm(row).dict() for row in rows],
+        page=1, page_size=len(rows), total=len(rows)
+    )
+    content = await serialize_response(field=LEGACY_FIELD, response_content=page)
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+async def after(rows: List[Assignment]) -> bytes:
+    page = Page[AssignmentResponse](
+        items=[AssignmentResponse.model_validate(row) for row in rows],
+        page=1, page_size=len(rows), total=len(rows)
+    )
+    return ORJSONResponse(page).body
+
+
+async def per_row_us(path, rows: List[Assignment], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await path(rows)
+        timings.append((time.perf_counter() - start) * 1_000_000 / len(rows))
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    parser = ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500], help="Rows per page")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'rows':>5} {'before us/row':>14} {'after us/row':>13} {'speedup':>8}")
+    for size in args.sizes:
+        rows = make_rows(size)
+        if json.loads(await before(rows)) != json.loads(await after(rows)):
+            sys.exit(f"Serialized pages differ for {size} rows")
+        old = await per_row_us(before, rows, args.rounds)
+        new = await per_row_us(after, rows, args.rounds)
+        print(f"{size:>5} {old:>14.2f} {new:>13.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Query-plan check for the assignment workflow hot paths
+
+Runs EXPLAIN on the statements the routers issue and fails unless each one
+is served by the expected index. Sequential scans are disabled for the
+check so the result does not depend on how much data the database holds:
+the question answered is "can the planner use an index for this query",
+not "is an index cheaper on today's table size".
+
+Usage:
+    alembic upgrade head
+    python benchmarks/check_query_plans.py
+"""
+
+import enum
+import os
+import sys
+import uuid
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select, text
+
+from app.db.base import engine
+from app.db.models.assignment import Assignment, AssignmentStatus
+from app.db.models.location_closure import LocationClosure
+
+SAMPLE_ID = uuid.uuid4()
+
+
+def order_page(stmt):
+    """Apply the list endpoints' ordering and page size"""
+    return stmt.order_by(Assignment.created_at, Assignment.id).limit(20)
+
+
+# label, statement, index expected in the plan
+CHECKS: List[Tuple[str, Any, str]] = [
+    (
+        "dashboard status counts",
+        select(Assignment.status, func.count(Assignment.id))
+        .filter(Assignment.period_id == SAMPLE_ID)
+        .group_by(Assignment.status),
+        "ix_assignments_period_status",
+    ),
+    (
+        "staff task list",
+        order_page(select(Assignment).filter(
+            Assignment.staff_user_id == SAMPLE_ID,
+            Assignment.period_id == SAMPLE_ID,
+            Assignment.status == AssignmentStatus.PENDING,
+        )),
+        "ix_assignments_staff_period_status",
+    ),
+    (
+        "staff open work",
+        select(Assignment).filter(
+            Assignment.staff_user_id == SAMPLE_ID,
+            Assignment.period_id == SAMPLE_ID,
+            Assignment.status.in_([AssignmentStatus.PENDING, AssignmentStatus.REJECTED]),
+        ),
+        "ix_assignments_staff_open",
+    ),
+    (
+        "supervisor review queue",
+        order_page(select(Assignment).filter(
+            Assignment.supervisor_user_id == SAMPLE_ID,
+            Assignment.status == AssignmentStatus.CLEANED,
+        )),
+        "ix_assignments_supervisor_status",
+    ),
+    (
+        "create_assignment duplicate check",
+        select(Assignment).filter(
+            Assignment.location_id == SAMPLE_ID,
+            Assignment.period_id == SAMPLE_ID,
+        ).limit(1),
+        "uq_assignments_location_period",
+    ),
+    (
+        "admin grid (keyset)",
+        order_page(select(Assignment)),
+        "ix_assignments_created_at_id",
+    ),
+    (
+        "location subtree filter",
+        select(LocationClosure.descendant_id).filter(LocationClosure.ancestor_id == SAMPLE_ID),
+        "location_closure_pkey",
+    ),
+]
+
+
+def driver_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert bound values to what the driver expects (enums bind by name)"""
+    converted = {}
+    for name, value in params.items():
+        if isinstance(value, enum.Enum):
+            converted[name] = value.name
+        elif isinstance(value, uuid.UUID):
+            converted[name] = str(value)
+        else:
+            converted[name] = value
+    return converted
+
+
+def plan_indexes(node: Dict[str, Any]) -> Iterator[str]:
+    """Yield every index name referenced in a JSON plan tree"""
+    if "Index Name" in node:
+        yield node["Index Name"]
+    for child in node.get("Plans", []):
+        yield from plan_indexes(child)
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as conn:
+        for label, stmt, expected in CHECKS:
+            compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+            with conn.begin():
+                conn.execute(text("SET LOCAL enable_seqscan = off"))
+                plan = conn.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {compiled}", driver_params(compiled.params)
+                ).scalar()
+            indexes = sorted(set(plan_indexes(plan[0]["Plan"])))
+            ok = expected in indexes
+            failures += not ok
+            print(f"[{'OK' if ok else 'FAIL'}] {label}: expected {expected}, plan uses {indexes or 'no index'}")
+
+    engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Rebuild the period_stats counters from the assignments table
+
+The counters are maintained by triggers, so drift should only come from
+manual edits or a trigger that was disabled. The rebuild takes a SHARE lock
+on assignments, which blocks writers (not readers) for the duration of one
+GROUP BY, so the recount and the rewrite see the same data.
+
+Usage:
+    python reconcile_period_stats.py            # report drift and fix it
+    python reconcile_period_stats.py --dry-run  # report only
+
+Exits with status 1 when drift was found.
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+
+# Add the app directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.logging import get_logger
+from app.db.base import SessionLocal, engine
+from app.db.models.assignment import Assignment, AssignmentStatus
+from app.db.models.period_stats import PeriodStats
+
+logger = get_logger(__name__)
+
+COUNTERS = [status.value for status in AssignmentStatus]
+
+
+def reconcile(dry_run: bool = False) -> int:
+    """
+    Compare stored counters with a fresh recount and rewrite them
+
+    Args:
+        dry_run: Report drift without changing anything
+
+    Returns:
+        Number of periods whose counters were wrong
+    """
+    session = SessionLocal()
+    try:
+        session.execute(text("LOCK TABLE assignments IN SHARE MODE"))
+
+        expected = {}
+        for period_id, status, count in session.execute(
+            select(Assignment.period_id, Assignment.status, func.count())
+            .group_by(Assignment.period_id, Assignment.status)
+        ):
+            expected.setdefault(period_id, dict.fromkeys(COUNTERS, 0))[status.value] = count
+
+        stored = {
+            row.period_id: {name: getattr(row, name) for name in COUNTERS}
+            for row in session.execute(select(PeriodStats)).scalars()
+        }
+
+        drifted = 0
+        for period_id in sorted(expected.keys() | stored.keys(), key=str):
+            want = expected.get(period_id, dict.fromkeys(COUNTERS, 0))
+            have = stored.get(period_id, dict.fromkeys(COUNTERS, 0))
+            if want != have:
+                drifted += 1
+                changes = ", ".join(
+                    f"{name} {have[name]} -> {want[name]}" for name in COUNTERS if have[name] != want[name]
+                )
+                logger.warning(f"Period {period_id}: {changes}")
+
+        if dry_run or not drifted:
+            session.rollback()
+        else:
+            session.execute(delete(PeriodStats))
+            if expected:
+                session.execute(pg_insert(PeriodStats).values([
+                    {"period_id": period_id, **counts} for period_id, counts in expected.items()
+                ]))
+            session.commit()
+
+        logger.info(
+            f"Checked {len(expected.keys() | stored.keys())} periods, {drifted} drifted"
+            + (" (dry run, nothing changed)" if dry_run and drifted else "")
+        )
+        return drifted
+
+    except Exception as e:
+        logger.error(f"Error reconciling period stats: {e}", exc_info=True)
+        session.rollback()
+        sys.exit(2)
+    finally:
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Rebuild period_stats counters from assignments")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report drift without rewriting the counters"
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(1 if reconcile(dry_run=args.dry_run) else 0)
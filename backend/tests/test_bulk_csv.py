@@ -0,0 +1,77 @@
+"""Streamed bulk assignment bodies (app.api.routers.assignments)"""
+
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.routers.assignments import _iter_bulk_rows
+
+
+class Body:
+    """Stand-in request streaming a body in fixed-size chunks"""
+
+    def __init__(self, body: bytes, content_type: str = "text/csv", chunk_size: int = 7):
+        self.headers = {"content-type": content_type}
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def stream(self):
+        for start in range(0, len(self.body), self.chunk_size):
+            yield self.body[start:start + self.chunk_size]
+
+
+async def rows(body: bytes, **kwargs) -> List:
+    return [row async for row in _iter_bulk_rows(Body(body, **kwargs))]
+
+
+@pytest.mark.asyncio
+async def test_quoted_field_may_span_lines():
+    body = b'location_id,note\r\na,"first line\r\nsecond, with comma"\r\nb,plain\r\n'
+
+    assert await rows(body) == [
+        {"location_id": "a", "note": "first line\nsecond, with comma"},
+        {"location_id": "b", "note": "plain"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_doubled_quotes_inside_a_multi_line_field():
+    body = b'location_id,note\na,"say ""hi""\nthen ""bye"""\nb,x\n'
+
+    assert await rows(body) == [
+        {"location_id": "a", "note": 'say "hi"\nthen "bye"'},
+        {"location_id": "b", "note": "x"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stray_quote_in_unquoted_field_stays_on_its_row():
+    body = b'location_id,note\na,12" monitor\nb,ok\n'
+
+    assert await rows(body) == [
+        {"location_id": "a", "note": '12" monitor'},
+        {"location_id": "b", "note": "ok"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_blank_lines_are_skipped_and_bom_dropped():
+    body = "﻿location_id,note\n\na,é\n   \nb,x".encode("utf-8")
+
+    assert await rows(body) == [{"location_id": "a", "note": "é"}, {"location_id": "b", "note": "x"}]
+
+
+@pytest.mark.asyncio
+async def test_unterminated_quoted_field_is_an_invalid_row():
+    body = b'location_id,note\na,ok\nb,"never closed\nc,lost\n'
+
+    assert await rows(body) == [{"location_id": "a", "note": "ok"}, None]
+
+
+@pytest.mark.asyncio
+async def test_non_utf8_body_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        await rows(b"location_id,note\na,\xff\n")
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,295 @@
+"""
+Two-level cache (app.core.cache)
+
+Runs every Cache against an in-process stand-in Redis (fakeredis) and with
+Redis off. A second worker is a second Cache of the same namespace; the
+one left in the registry is "this" worker, whose L1 the invalidation
+listener manages.
+"""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import Cache, run_cache_invalidation_listener
+from app.core.config import settings
+
+NAMESPACE = "test"
+
+
+def use_redis(monkeypatch, client):
+    monkeypatch.setattr(cache_module, "get_redis", lambda: client)
+    return client
+
+
+def stand_in_redis():
+    # Same client options as app.core.redis
+    return fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+@pytest.fixture(params=["redis", "local"])
+def redis(request, monkeypatch):
+    """Each test twice: with a stand-in Redis, and L1 only"""
+    return use_redis(monkeypatch, stand_in_redis() if request.param == "redis" else None)
+
+
+@pytest.fixture
+def shared_redis(monkeypatch):
+    return use_redis(monkeypatch, stand_in_redis())
+
+
+@pytest.fixture(autouse=True)
+def forget_namespaces():
+    yield
+    cache_module._caches.pop(NAMESPACE, None)
+
+
+def make_cache(ttl_seconds: float = 60) -> Cache:
+    """A worker's cache; the latest one made is the registered one"""
+    cache_module._caches.pop(NAMESPACE, None)
+    return Cache(NAMESPACE, ttl_seconds, max_entries=100)
+
+
+class Loader:
+    """Loader that counts its calls and holds each one until released"""
+
+    def __init__(self, value="loaded", fail_first: bool = False):
+        self.value = value
+        self.fail_first = fail_first
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.fail_first and self.calls == 1:
+            raise RuntimeError("load failed")
+        return self.value
+
+
+async def settle():
+    """Let every task started so far reach its first wait"""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_set_get_delete(redis):
+    cache = make_cache()
+    await cache.set("key", {"a": 1})
+    assert await cache.get("key") == {"a": 1}
+    await cache.delete("key")
+    assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_call(redis):
+    cache = make_cache()
+    loader = Loader()
+    calls = [asyncio.create_task(cache.get_or_load("key", loader)) for _ in range(5)]
+    await settle()
+    loader.release.set()
+
+    assert await asyncio.gather(*calls) == ["loaded"] * 5
+    assert loader.calls == 1
+    assert await cache.get("key") == "loaded"
+
+
+@pytest.mark.asyncio
+async def test_failed_load_lets_waiters_load_for_themselves(redis):
+    cache = make_cache()
+    loader = Loader(fail_first=True)
+    calls = [asyncio.create_task(cache.get_or_load("key", loader)) for _ in range(3)]
+    await settle()
+    loader.release.set()
+
+    first, *waiters = await asyncio.gather(*calls, return_exceptions=True)
+    assert isinstance(first, RuntimeError)
+    assert waiters == ["loaded", "loaded"]
+    assert loader.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_none_is_not_cached(redis):
+    cache = make_cache()
+    loader = Loader(value=None)
+    loader.release.set()
+
+    assert await cache.get_or_load("key", loader) is None
+    assert await cache.get_or_load("key", loader) is None
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_load_overlapping_invalidation_is_not_stored(redis):
+    cache = make_cache()
+    loader = Loader(value="stale")
+    load = asyncio.create_task(cache.get_or_load("key", loader))
+    await settle()
+    await cache.delete("key")
+    loader.release.set()
+
+    assert await load == "stale"
+    assert await cache.get("key") is None
+    if redis is not None:
+        assert await redis.get(cache._redis_key("key")) is None
+
+
+@pytest.mark.asyncio
+async def test_load_overlapping_other_workers_delete_is_not_stored(shared_redis):
+    loading, deleting = make_cache(), make_cache()
+    loader = Loader(value="before delete")
+    load = asyncio.create_task(loading.get_or_load("key", loader))
+    await settle()
+    # Another worker commits a change and deletes the key mid-load
+    await deleting.delete("key")
+    loader.release.set()
+
+    assert await load == "before delete"
+    assert await shared_redis.get(loading._redis_key("key")) is None
+    assert await deleting.get("key") is None
+    assert loading._get_local("key") is None
+    assert loading.stats()["stale_loads"] == 1
+
+
+@pytest.mark.asyncio
+async def test_load_after_other_workers_delete_is_stored(shared_redis):
+    loading, deleting = make_cache(), make_cache()
+    await deleting.delete("key")
+    loader = Loader(value="after delete")
+    loader.release.set()
+
+    await loading.get_or_load("key", loader)
+
+    assert await deleting.get("key") == "after delete"
+
+
+@pytest.mark.asyncio
+async def test_disabled_namespace_always_loads(redis):
+    cache = make_cache(ttl_seconds=0)
+    loader = Loader()
+    loader.release.set()
+
+    await cache.get_or_load("key", loader)
+    await cache.get_or_load("key", loader)
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_other_worker_reads_shared_copy(shared_redis):
+    other, this = make_cache(), make_cache()
+    await other.set("key", "value")
+
+    assert await this.get("key") == "value"
+    assert this.stats()["l2_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lock_holder_loads_for_other_workers(shared_redis):
+    other, this = make_cache(), make_cache()
+    holder, waiter = Loader(value="holder"), Loader(value="waiter")
+    waiter.release.set()
+
+    held = asyncio.create_task(other.get_or_load("key", holder))
+    await settle()
+    waiting = asyncio.create_task(this.get_or_load("key", waiter))
+    await settle()
+    holder.release.set()
+
+    assert await asyncio.gather(held, waiting) == ["holder", "holder"]
+    assert waiter.calls == 0
+    assert this.stats()["lock_waits"] == 1
+    assert await shared_redis.keys("cache-lock:*") == []
+
+
+@pytest.mark.asyncio
+async def test_lock_wait_gives_up_after_timeout(shared_redis, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_LOCK_TIMEOUT_SECONDS", 0.1)
+    other, this = make_cache(), make_cache()
+    holder, waiter = Loader(value="holder"), Loader(value="waiter")
+    waiter.release.set()
+
+    held = asyncio.create_task(other.get_or_load("key", holder))
+    await settle()
+    assert await this.get_or_load("key", waiter) == "waiter"
+    assert waiter.calls == 1
+
+    holder.release.set()
+    await held
+
+
+async def start_listener(redis) -> asyncio.Task:
+    listener = asyncio.create_task(run_cache_invalidation_listener())
+    for _ in range(100):
+        if (await redis.pubsub_numsub(settings.CACHE_INVALIDATION_CHANNEL))[0][1]:
+            return listener
+        await asyncio.sleep(0.01)
+    listener.cancel()
+    raise AssertionError("listener never subscribed")
+
+
+async def stop(task: asyncio.Task) -> None:
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_delete_drops_other_workers_local_copy(shared_redis):
+    other, this = make_cache(), make_cache()
+    listener = await start_listener(shared_redis)
+    try:
+        await this.set("key", "old")
+        await other.delete("key")
+        for _ in range(100):
+            if this._get_local("key") is None:
+                break
+            await asyncio.sleep(0.01)
+        assert this._get_local("key") is None
+        assert await this.get("key") is None
+    finally:
+        await stop(listener)
+
+
+@pytest.mark.asyncio
+async def test_subscribing_drops_local_copies(shared_redis):
+    cache = make_cache()
+    await cache.set("key", "value")
+
+    # Deletes published before (re)subscribing were missed
+    listener = await start_listener(shared_redis)
+    try:
+        assert cache._get_local("key") is None
+    finally:
+        await stop(listener)
+
+
+@pytest.mark.asyncio
+async def test_local_copy_expires_before_shared_one(shared_redis, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_L1_TTL_SECONDS", 0.05)
+    cache = make_cache()
+    await cache.set("key", "value")
+    await asyncio.sleep(0.1)
+
+    assert cache._get_local("key") is None
+    assert await cache.get("key") == "value"
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_loader(shared_redis, monkeypatch):
+    async def broken_set(*args, **kwargs):
+        raise ConnectionError("down")
+
+    def broken_pipeline(*args, **kwargs):
+        raise ConnectionError("down")
+
+    cache = make_cache()
+    monkeypatch.setattr(shared_redis, "set", broken_set)
+    monkeypatch.setattr(shared_redis, "pipeline", broken_pipeline)
+    loader = Loader()
+    loader.release.set()
+
+    assert await cache.get_or_load("key", loader) == "loaded"
+    assert cache.stats()["errors"] >= 1
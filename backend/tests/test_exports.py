@@ -0,0 +1,82 @@
+"""Streaming export encoders (app.api.exports)"""
+
+import csv
+import datetime
+import enum
+import io
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+from app.api import exports
+
+MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+class Status(enum.Enum):
+    DONE = "done"
+
+
+async def rows_of(*rows):
+    for row in rows:
+        yield row
+
+
+async def encoded(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+def sheet_rows(workbook: zipfile.ZipFile):
+    sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
+    return [
+        [
+            cell.findtext(f"{MAIN}v") or cell.findtext(f"{MAIN}is/{MAIN}t")
+            for cell in row.iter(f"{MAIN}c")
+        ]
+        for row in sheet.iter(f"{MAIN}row")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_is_a_valid_workbook(monkeypatch):
+    monkeypatch.setattr(exports, "CHUNK_BYTES", 64)  # several chunks per sheet
+    rows = [("Oda <1> & \x01koridor", 3, None, Status.DONE)] * 50 + [("=1+1", 1.5, "x", datetime.date(2026, 10, 1))]
+
+    body = await encoded(exports.xlsx_chunks(["name", "count", "note", "status"], rows_of(*rows), "Rapor & özet"))
+
+    with zipfile.ZipFile(io.BytesIO(body)) as workbook:
+        assert workbook.testzip() is None
+        assert set(workbook.namelist()) == {
+            "[Content_Types].xml", "_rels/.rels", "xl/_rels/workbook.xml.rels",
+            "xl/workbook.xml", "xl/worksheets/sheet1.xml",
+        }
+        for name in workbook.namelist():
+            ElementTree.fromstring(workbook.read(name))
+        sheet = ElementTree.fromstring(workbook.read("xl/workbook.xml")).find(f"{MAIN}sheets/{MAIN}sheet")
+        assert sheet.get("name") == "Rapor & özet"
+
+        parsed = sheet_rows(workbook)
+    assert parsed[0] == ["name", "count", "note", "status"]
+    assert parsed[1] == ["Oda <1> & koridor", "3", None, "done"]
+    assert parsed[-1] == ["=1+1", "1.5", "x", "2026-10-01"]
+    assert len(parsed) == 52
+
+
+@pytest.mark.asyncio
+async def test_csv_escapes_formula_prefixes():
+    rows = [("=HYPERLINK(\"x\")", "+1", "-2", "@SUM(A1)", "\tx", "plain", -3, 2.5, True)]
+
+    body = await encoded(exports.csv_chunks(list("abcdefghi"), rows_of(*rows)))
+
+    assert list(csv.reader(io.StringIO(body.decode("utf-8")))) == [
+        list("abcdefghi"),
+        ["'=HYPERLINK(\"x\")", "'+1", "'-2", "'@SUM(A1)", "'\tx", "plain", "-3", "2.5", "True"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_keys_rows_by_column():
+    body = await encoded(exports.ndjson_chunks(["id", "when"], rows_of((1, datetime.date(2026, 1, 2)), (2, None))))
+
+    assert body == b'{"id":1,"when":"2026-01-02"}\n{"id":2,"when":null}\n'
@@ -0,0 +1,73 @@
+"""Password hashing pool admission control (app.security.hashing)"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.security.hashing import HashingPool
+
+
+@pytest.fixture
+def gate():
+    """Calls wait() on the pool until the test opens the gate"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def blocked(gate: threading.Event, value):
+    assert gate.wait(10)
+    return value
+
+
+async def until_running(pool: HashingPool, count: int) -> None:
+    while pool.in_flight < count:
+        await asyncio.sleep(0.001)
+
+
+@pytest.mark.asyncio
+async def test_calls_past_capacity_are_rejected_at_once(gate):
+    pool = HashingPool(workers=1, max_queue=1, queue_timeout=10)
+    running = asyncio.create_task(pool.run(blocked, gate, "a"))
+    queued = asyncio.create_task(pool.run(blocked, gate, "b"))
+    await until_running(pool, 2)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await pool.run(blocked, gate, "c")
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "1"}
+
+    gate.set()
+    assert await asyncio.gather(running, queued) == ["a", "b"]
+    assert pool.in_flight == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queued_call_times_out(gate):
+    pool = HashingPool(workers=1, max_queue=1, queue_timeout=0.05)
+    running = asyncio.create_task(pool.run(blocked, gate, "a"))
+    await until_running(pool, 1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await pool.run(blocked, gate, "b")
+    assert exc_info.value.status_code == 503
+    assert pool.in_flight == 1
+
+    gate.set()
+    assert await running == "a"
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failing_call_frees_its_slot():
+    pool = HashingPool(workers=1, max_queue=0, queue_timeout=1)
+
+    with pytest.raises(ValueError):
+        await pool.run(int, "not a number")
+
+    assert await pool.run(int, "42") == 42
+    assert pool.in_flight == 0
+    pool.shutdown()
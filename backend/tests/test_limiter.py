@@ -0,0 +1,34 @@
+"""Rate limit keys and groups (app.core.limiter)"""
+
+import pytest
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter
+
+from app.core.config import Settings, settings
+from app.core.limiter import limiter
+
+
+@pytest.fixture
+def enforced_limits(monkeypatch):
+    monkeypatch.setattr(limiter, "enabled", True)
+    monkeypatch.setattr(limiter, "_limiter", FixedWindowRateLimiter(MemoryStorage()))
+    monkeypatch.setitem(settings.RATE_LIMIT_GROUPS, "refresh", {"default": "2/minute"})
+
+
+async def refresh(client, token: str) -> int:
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+    return response.status_code
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_limited_per_token_not_per_ip(database, client, enforced_limits):
+    assert [await refresh(client, "stolen") for _ in range(3)] == [401, 401, 429]
+    # Same client IP, another token: its own budget
+    assert await refresh(client, "someone-else") == 401
+
+
+def test_group_overrides_keep_the_other_defaults():
+    overridden = Settings(RATE_LIMIT_GROUPS={"exports": {"default": "1/minute"}})
+
+    assert overridden.RATE_LIMIT_GROUPS["exports"] == {"default": "1/minute"}
+    assert overridden.RATE_LIMIT_GROUPS["refresh"] == {"default": "10/minute"}
@@ -0,0 +1,119 @@
+"""List totals and cursors (app.api.pagination)"""
+
+import base64
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.pagination import count_cache, count_total, decode_cursor, encode_cursor, sort_columns
+from app.core.config import settings
+from app.db import replicas
+from app.db.models.building import Building
+
+QUERY = select(Building).filter(Building.is_active.is_(True))
+
+
+class Session:
+    """Stand-in session answering every count with a fixed total"""
+
+    def __init__(self, total: int):
+        self.bind = SimpleNamespace(dialect=postgresql.dialect())
+        self.total = total
+        self.counts = 0
+
+    async def scalar(self, query):
+        self.counts += 1
+        return self.total
+
+
+@pytest.fixture(autouse=True)
+def empty_count_cache():
+    count_cache._entries.clear()
+    yield
+    count_cache._entries.clear()
+
+
+@pytest.fixture
+def replica_session(monkeypatch):
+    session = Session(total=5)
+    monkeypatch.setattr(replicas, "replicas", [SimpleNamespace(engine=session.bind)])
+    return session
+
+
+@pytest.mark.asyncio
+async def test_exact_count_is_cached():
+    primary = Session(total=7)
+
+    assert await count_total(primary, QUERY, "exact") == (7, False)
+    assert await count_total(primary, QUERY, "exact") == (7, False)
+    assert primary.counts == 1
+
+
+@pytest.mark.asyncio
+async def test_replica_count_is_not_served_to_primary_reads(replica_session):
+    primary = Session(total=7)
+
+    assert await count_total(replica_session, QUERY, "exact") == (5, False)
+    assert await count_total(primary, QUERY, "exact") == (7, False)
+    assert await count_total(replica_session, QUERY, "exact") == (5, False)
+    assert (replica_session.counts, primary.counts) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_replica_counts_live_no_longer_than_the_lag_limit(replica_session, monkeypatch):
+    monkeypatch.setattr(settings, "REPLICA_MAX_LAG_SECONDS", 0)
+
+    await count_total(replica_session, QUERY, "exact")
+    await count_total(replica_session, QUERY, "exact")
+
+    assert replica_session.counts == 2
+
+
+@pytest.mark.asyncio
+async def test_write_drops_cached_counts():
+    primary = Session(total=7)
+    await count_total(primary, QUERY, "exact")
+
+    count_cache.invalidate_tables({"buildings"})
+    await count_total(primary, QUERY, "exact")
+
+    assert primary.counts == 2
+
+
+COLUMNS = sort_columns(Building)
+
+
+def test_cursor_round_trips_sort_keys():
+    created_at = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone(timedelta(hours=3)))
+    row_id = uuid.uuid4()
+
+    cursor = encode_cursor([created_at, row_id])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, COLUMNS) == [created_at, row_id]
+
+
+def b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    "ğ",
+    b64(b"not json"),
+    b64(b'{"created_at": "2026-10-18T09:30:00"}'),
+    b64(b'["2026-10-18T09:30:00"]'),
+    b64(b'["2026-10-18T09:30:00", "not-a-uuid"]'),
+    b64(b'["yesterday", "00000000-0000-0000-0000-000000000000"]'),
+    b64(b'[20261018, "00000000-0000-0000-0000-000000000000"]'),
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, COLUMNS)
+
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,84 @@
+"""Period routes against PostgreSQL (see the database fixture)"""
+
+import datetime
+
+import pytest
+
+from app.db.base import AsyncSessionLocal
+from app.db.models import Assignment, Building, Location, Period, User
+from app.db.models.location import LocationType
+from app.db.models.period import PeriodStatus
+from app.db.models.user import UserRole
+from app.security.auth import access_token_claims, create_access_token
+
+
+async def seed_clone_source():
+    """Admin, staff, supervisor and a completed period with three assignments"""
+    async with AsyncSessionLocal() as db:
+        admin = User(email="admin@example.com", hashed_password="x", full_name="Admin", role=UserRole.ADMIN)
+        staff = User(email="staff@example.com", hashed_password="x", full_name="Staff", role=UserRole.STAFF)
+        supervisor = User(email="sup@example.com", hashed_password="x", full_name="Sup", role=UserRole.SUPERVISOR)
+        building = Building(name="A Blok", code="A")
+        db.add_all([admin, staff, supervisor, building])
+        await db.flush()
+
+        rooms = [
+            Location(name=f"A-10{index}", location_type=LocationType.DERSLIK, building_id=building.id)
+            for index in range(3)
+        ]
+        source = Period(
+            name="Güz", start_date=datetime.date(2026, 9, 1), end_date=datetime.date(2027, 1, 31),
+            status=PeriodStatus.COMPLETED
+        )
+        target = Period(
+            name="Bahar", start_date=datetime.date(2027, 2, 1), end_date=datetime.date(2027, 6, 30),
+            status=PeriodStatus.PLANNED
+        )
+        db.add_all([*rooms, source, target])
+        await db.flush()
+        db.add_all([
+            Assignment(
+                location_id=room.id, period_id=source.id,
+                staff_user_id=staff.id, supervisor_user_id=supervisor.id
+            )
+            for room in rooms
+        ])
+        await db.commit()
+        headers = {"Authorization": f"Bearer {create_access_token(access_token_claims(admin))}"}
+        return headers, source.id, target.id
+
+
+async def target_total(client, headers, period_id) -> int:
+    response = await client.get(
+        "/api/v1/assignments/", params={"period_id": str(period_id), "include_total": "true"}, headers=headers
+    )
+    assert response.status_code == 200
+    return response.json()["total"]
+
+
+@pytest.mark.asyncio
+async def test_clone_invalidates_cached_list_totals(database, client):
+    headers, source_id, target_id = await seed_clone_source()
+    # Fills the count cache for the target period
+    assert await target_total(client, headers, target_id) == 0
+
+    response = await client.post(
+        f"/api/v1/periods/{target_id}/clone-assignments",
+        json={"source_period_id": str(source_id), "only_active_locations": False},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+    assert await target_total(client, headers, target_id) == 3
+
+
+@pytest.mark.asyncio
+async def test_clone_skips_locations_already_assigned(database, client):
+    headers, source_id, target_id = await seed_clone_source()
+    body = {"source_period_id": str(source_id), "only_active_locations": False}
+    await client.post(f"/api/v1/periods/{target_id}/clone-assignments", json=body, headers=headers)
+
+    response = await client.post(f"/api/v1/periods/{target_id}/clone-assignments", json=body, headers=headers)
+    result = response.json()
+    assert (result["candidates"], result["created"], result["skipped"]) == (3, 0, 3)
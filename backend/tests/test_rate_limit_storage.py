@@ -0,0 +1,135 @@
+"""Shared-memory rate limit counters (app.core.rate_limit_storage)"""
+
+import multiprocessing
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import rate_limit_storage
+from app.core.rate_limit_storage import SharedMemoryStorage, _key_hash
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit_storage, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+def storage(tmp_path, slots: int = 64) -> SharedMemoryStorage:
+    return SharedMemoryStorage(f"shm://{tmp_path / 'limits'}?slots={slots}")
+
+
+def colliding_keys(slots: int, count: int):
+    """Keys whose probe ranges start at the same slot"""
+    keys = []
+    candidate = 0
+    while len(keys) < count:
+        key = f"user:{candidate}"
+        if _key_hash(key) % slots == 0:
+            keys.append(key)
+        candidate += 1
+    return keys
+
+
+def test_colliding_keys_keep_separate_counts(tmp_path, clock):
+    counters = storage(tmp_path, slots=8)
+    first, second, third = colliding_keys(8, 3)
+
+    counters.incr(first, 60)
+    counters.incr(second, 60, amount=2)
+    counters.incr(third, 60, amount=3)
+
+    assert [counters.get(key) for key in (first, second, third)] == [1, 2, 3]
+
+
+def test_cleared_key_does_not_hide_keys_probed_past_it(tmp_path, clock):
+    counters = storage(tmp_path, slots=8)
+    first, second = colliding_keys(8, 2)
+    counters.incr(first, 60)
+    counters.incr(second, 60, amount=5)
+
+    counters.clear(first)
+
+    assert (counters.get(first), counters.get(second)) == (0, 5)
+
+
+def test_full_table_evicts_the_key_expiring_soonest(tmp_path, clock):
+    counters = storage(tmp_path, slots=2)
+    counters.incr("short", 10)
+    counters.incr("long", 600)
+
+    counters.incr("new", 60)
+
+    assert (counters.get("short"), counters.get("long"), counters.get("new")) == (0, 1, 1)
+
+
+def test_fixed_window_rolls_over_after_expiry(tmp_path, clock):
+    counters = storage(tmp_path)
+    assert [counters.incr("ip:a", 60) for _ in range(3)] == [1, 2, 3]
+
+    clock.now += 60
+
+    assert counters.get("ip:a") == 0
+    assert counters.incr("ip:a", 60) == 1
+    assert counters.get_expiry("ip:a") == clock.now + 60
+
+
+def test_sliding_window_weights_the_previous_window(tmp_path, clock):
+    counters = storage(tmp_path)
+    clock.now = 6000.0  # start of a 60 s window
+    assert all(counters.acquire_sliding_window_entry("ip:a", 4, 60) for _ in range(4))
+    assert not counters.acquire_sliding_window_entry("ip:a", 4, 60)
+
+    # Half way into the next window the previous four still count as two
+    clock.now += 90
+    assert counters.get_sliding_window("ip:a", 60) == (4, 30.0, 0, 90.0)
+    assert counters.acquire_sliding_window_entry("ip:a", 4, 60)
+    assert counters.acquire_sliding_window_entry("ip:a", 4, 60)
+    assert not counters.acquire_sliding_window_entry("ip:a", 4, 60)
+
+    # Two windows on, nothing is left
+    clock.now += 60
+    assert counters.get_sliding_window("ip:a", 60)[::2] == (2, 0)
+    clock.now += 60
+    assert counters.get_sliding_window("ip:a", 60)[::2] == (0, 0)
+
+
+def _increment(uri: str, times: int) -> None:
+    counters = SharedMemoryStorage(uri)
+    for _ in range(times):
+        counters.incr("shared", 60)
+
+
+def test_processes_sharing_the_file_count_together(tmp_path):
+    uri = f"shm://{tmp_path / 'limits'}?slots=64"
+    parent = SharedMemoryStorage(uri)
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_increment, args=(uri, 500)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert [worker.exitcode for worker in workers] == [0, 0]
+    assert parent.get("shared") == 1000
+
+
+def test_forked_child_reuses_the_parents_storage(tmp_path):
+    counters = storage(tmp_path)
+    counters.incr("shared", 60)
+    context = multiprocessing.get_context("fork")
+    child = context.Process(target=lambda: counters.incr("shared", 60, amount=10))
+    child.start()
+    child.join(timeout=30)
+
+    assert child.exitcode == 0
+    assert counters.get("shared") == 11
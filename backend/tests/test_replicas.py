@@ -0,0 +1,64 @@
+"""Read-your-writes pinning across workers (app.db.replicas)"""
+
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.core.rate_limit_storage import SharedMemoryStorage
+from app.db import replicas
+
+
+@pytest.fixture
+def pin_files(tmp_path, monkeypatch):
+    """Pin tables of two workers mapping one file, with one replica configured"""
+    monkeypatch.setattr(replicas, "replicas", [SimpleNamespace(usable=True)])
+    uri = f"shm://{tmp_path / 'pins'}?slots=64"
+    return SharedMemoryStorage(uri), SharedMemoryStorage(uri)
+
+
+def commit_as(user_id) -> None:
+    """What the commit hook does for a session bound to user_id"""
+    replicas._remember_writer(SimpleNamespace(info={replicas.SESSION_USER_KEY: user_id}), {"assignments"})
+
+
+def test_write_pins_reads_in_every_worker(pin_files, monkeypatch):
+    writer, reader = pin_files
+    user_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+    monkeypatch.setattr(replicas, "writer_pins", writer)
+    commit_as(user_id)
+
+    monkeypatch.setattr(replicas, "writer_pins", reader)
+    assert replicas.wrote_recently(user_id)
+    assert not replicas.wrote_recently(other_id)
+
+
+def test_pin_ends_after_the_window_and_later_writes_extend_it(pin_files, monkeypatch):
+    writer, _ = pin_files
+    user_id = uuid.uuid4()
+    monkeypatch.setattr(replicas, "writer_pins", writer)
+    monkeypatch.setattr(settings, "READ_YOUR_WRITES_SECONDS", 0.2)
+
+    commit_as(user_id)
+    time.sleep(0.1)
+    commit_as(user_id)
+    time.sleep(0.15)
+    assert replicas.wrote_recently(user_id)
+
+    time.sleep(0.1)
+    assert not replicas.wrote_recently(user_id)
+
+
+def test_no_pins_without_replicas(pin_files, monkeypatch):
+    writer, _ = pin_files
+    user_id = uuid.uuid4()
+    monkeypatch.setattr(replicas, "writer_pins", writer)
+    monkeypatch.setattr(replicas, "replicas", [])
+
+    commit_as(user_id)
+
+    assert writer.get(f"writer:{user_id}") == 0
+    assert not replicas.wrote_recently(user_id)
@@ -0,0 +1,71 @@
+"""Response cache invalidation across workers without Redis (app.api.response_cache)"""
+
+from types import SimpleNamespace
+
+import pytest
+from starlette.requests import Request
+
+from app.api.response_cache import ResponseCache
+from app.core import cache as cache_module
+from app.core.rate_limit_storage import SharedMemoryStorage
+from app.db.models.user import UserRole
+
+TABLES = ("buildings",)
+ADMIN = SimpleNamespace(role=UserRole.ADMIN)
+PRIMARY = SimpleNamespace(bind=None)
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Two workers' response caches; each maps the versions file itself, as a process would"""
+    uri = f"shm://{tmp_path / 'versions'}?slots=64"
+    made = [
+        ResponseCache(60, 100, SharedMemoryStorage(uri), namespace=f"response-{worker}")
+        for worker in ("a", "b")
+    ]
+    yield made
+    for worker in ("a", "b"):
+        cache_module._caches.pop(f"response-{worker}", None)
+
+
+def list_request(query: bytes = b"page=1") -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": query, "headers": []})
+
+
+async def cached_key(cache: ResponseCache) -> str:
+    return await cache.key("buildings", TABLES, list_request(), ADMIN, PRIMARY)
+
+
+@pytest.mark.asyncio
+async def test_write_in_one_worker_invalidates_the_others(workers):
+    writer, reader = workers
+    key = await cached_key(reader)
+    await reader.entries.set(key, ("[]", '"etag"'))
+    assert await cached_key(writer) == key
+
+    await writer.bump("buildings")
+
+    fresh_key = await cached_key(reader)
+    assert fresh_key != key
+    assert await reader.entries.get(fresh_key) is None
+
+
+@pytest.mark.asyncio
+async def test_commit_backstop_bumps_shared_versions(workers):
+    writer, reader = workers
+    key = await cached_key(reader)
+
+    # What on_tables_committed calls with the tables a transaction wrote
+    writer.bump_host({"buildings"})
+
+    assert await cached_key(reader) != key
+
+
+@pytest.mark.asyncio
+async def test_unrelated_table_keeps_entries(workers):
+    writer, reader = workers
+    key = await cached_key(reader)
+
+    await writer.bump("departments")
+
+    assert await cached_key(reader) == key